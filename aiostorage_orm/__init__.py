@@ -1,12 +1,19 @@
 from .redis_impl import AIORedisORM
 from .redis_impl import AIORedisItem
 from .redis_impl import AIORedisFrame
+from .redis_impl import CacheConfig
+from .redis_impl import LoaderConfig
 
 from .aiostorage_orm import AIOStorageORM
 from .aiostorage_item import AIOStorageItem
 
+from .codecs import Codec
+from .codecs import register_codec
+
 from .operation_result import OperationResult
 from .operation_result import OperationStatus
+from .operation_result import BulkOperationResult
+from .operation_result import FailedChunk
 
 from .exceptions import NotEnoughParamsException
 from .exceptions import MultipleGetParamsException
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
-from typing import Union
+from typing import AsyncIterator, Union
 
 from aiostorage_orm.operation_result import OperationResult
 
@@ -42,6 +42,17 @@ class AIOStorageItem(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @classmethod
+    @abstractmethod
+    def iter_filter(cls, _items, **kwargs) -> AsyncIterator:
+        """
+            Потоковое получение объектов по фильтру переданных аргументов, например:
+
+                async for item in AIOStorageItem.iter_filter(subsystem_id=10):
+                    ...
+        """
+        raise NotImplementedError
+
     @classmethod
     @abstractmethod
     def using(cls, db_instance) -> AIOStorageItem:
@@ -22,6 +22,10 @@ class AIOStorageORM(metaclass=ABCMeta):
     async def init(self) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def save(self, item) -> OperationResult:
         raise NotImplementedError
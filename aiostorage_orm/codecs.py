@@ -0,0 +1,279 @@
+import json
+import pickle
+import struct
+import zlib
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Mapping, Optional
+
+CODEC_PICKLE = "pickle"
+CODEC_MSGPACK = "msgpack"
+CODEC_JSON = "json"
+CODEC_STRUCT = "struct"
+
+
+class Codec(metaclass=ABCMeta):
+    """
+        Сериализация значений полей модели (Meta.codec)
+
+        Экземпляр создаётся для каждой модели в момент её объявления, в fields
+            передаются имена полей и их типы (аннотации)
+            - encode/decode - значение одного поля ("fields", "hash")
+            - encode_mapping/decode_mapping - все поля объекта ("packed")
+            - encode_row/decode_row - кортеж значений в порядке сортировки
+              имён полей (frame)
+    """
+    fields: dict[str, Any]
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        self.fields = dict(fields)
+
+    @abstractmethod
+    def encode(self, field: str, value: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, field: str, data: bytes) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode_mapping(self, mapping: Mapping[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode_mapping(self, data: bytes) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode_row(self, values: tuple) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode_row(self, data: bytes) -> tuple:
+        raise NotImplementedError
+
+
+class SerializerCodec(Codec):
+    """ Кодек на основе сериализатора произвольных объектов (dumps/loads) """
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def encode(self, field: str, value: Any) -> bytes:
+        return self.dumps(value)
+
+    def decode(self, field: str, data: bytes) -> Any:
+        return self.loads(data)
+
+    def encode_mapping(self, mapping: Mapping[str, Any]) -> bytes:
+        return self.dumps(dict(mapping))
+
+    def decode_mapping(self, data: bytes) -> dict[str, Any]:
+        return self.loads(data)
+
+    def encode_row(self, values: tuple) -> bytes:
+        return self.dumps(values)
+
+    def decode_row(self, data: bytes) -> tuple:
+        return tuple(self.loads(data))
+
+
+class PickleCodec(SerializerCodec):
+    """ Сериализация pickle (по умолчанию), поддерживает любые типы Python """
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackCodec(SerializerCodec):
+    """ Сериализация msgpack (требуется установленный пакет msgpack) """
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        super().__init__(fields=fields)
+        try:
+            import msgpack  # type: ignore
+        except ImportError as exception:
+            raise ImportError("Codec 'msgpack' requires 'msgpack' package (pip install msgpack)") from exception
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+class JsonCodec(SerializerCodec):
+    """
+        Сериализация JSON (orjson, если установлен, иначе json)
+
+        Числа хранятся в текстовом виде, что позволяет изменять их на стороне
+            сервера; bytes не поддерживаются
+    """
+    _dumps: Callable[[Any], bytes]
+    _loads: Callable[[bytes], Any]
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        super().__init__(fields=fields)
+        try:
+            import orjson
+            self._dumps = orjson.dumps
+            self._loads = orjson.loads  # type: ignore
+        except ImportError:
+            self._dumps = lambda value: json.dumps(value, separators=(",", ":")).encode()
+            self._loads = json.loads  # type: ignore
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._loads(data)
+
+
+class StructCodec(Codec):
+    """
+        Сериализация в бинарный формат фиксированной структуры (struct),
+            определяемой аннотациями полей модели
+
+        Поддерживаемые типы: int, float, bool, IntEnum, str, bytes
+            - значение поля: числа - в формате struct, str/bytes - с байтом-маркером
+              (чтобы пустая строка отличалась от отсутствующего значения),
+              None - пустая строка
+            - запись (frame, "packed"): контрольная сумма схемы, битовая маска
+              пустых значений, значения полей в порядке сортировки имён; при
+              изменении набора полей или их типов запись не декодируется
+              (ValueError), а не смещает значения
+    """
+    NUMERIC_FORMATS: dict[type, str] = {bool: "?", int: "q", float: "d"}
+    BUILTIN_TYPES: dict[str, type] = {"bool": bool, "int": int, "float": float, "str": str, "bytes": bytes}
+    PRESENT_MARKER: bytes = b"\x01"
+    LENGTH: struct.Struct = struct.Struct("<I")
+
+    _order: list[str]
+    _types: dict[str, type]
+    _formats: dict[str, Optional[struct.Struct]]
+    _fingerprint: bytes
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        super().__init__(fields=fields)
+        self._order = sorted(self.fields.keys())
+        self._types = {}
+        self._formats = {}
+        for name in self._order:
+            field_type: type = self._resolve_type(name=name, annotation=self.fields[name])
+            self._types[name] = field_type
+            self._formats[name] = self._get_format(field_type=field_type)
+        schema: str = ";".join(f"{name}:{self._types[name].__name__}" for name in self._order)
+        self._fingerprint = self.LENGTH.pack(zlib.crc32(schema.encode()))
+
+    def _resolve_type(self, name: str, annotation: Any) -> type:
+        if isinstance(annotation, str):
+            annotation = self.BUILTIN_TYPES.get(annotation, annotation)
+        if not isinstance(annotation, type) or not (
+            issubclass(annotation, (int, float, str, bytes))
+        ):
+            raise TypeError(f"Codec 'struct' does not support field {name}: {annotation}")
+        return annotation
+
+    def _get_format(self, field_type: type) -> Optional[struct.Struct]:
+        """ Формат struct для числовых типов (None - для str и bytes) """
+        for base_type, format in self.NUMERIC_FORMATS.items():
+            if issubclass(field_type, base_type):
+                return struct.Struct("<" + format)
+        return None
+
+    def encode(self, field: str, value: Any) -> bytes:
+        if value is None:
+            return b""
+        format: Optional[struct.Struct] = self._formats[field]
+        if format:
+            return format.pack(value)
+        return self.PRESENT_MARKER + (value.encode() if isinstance(value, str) else bytes(value))
+
+    def decode(self, field: str, data: bytes) -> Any:
+        if not data:
+            return None
+        format: Optional[struct.Struct] = self._formats[field]
+        field_type: type = self._types[field]
+        if format:
+            return field_type(format.unpack(data)[0])
+        value: bytes = data[len(self.PRESENT_MARKER):]
+        return value.decode() if issubclass(field_type, str) else value
+
+    def encode_row(self, values: tuple) -> bytes:
+        mask: int = 0
+        parts: list[bytes] = []
+        for index, (name, value) in enumerate(zip(self._order, values)):
+            if value is None:
+                mask |= 1 << index
+                continue
+            format: Optional[struct.Struct] = self._formats[name]
+            if format:
+                parts.append(format.pack(value))
+            else:
+                data: bytes = value.encode() if isinstance(value, str) else bytes(value)
+                parts.append(self.LENGTH.pack(len(data)) + data)
+        mask_bytes: bytes = mask.to_bytes((len(self._order) + 7) // 8, "little")
+        return self._fingerprint + mask_bytes + b"".join(parts)
+
+    def decode_row(self, data: bytes) -> tuple:
+        if data[:len(self._fingerprint)] != self._fingerprint:
+            raise ValueError("Codec 'struct' can't decode record of another model schema")
+        offset: int = len(self._fingerprint)
+        mask_size: int = (len(self._order) + 7) // 8
+        mask: int = int.from_bytes(data[offset:offset + mask_size], "little")
+        offset += mask_size
+        values: list[Any] = []
+        for index, name in enumerate(self._order):
+            if mask & (1 << index):
+                values.append(None)
+                continue
+            format: Optional[struct.Struct] = self._formats[name]
+            field_type: type = self._types[name]
+            if format:
+                values.append(field_type(format.unpack_from(data, offset)[0]))
+                offset += format.size
+            else:
+                length: int = self.LENGTH.unpack_from(data, offset)[0]
+                offset += self.LENGTH.size
+                value: bytes = data[offset:offset + length]
+                offset += length
+                values.append(value.decode() if issubclass(field_type, str) else value)
+        return tuple(values)
+
+    def encode_mapping(self, mapping: Mapping[str, Any]) -> bytes:
+        return self.encode_row(tuple(mapping.get(name) for name in self._order))
+
+    def decode_mapping(self, data: bytes) -> dict[str, Any]:
+        return dict(zip(self._order, self.decode_row(data)))
+
+
+CODECS: dict[str, type[Codec]] = {
+    CODEC_PICKLE: PickleCodec,
+    CODEC_MSGPACK: MsgpackCodec,
+    CODEC_JSON: JsonCodec,
+    CODEC_STRUCT: StructCodec,
+}
+
+
+def register_codec(name: str, codec_class: type[Codec]) -> None:
+    """
+        Регистрация пользовательского кодека для использования в Meta.codec, например:
+
+            register_codec("my_codec", MyCodec)
+    """
+    CODECS[name] = codec_class
+
+
+def get_codec(name: str, fields: Mapping[str, Any]) -> Codec:
+    """ Создание экземпляра кодека для полей модели """
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}', registered codecs: {tuple(CODECS)}")
+    return CODECS[name](fields=fields)
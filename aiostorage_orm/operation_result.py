@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 from typing import Union
 
 
@@ -28,3 +29,37 @@ class OperationResult:
     def __repr__(self) -> str:
         message: str = f", message={self.message}" if self.message else ""
         return f"{self.__class__.__name__}: status={self.status}{message}"
+
+
+class FailedChunk:
+    """ Порция групповой операции, которая не была выполнена """
+    start: int  # Индекс первого объекта порции в переданном списке
+    end: int  # Индекс, следующий за последним объектом порции
+    message: str
+
+    def __init__(self, start: int, end: int, message: str = "") -> None:
+        self.start = start
+        self.end = end
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(start={self.start}, end={self.end}, message={self.message!r})"
+
+
+class BulkOperationResult(OperationResult):
+    """
+    Результат групповой операции, выполняемой порциями
+
+    failed_chunks - невыполненные порции (объекты остальных порций записаны/удалены)
+
+    """
+    failed_chunks: list[FailedChunk]
+
+    def __init__(
+        self,
+        status: Union[OperationStatus, bool],
+        message: str = "",
+        failed_chunks: Optional[list[FailedChunk]] = None,
+    ) -> None:
+        super().__init__(status=status, message=message)
+        self.failed_chunks = failed_chunks or []
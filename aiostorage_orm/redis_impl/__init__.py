@@ -1,3 +1,5 @@
 from .aioredis_orm import AIORedisORM
 from .aioredis_item import AIORedisItem
 from .aioredis_frame import AIORedisFrame
+from .aioredis_cache import CacheConfig
+from .aioredis_loader import LoaderConfig
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterable, Optional
+
+
+class CacheConfig:
+    """
+    Настройки кэша объектов модели (Meta.cache), например:
+
+        class Meta:
+            table = "subsystem.{subsystem_id}.tag.{tag_id}"
+            cache = CacheConfig(max_entries=10_000, ttl=1.0)
+
+    max_entries - максимальное количество объектов в кэше (вытесняются
+        давно не запрашиваемые объекты)
+    ttl - время хранения объекта в кэше в секундах (None - без ограничения);
+        ограничивает устаревание объектов, изменённых другими процессами
+
+    """
+    max_entries: int
+    ttl: Optional[float]
+
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("CacheConfig.max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+
+class AIORedisCache:
+    """
+    Кэш объектов модели в памяти процесса (LRU с ограничением времени хранения)
+
+    - ключ - префикс объекта (_table), значение - значения полей объекта
+      (из кэша каждый раз создаётся новый объект, поэтому изменение
+      полученного объекта не изменяет кэш)
+    - сохранение и удаление объектов через ORM в этом процессе удаляет их из кэша;
+      поколение (generation) увеличивается при каждом удалении, поэтому
+      результат чтения, начатого до записи, в кэш не попадает
+    - изменения, выполненные другими процессами, видны по истечении ttl
+
+    """
+    _config: CacheConfig
+    _entries: OrderedDict[str, tuple[float, dict[str, Any]]]
+    generation: int
+    hits: int
+    misses: int
+
+    def __init__(self, config: CacheConfig) -> None:
+        self._config = config
+        self._entries = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prefix: str) -> Optional[dict[str, Any]]:
+        """ Значения полей объекта из кэша (None - объекта нет или время хранения истекло) """
+        entry: Optional[tuple[float, dict[str, Any]]] = self._entries.get(prefix)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, values = entry
+        if expires_at and expires_at <= monotonic():
+            del self._entries[prefix]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(prefix)
+        self.hits += 1
+        return values
+
+    def put(self, prefix: str, values: dict[str, Any], generation: int) -> None:
+        """ Сохранение значений полей объекта, прочитанных в поколении generation """
+        if generation != self.generation:
+            return
+        expires_at: float = monotonic() + self._config.ttl if self._config.ttl else 0.
+        self._entries[prefix] = (expires_at, values)
+        self._entries.move_to_end(prefix)
+        while len(self._entries) > self._config.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, prefixes: Iterable[str]) -> None:
+        """ Удаление объектов из кэша (после их сохранения или удаления) """
+        self.generation += 1
+        for prefix in prefixes:
+            self._entries.pop(prefix, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """ Счётчики попаданий и промахов, количество объектов в кэше """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -1,4 +1,3 @@
-import pickle
 import logging
 from typing import Any
 from typing import Union
@@ -32,26 +31,36 @@ class AIORedisFrame(AIOStorageFrame):
     FRAME_PREFIX: str = "frame."
     QUEUE_START_INDEX: int = 0
     QUEUE_END_INDEX: int = -1
+    # Максимальное количество значений в одном вызове хранимого скрипта
+    #   (ограничение количества аргументов unpack в Lua)
+    ADD_BATCH_SIZE: int = 1000
 
-    _pipe: Pipeline
     _client: redis.Redis
     _queue_add: AsyncScript  # Хранимый скрипт Redis
 
     def __init__(self, client: redis.Redis) -> None:
         self._client = client
-        self._pipe = client.pipeline()
         # Инициализация хранимого скрипта в Redis для атомарного добавления
-        #   в конец одного элемента и удаления первого элемента, если размер
-        #   списка достиг лимита
+        #   в конец списков всех значений одним вызовом RPUSH и подрезки
+        #   каждого списка до лимита одним вызовом LTRIM
         # Сигнатура вызова после регистрации:
-        #   self._queue_add(keys=["example_key"], args=["my_value", 10], client=...)
-        #   , где 10 - это размер списка (лимит)
+        #   self._queue_add(
+        #       keys=["key1", "key2"],
+        #       args=[10, 2, "value1", "value2", 10, 1, "value3"],
+        #       client=...,
+        #   )
+        #   , где для каждого ключа передаются размер списка (лимит), количество
+        #         значений и сами значения
         #         client - это клиет, в котором будет вызван скрипт (им может быть
         #                  pipeline)
         self._queue_add = self._client.register_script("""
-            redis.call('rpush', KEYS[1], ARGV[1])
-            if redis.call('llen', KEYS[1]) > tonumber(ARGV[2]) then
-                redis.call('lpop', KEYS[1])
+            local index = 1
+            for _, key in ipairs(KEYS) do
+                local queue_size = tonumber(ARGV[index])
+                local count = tonumber(ARGV[index + 1])
+                redis.call('rpush', key, unpack(ARGV, index + 2, index + 1 + count))
+                redis.call('ltrim', key, -queue_size, -1)
+                index = index + 2 + count
             end
         """)
         # Подрезка списков, согласно установленной в subclass'е величине
@@ -67,20 +76,28 @@ class AIORedisFrame(AIOStorageFrame):
         В списке объектов приемлемо использовать разнородные данные
             (т.е. переданные объекты могут не принадлежать одному классу)
 
+        - объекты группируются по frame'ам (порядок объектов внутри frame'а сохраняется)
+        - значения frame'а добавляются одним вызовом RPUSH, после чего frame
+          подрезается до размера одним вызовом LTRIM
+        - несколько frame'ов объединяются в один вызов хранимого скрипта
+          (до ADD_BATCH_SIZE значений в вызове), все вызовы выполняются
+          одной транзакцией
+
         """
+        items: list[AIORedisItem] = (
+            [item_or_items] if isinstance(item_or_items, AIORedisItem) else item_or_items  # type: ignore
+        )
         try:
-            if isinstance(item_or_items, AIORedisItem):
-                await self._add_item(item=item_or_items)
-            else:
-                [await self._add_item(item) for item in item_or_items]  # type: ignore
+            pipe: Pipeline = self._client.pipeline()
+            for keys, args in self._get_add_batches(items=items):
+                await self._queue_add(keys=keys, args=args, client=pipe)
+            await pipe.execute()
         except Exception as exception:
-            await self._pipe.reset()
             logging.exception(exception)
             return OperationResult(
                 status=OperationStatus.failed,
                 message=str(exception),
             )
-        await self._pipe.execute()
         return OperationResult(status=OperationStatus.success)
 
     def _get_frame_size(self, item: AIORedisItem) -> int:
@@ -90,36 +107,46 @@ class AIORedisFrame(AIOStorageFrame):
             queue_size = self.DEFAULT_QUEUE_SIZE
         return queue_size
 
-    async def _add_item(self, item: AIORedisItem) -> None:
+    def _serialize_item(self, item: AIORedisItem) -> bytes:
+        """ Сериализация данных объекта для хранения во frame'е """
+        values: tuple = tuple(getattr(item, key) for key in item._schema.row_fields)
+        return item._codec.encode_row(values)
+
+    def _get_add_batches(self, items: list[AIORedisItem]) -> list[tuple[list[bytes], list[Any]]]:
         """
-        Добавление объекта в БД
+        Подготовка аргументов вызовов хранимого скрипта добавления
 
-        - сериализация данных объекта
-        - вызов хранимого скрипта Redis для атомарной операции
-          наполнения ограниченного списка
+        - значения группируются по ключам frame'ов, размер frame'а - размер
+          последнего добавляемого в него объекта
+        - в один вызов попадает не более ADD_BATCH_SIZE значений (значения
+          одного frame'а при превышении разделяются на несколько вызовов)
 
         """
-        # item._table содержит строку с подставленными параметрами текущего объекта
-        key: str = self._make_key(item=item)
-        object_key: bytes = key.encode()
-        values: tuple = tuple(
-            item.__dict__[key]
-            for key in sorted(item.__annotations__.keys())
-            if not key.startswith("_")
-        )
-        serialized_object: bytes = pickle.dumps(values)
-        queue_size: int = self._get_frame_size(item=item)
-        # Вызов запускает хранимый скрипт, который нуждается в
-        #   - KEYS[1] (keys[0]) - ключ объекта Redis
-        #   - ARGV[1] (args[0]) - данные для хранения
-        #   - ARGV[2] (args[1]) - лимит размера списка
-        await self._queue_add(
-            keys=[object_key],
-            args=[serialized_object, queue_size],
-            client=self._pipe,
-        )
-        # _pipe может быть использован в цикле для списка объектов, поэтому
-        #   осознанно не выполняем (execute)
+        frames: dict[bytes, tuple[int, list[bytes]]] = {}
+        for item in items:
+            # item._table содержит строку с подставленными параметрами текущего объекта
+            object_key: bytes = self._make_key(item=item).encode()
+            serialized_objects: list[bytes] = frames.get(object_key, (0, []))[1]
+            serialized_objects.append(self._serialize_item(item=item))
+            frames[object_key] = (self._get_frame_size(item=item), serialized_objects)
+        batches: list[tuple[list[bytes], list[Any]]] = []
+        keys: list[bytes] = []
+        args: list[Any] = []
+        values_count: int = 0
+        for object_key, (queue_size, serialized_objects) in frames.items():
+            start: int = 0
+            while start < len(serialized_objects):
+                if values_count >= self.ADD_BATCH_SIZE:
+                    batches.append((keys, args))
+                    keys, args, values_count = [], [], 0
+                chunk: list[bytes] = serialized_objects[start:start + self.ADD_BATCH_SIZE - values_count]
+                keys.append(object_key)
+                args.extend((queue_size, len(chunk), *chunk))
+                values_count += len(chunk)
+                start += len(chunk)
+        if keys:
+            batches.append((keys, args))
+        return batches
 
     async def bulk_create(self, items: list[SubclassItemType]) -> OperationResult:
         return await self.add(item_or_items=items)
@@ -145,9 +172,9 @@ class AIORedisFrame(AIOStorageFrame):
         """ Десериализация и создание объектов типа item.__class__ со списком значений """
         T: type = item.__class__  # Класс десериализуемого объекта, нужен для вызова конструктора
         # Получение параметров класса (subsytem, tag_id и т.п.)
-        params: dict[str, Any] = {key: item.__dict__[key] for key in item._keys_positions.keys()}
-        # Сортировка имён для правильного расположения значений в атрибуты
-        attr_names: list[str] = list(sorted(T.__annotations__.keys()))
+        params: dict[str, Any] = {key: getattr(item, key) for key in item._keys_positions.keys()}
+        # Порядок имён для правильного расположения значений в атрибуты
+        attr_names: tuple[str, ...] = item._schema.row_fields
         # Формирование словарей для инициализации объектов
         init_dicts: list[dict] = [dict(zip(attr_names, item_values)) for item_values in values]
         result: list[SubclassItemType] = [T(**(init_dict | params)) for init_dict in init_dicts]
@@ -183,7 +210,7 @@ class AIORedisFrame(AIOStorageFrame):
         key: str = self._make_key(item=item)
         serialized_values: list[bytes] = await self._client.lrange(key, start_index, end_index)
         # Десериализация полученных данных
-        all_values_list: list[tuple] = [pickle.loads(v) for v in serialized_values]
+        all_values_list: list[tuple] = [item._codec.decode_row(v) for v in serialized_values]
         # Формирование объектов из полученных данных
         items: list[SubclassItemType] = self._values_to_items(
             values=all_values_list,
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError
+from redis.exceptions import TimeoutError
+
+
+class AIORedisHealth:
+    """
+    Состояние подключения к Redis (circuit breaker)
+
+    Проверка подключения (PING) не выполняется перед каждой операцией:
+        - фоновая задача (start) периодически проверяет подключение
+        - при ошибке подключения во время выполнения команды состояние
+          переводится в "недоступно" (mark_unavailable), и последующие
+          операции завершаются сразу, без обращения к серверу
+        - по истечении interval после ошибки операция снова пропускается
+          к серверу (half-open) и состояние переводится в "доступно": при
+          ошибке подключения во время этой операции состояние возвращается
+          в "недоступно", при успехе следующие операции выполняются без
+          ограничений, поэтому подключение восстанавливается и без
+          запущенной фоновой задачи
+
+    """
+    DEFAULT_INTERVAL: float = 1.0
+
+    _client: redis.Redis
+    _interval: float
+    _available: bool
+    _probing: bool  # Операция пропущена к серверу в состоянии half-open
+    _unavailable_since: float
+    _task: Optional[asyncio.Task]
+
+    def __init__(self, client: redis.Redis, interval: float = DEFAULT_INTERVAL) -> None:
+        self._client = client
+        self._interval = interval
+        self._available = True
+        self._probing = False
+        self._unavailable_since = 0.
+        self._task = None
+
+    @property
+    def client(self) -> redis.Redis:
+        """ Подключение, состояние которого отслеживается """
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        """ Можно ли выполнять операции с БД (без обращения к серверу) """
+        if self._available:
+            # Операция half-open не завершилась ошибкой подключения за interval
+            if self._probing and monotonic() - self._unavailable_since >= self._interval:
+                self._probing = False
+            return True
+        # Half-open: после interval пропустить операцию для проверки подключения;
+        #   ошибка подключения во время операции вернёт состояние "недоступно"
+        if monotonic() - self._unavailable_since >= self._interval:
+            self._available = True
+            self._probing = True
+            self._unavailable_since = monotonic()
+            return True
+        return False
+
+    def mark_available(self) -> None:
+        self._available = True
+        self._probing = False
+
+    def mark_unavailable(self) -> None:
+        """ Перевод в состояние "недоступно" после ошибки подключения """
+        # Неудачная проверка в состоянии half-open не означает новую потерю подключения
+        if self._available and not self._probing:
+            logging.warning("Redis connection lost...")
+        self._available = False
+        self._probing = False
+        self._unavailable_since = monotonic()
+
+    async def check(self) -> bool:
+        """ Проверка подключения к серверу (PING) с обновлением состояния """
+        try:
+            await self._client.ping()  # type: ignore
+        except (ConnectionError, TimeoutError):
+            self.mark_unavailable()
+            return False
+        self.mark_available()
+        return True
+
+    def start(self) -> None:
+        """ Запуск фоновой проверки подключения """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """ Остановка фоновой проверки подключения """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._interval)
@@ -1,13 +1,15 @@
 from __future__ import annotations
-import re
 import copy
 import uuid
-import pickle
+import asyncio
 from contextlib import suppress
 
 import redis.asyncio as redis
 from redis.exceptions import ConnectionError
+from redis.exceptions import TimeoutError
 import itertools
+import functools
+from fnmatch import fnmatchcase
 from typing import (
     Any,
     cast,
@@ -17,9 +19,28 @@ from typing import (
     Type,
     TypeVar,
     Coroutine,
-    Callable
+    Callable,
+    Awaitable,
+    Iterable,
+    AsyncIterator,
+    AbstractSet,
+    get_type_hints,
 )
 
+from .aioredis_cache import AIORedisCache
+from .aioredis_cache import CacheConfig
+from .aioredis_health import AIORedisHealth
+from .aioredis_loader import AIORedisLoader
+from .aioredis_loader import LoaderConfig
+from .aioredis_schema import AIORedisSchema
+from .aioredis_write_buffer import AIORedisWriteBuffer
+from .aioredis_schema import AIORedisQueryPlan
+from .aioredis_schema import KEYS_DELIMITER
+from ..codecs import Codec
+from ..codecs import CODEC_PICKLE
+from ..codecs import JsonCodec
+from ..codecs import PickleCodec
+from ..codecs import get_codec
 from ..aiostorage_item import AIOStorageItem
 from ..operation_result import OperationResult
 from ..operation_result import OperationStatus
@@ -34,37 +55,205 @@ ResponseT = Any
 
 T = TypeVar('T', bound='AIORedisItem')
 IN_SUFFIX = "__in"
-KEYS_DELIMITER = "."
+# Подсказка серверу о количестве просматриваемых за один вызов SCAN ключей
+SCAN_COUNT = 1000
+# Максимальное количество объектов, запрашиваемых одним MGET при потоковом чтении
+ITER_BATCH_SIZE = 500
+# Максимальное количество ключей (полей для "hash"), запрашиваемых одной командой
+#   (по умолчанию для моделей без Meta.read_batch_size)
+READ_BATCH_SIZE = 10_000
+# Максимальное количество одновременно выполняемых команд чтения одной операции
+READ_MAX_IN_FLIGHT = 4
+# Способы хранения объекта в Redis (Meta.storage)
+STORAGE_FIELDS = "fields"  # Каждое поле - отдельный ключ "<table>.<field>"
+STORAGE_HASH = "hash"  # Объект - один hash "<table>" с полями модели
+STORAGE_PACKED = "packed"  # Объект - одна строка "<table>" с сериализованным словарём полей
+STORAGES = (STORAGE_FIELDS, STORAGE_HASH, STORAGE_PACKED)
+# Символы маски (значения параметров с ними не могут быть найдены через индекс)
+GLOB_CHARS = ("*", "?", "[")
+# Источники префиксов объектов при поиске
+PREFIXES_DIRECT = "direct"  # Сформированы из фильтра (существование объектов не проверено)
+PREFIXES_INDEX = "index"  # Получены из индексов (объекты могли быть удалены в обход ORM)
+PREFIXES_SCAN = "scan"  # Найдены обходом ключей
+# Изменённые поля объекта, полученного из БД или сохранённого (изменений нет)
+CLEAN_FIELDS: frozenset[str] = frozenset()
+# Префикс ключей индексов (Meta.indexes): "index.<table>.<param>.<value>"
+INDEX_PREFIX = "index."
+# Префикс ключей индексов по значениям полей (Meta.range_indexes): "range_index.<table>.<field>"
+RANGE_INDEX_PREFIX = "range_index."
+# Суффиксы фильтров по диапазону значений поля и их границы в ZRANGEBYSCORE
+RANGE_SUFFIXES: dict[str, tuple[int, str]] = {
+    "__gte": (0, ""),
+    "__gt": (0, "("),
+    "__lte": (1, ""),
+    "__lt": (1, "("),
+}
+# Операции изменения значения поля на стороне сервера (update, суффиксы __incr, __max, __min)
+UPDATE_SET = "set"
+UPDATE_OPERATIONS = (UPDATE_SET, "incr", "max", "min")
+# Хранимый скрипт изменения полей объекта
+#   ARGV[1] - префикс объекта, ARGV[2] - "1" для "hash", ARGV[3] - время жизни (0 - без ограничения),
+#   ARGV[4] - количество ключей индексов (Meta.indexes), которые идут первыми в KEYS
+#   далее по 6 аргументов на поле: позиция ключа значения в KEYS, операция, имя поля, значение,
+#   позиция ключа индекса по значениям в KEYS (0 - без индекса), значение в индексе (для "set")
+#   Все значения вычисляются до первой записи, поэтому при ошибке объект не изменяется
+UPDATE_SCRIPT = """
+    local prefix, hash, ttl = ARGV[1], ARGV[2] == '1', tonumber(ARGV[3])
+    local indexes_count = tonumber(ARGV[4])
+    local updates = {}
+    for i = 5, #ARGV, 6 do
+        local key, operation, field = KEYS[tonumber(ARGV[i])], ARGV[i + 1], ARGV[i + 2]
+        local value, score = ARGV[i + 3], ARGV[i + 5]
+        if operation ~= 'set' then
+            local current
+            if hash then current = redis.call('hget', key, field) else current = redis.call('get', key) end
+            local old = nil
+            if current and current ~= 'null' then
+                old = tonumber(current)
+                if old == nil then
+                    return redis.error_reply('Field ' .. field .. ' value is not a number')
+                end
+            end
+            local number = tonumber(value)
+            if operation == 'incr' then
+                number = (old or 0) + number
+            elseif old ~= nil and ((operation == 'max' and old > number) or (operation == 'min' and old < number)) then
+                number = old
+            end
+            if number == math.floor(number) and math.abs(number) < 2 ^ 53 then
+                value = string.format('%d', number)
+            else
+                value = string.format('%.17g', number)
+            end
+            score = value
+        end
+        updates[#updates + 1] = {key, field, value, tonumber(ARGV[i + 4]), score}
+    end
+    for _, update in ipairs(updates) do
+        local key, field, value, index_position, score = unpack(update)
+        if hash then redis.call('hset', key, field, value) else redis.call('set', key, value) end
+        if ttl > 0 then redis.call('expire', key, ttl) end
+        if index_position > 0 then
+            if score == '' then
+                redis.call('zrem', KEYS[index_position], prefix)
+            else
+                redis.call('zadd', KEYS[index_position], score, prefix)
+            end
+        end
+    end
+    for i = 1, indexes_count do
+        redis.call('sadd', KEYS[i], prefix)
+    end
+    return #updates
+"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _add_dirty_field(dirty: frozenset[str], field: str) -> frozenset[str]:
+    """ Изменённые поля с добавленным полем (одинаковые наборы разделяются объектами) """
+    return dirty | {field}
+
+
+class InstanceOrClassMethod:
+    """
+        Метод с разной реализацией для вызова у класса и у экземпляра, например:
+
+            AIOStorageItem.using(...)  # class_method(cls, ...)
+            storage_item_instance.using(...)  # instance_method(self, ...)
+
+        Заменяет привязку метода к каждому экземпляру в конструкторе
+    """
+    def __init__(self, class_method: Callable, instance_method: Callable) -> None:
+        self._class_method = class_method
+        self._instance_method = instance_method
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self._class_method.__get__(owner, owner)
+        return self._instance_method.__get__(instance, owner)
 
 
 class AIORedisItem(AIOStorageItem):
     _table: str
     _keys_positions: dict[str, int]
-    _params: Mapping[_Key, _Value]
+    _schema: AIORedisSchema = AIORedisSchema(table="", fields=())
     _db_instance: Union[redis.Redis, None] = None
+    _health: Optional[AIORedisHealth] = None
     _frame_ltrim: Optional[Callable[[AIORedisItem], Coroutine[Any, Any, None]]] = None
     _frame_size: int = 0
     _ttl: Optional[int] = None
+    _storage: str = STORAGE_FIELDS
+    _codec: Codec = PickleCodec(fields={})
+    _compact: bool = False
+    _read_batch_size: Optional[int] = None
+    _default_read_batch_size: int = READ_BATCH_SIZE
+    _read_max_in_flight: int = READ_MAX_IN_FLIGHT
+    _indexes: tuple[str, ...] = ()
+    _range_indexes: tuple[str, ...] = ()
+    _cache: Optional[AIORedisCache] = None
+    _loader: Optional[AIORedisLoader] = None
+    _write_buffer: Optional[AIORedisWriteBuffer] = None
+    _projection: Optional[frozenset[str]] = None  # Поля объекта, полученного с only (None - все поля)
+    _dirty: Optional[frozenset[str]] = None  # Изменённые поля объекта (None - все поля)
 
     class Meta:
         table: str = ""  # Pattern имени записи, например, "subsystem.{subsystem_id}.tag.{tag_id}"
         ttl: Optional[int] = None  # Время жизни объекта в базе данных
         frame_size: Optional[int] = 100  # Максимальный размер frame'а
+        storage: str = STORAGE_FIELDS  # Способ хранения объекта ("fields", "hash", "packed")
+        codec: str = CODEC_PICKLE  # Сериализация значений ("pickle", "msgpack", "json", "struct")
+        compact: bool = False  # Компактное хранение значений объекта в памяти
+        read_batch_size: Optional[int] = None  # Количество ключей в одной команде чтения (None - по умолчанию ORM)
+        indexes: list[str] = []  # Параметры Meta.table, по которым строятся индексы (поиск без обхода ключей)
+        range_indexes: list[str] = []  # Числовые поля, по которым строятся индексы (поиск по диапазону, сортировка)
+        cache: Optional[CacheConfig] = None  # Кэш объектов в памяти процесса (None - без кэша)
+        loader: Optional[LoaderConfig] = None  # Объединение одновременных get в одно чтение (None - без объединения)
 
     def __init_subclass__(cls) -> None:
-        cls._keys_positions = {
-            index.replace("{", "").replace("}", ""): key
-            for key, index in enumerate(cls.Meta.table.split(KEYS_DELIMITER))
-            if index.startswith("{") and index.endswith("}")
-        }
+        cls._keys_positions = AIORedisSchema(table=cls.Meta.table, fields=()).keys_positions
         for param in cls._keys_positions.keys():
             if param in cls.__annotations__:
                 del cls.__annotations__[param]
+        # Схема модели, используемая при каждой операции, подготавливается один раз
+        cls._schema = AIORedisSchema(table=cls.Meta.table, fields=cls.__annotations__.keys())
         # Аргументы, которые используются для дальнейшей проверки и работы
         if hasattr(cls.Meta, "frame_size"):
             setattr(cls, "_frame_size", cls.Meta.frame_size)
         if hasattr(cls.Meta, "ttl") and cls.Meta.ttl:
             setattr(cls, "_ttl", cls.Meta.ttl)
+        if hasattr(cls.Meta, "storage"):
+            if cls.Meta.storage not in STORAGES:
+                raise ValueError(f"{cls.__name__}.Meta.storage must be one of {STORAGES}")
+            setattr(cls, "_storage", cls.Meta.storage)
+        setattr(cls, "_compact", bool(getattr(cls.Meta, "compact", False)))
+        setattr(cls, "_read_batch_size", getattr(cls.Meta, "read_batch_size", None))
+        indexes: tuple[str, ...] = tuple(getattr(cls.Meta, "indexes", ()))
+        unknown_indexes: set[str] = set(indexes) - set(cls._keys_positions)
+        if unknown_indexes:
+            raise ValueError(f"{cls.__name__}.Meta.indexes must contain Meta.table params: {sorted(unknown_indexes)}")
+        setattr(cls, "_indexes", indexes)
+        range_indexes: tuple[str, ...] = tuple(getattr(cls.Meta, "range_indexes", ()))
+        unknown_range_indexes: set[str] = set(range_indexes) - cls._schema.fields_set
+        if unknown_range_indexes:
+            raise ValueError(f"{cls.__name__}.Meta.range_indexes must contain fields: {sorted(unknown_range_indexes)}")
+        setattr(cls, "_range_indexes", range_indexes)
+        cache_config: Optional[CacheConfig] = getattr(cls.Meta, "cache", None)
+        setattr(cls, "_cache", AIORedisCache(config=cache_config) if cache_config else None)
+        loader_config: Optional[LoaderConfig] = getattr(cls.Meta, "loader", None)
+        loader: Optional[AIORedisLoader] = None
+        if loader_config:
+            loader = AIORedisLoader(config=loader_config, read=cls._read_objects_map)
+        setattr(cls, "_loader", loader)
+        setattr(cls, "_codec", get_codec(getattr(cls.Meta, "codec", CODEC_PICKLE), fields=cls._get_fields_types()))
+
+    @classmethod
+    def _get_fields_types(cls: Type[T]) -> dict[str, Any]:
+        """ Типы полей модели (строковые аннотации разрешаются, если это возможно) """
+        try:
+            hints: dict[str, Any] = get_type_hints(cls)
+        except Exception:
+            hints = {}
+        return {name: hints.get(name, annotation) for name, annotation in cls.__annotations__.items()}
 
     @classmethod
     def _make_kwargs_from_objects(cls: Type[T], objects: list[T]) -> dict:
@@ -74,12 +263,11 @@ class AIORedisItem(AIOStorageItem):
         """
         result_kwargs: dict = {}
         for obj in objects:
-            for key, position in obj._keys_positions.items():
-                value: str = obj._table.split(KEYS_DELIMITER)[position]
+            for key, value in obj._schema.parse_key(prefix=obj._table).items():
                 if key in result_kwargs:
-                    result_kwargs[key] += str(value)
+                    result_kwargs[key] += value
                 else:
-                    result_kwargs[key] = str(value)
+                    result_kwargs[key] = value
 
         for key in result_kwargs.keys():
             result_kwargs[key] = f"[{result_kwargs[key]}]"
@@ -124,55 +312,363 @@ class AIORedisItem(AIOStorageItem):
             if config_key in kwargs.keys():
                 setattr(self, f"_{config_key}", kwargs[config_key])
                 del kwargs[config_key]
+        if self._compact:
+            self._init_compact(**kwargs)
+            return
         # Формирование полей модели из переданных дочернему классу аргументов
         [self.__dict__.__setitem__(key, value) for key, value in kwargs.items()]  # type: ignore
         # Формирование изолированной среды с данными класса для дальнейшей работы с БД
         self._table = self.__class__.Meta.table.format(**kwargs)
         self._params = {
             key: kwargs.get(key, None)
-            for key in self.__class__.__annotations__
+            for key in self._schema.fields
         }
-        # Перегрузка методов для экземпляра класса
-        self.using = self.instance_using  # type: ignore
+
+    def _init_compact(self, **kwargs) -> None:
+        """
+            Формирование объекта в компактном режиме (Meta.compact = True)
+
+            - значения хранятся только атрибутами объекта (без дублирующего словаря
+              _params, который формируется по запросу), непереданные поля равны None
+            - атрибуты устанавливаются в одном порядке без обращения к __dict__,
+              поэтому CPython хранит их массивом значений с общими для всех
+              экземпляров класса ключами (без отдельного словаря на объект)
+        """
+        for key in self._schema.fields:
+            object.__setattr__(self, key, kwargs.get(key))
+        for key in self._schema.keys_positions:
+            if key in kwargs:
+                object.__setattr__(self, key, kwargs[key])
+        object.__setattr__(self, "_table", self._schema.format(params=kwargs))
+
+    @property
+    def _params(self) -> Mapping[_Key, _Value]:
+        """ Значения полей объекта (в компактном режиме формируются по запросу) """
+        if self._compact:
+            return {key: getattr(self, key) for key in self._schema.fields}
+        return self.__dict__["_params"]
+
+    @_params.setter
+    def _params(self, params: Mapping[_Key, _Value]) -> None:
+        # Все поля объекта считаются изменёнными
+        self._mark_dirty()
+        if self._compact:
+            for key, value in params.items():
+                object.__setattr__(self, str(key), value)
+            return
+        self.__dict__["_params"] = params
 
     def __getattr__(self, attr_name: str):
         return object.__getattribute__(self, attr_name)
 
     def __setattr__(self, attr_name: str, value: Any):
-        if hasattr(self, "_params") and attr_name in self._params:
+        if attr_name in self._schema.fields_set:
+            dirty: Optional[frozenset[str]] = self._dirty
+            if dirty is not None and attr_name not in dirty:
+                object.__setattr__(self, "_dirty", _add_dirty_field(dirty=dirty, field=attr_name))
+        if not self._compact and "_params" in self.__dict__ and attr_name in self._params:
             self._params[attr_name] = value  # type: ignore
         return super().__setattr__(attr_name, value)
 
+    def _mark_clean(self: T) -> T:
+        """
+            Отметка объекта как совпадающего с БД (после получения или сохранения)
+
+            Изменённые после этого поля (_dirty) отслеживаются в __setattr__ и
+                только они записываются при сохранении; у объектов, созданных
+                конструктором, изменёнными считаются все поля
+        """
+        object.__setattr__(self, "_dirty", CLEAN_FIELDS)
+        return self
+
+    def _mark_dirty(self: T) -> T:
+        """
+            Отметка объекта как возможно не совпадающего с БД (после удаления
+                или при смене подключения): при сохранении записываются все поля
+        """
+        # Атрибут объекта не создаётся, пока объект не отмечен неизменённым
+        #   (значение по умолчанию - атрибут класса)
+        if self._dirty is not None:
+            object.__setattr__(self, "_dirty", None)
+        return self
+
+    def _get_dirty_fields(self) -> Optional[frozenset[str]]:
+        """ Поля, изменённые после получения или сохранения объекта (None - все поля) """
+        return self._dirty
+
+    def _mark_projection(self: T, fields: tuple[str, ...]) -> T:
+        """ Отметка объекта, полученного с only: остальные поля не получены и не записываются """
+        object.__setattr__(self, "_projection", frozenset(fields))
+        return self
+
+    def _get_write_fields(self, only_dirty: bool = True) -> Optional[frozenset[str]]:
+        """
+            Записываемые поля объекта (None - все поля)
+
+            - only_dirty - только поля, изменённые после получения или сохранения
+              объекта (см. _get_dirty_fields)
+            - у объекта, полученного с only, неполученные поля не записываются
+              (кроме изменённых), чтобы не перезаписать их значения в БД пустыми
+        """
+        dirty: Optional[frozenset[str]] = self._get_dirty_fields()
+        if only_dirty and dirty is not None:
+            return dirty
+        if self._projection is None:
+            return dirty if only_dirty else None
+        return self._projection | (dirty or CLEAN_FIELDS)
+
+    def _check_writable(self) -> None:
+        """ Проверка возможности записи объекта (запись "packed" хранится только целиком) """
+        if self._projection is not None and self._storage == STORAGE_PACKED:
+            raise ValueError(
+                f"{self.__class__.__name__} object fetched with only={sorted(self._projection)} "
+                f"can't be saved with storage \"{STORAGE_PACKED}\""
+            )
+
     @classmethod
-    def _set_global_instance(cls: Type[T], db_instance: redis.Redis) -> None:
+    def _set_global_instance(
+        cls: Type[T],
+        db_instance: redis.Redis,
+        health: Optional[AIORedisHealth] = None,
+    ) -> None:
         """ Установка глобальной ссылки на БД во время первого подключения """
         cls._db_instance = db_instance
+        cls._health = health
 
     @classmethod
-    def _get_keys_list(cls: Type[T], prefix: str) -> list[bytes]:
-        """ Формирование ключей для поиска в БД на основе префикса и атрибутов класса"""
-        return [f"{prefix}.{key}".encode() for key in cls.__annotations__.keys()]
+    def _get_keys_list(cls: Type[T], prefix: str, fields: Optional[tuple[str, ...]] = None) -> list[bytes]:
+        """ Формирование ключей для поиска в БД на основе префикса и атрибутов класса (или переданных полей) """
+        prefix_bytes: bytes = prefix.encode()
+        if fields is not None:
+            return [prefix_bytes + (KEYS_DELIMITER + field).encode() for field in fields]
+        return [prefix_bytes + suffix for suffix in cls._schema.field_suffixes]
 
-    @staticmethod
-    async def _is_connected(db_instance: redis.Redis) -> bool:
-        """ Проверка наличия подключения к серверу """
+    @classmethod
+    def _get_object_keys(cls: Type[T], prefix: str) -> list[bytes]:
+        """ Ключи БД, которые занимает объект с переданным префиксом """
+        if cls._storage != STORAGE_FIELDS:
+            return [prefix.encode()]
+        return cls._get_keys_list(prefix=prefix)
+
+    @classmethod
+    def _get_projection(cls: Type[T], only: Union[str, Iterable[str], None] = None) -> Optional[tuple[str, ...]]:
+        """ Проверка и подготовка списка запрашиваемых полей (None - все поля модели, строка - одно поле) """
+        if only is None:
+            return None
+        if isinstance(only, str):
+            only = [only]
+        unknown_fields: set[str] = set(only) - cls._schema.fields_set
+        if unknown_fields:
+            raise ValueError(f"{cls.__name__} has no fields {sorted(unknown_fields)}")
+        return tuple(dict.fromkeys(only))
+
+    @classmethod
+    async def _read_objects(
+        cls: Type[T],
+        prefixes: list[str],
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> list[T]:
+        """
+            Получение объектов с переданными префиксами с учётом способа хранения
+
+            fields - запрашиваемые поля (None - все поля модели), остальные поля
+                полученных объектов не заполняются
+
+            Для моделей с Meta.cache объекты (при запросе всех полей) сначала
+                ищутся в кэше, из БД читаются только отсутствующие в нём
+        """
+        if not prefixes or not cls._db_instance:
+            return []
+        if cls._cache is None or fields is not None:
+            return await cls._read_db_objects(prefixes=prefixes, fields=fields)
+        cache: AIORedisCache = cls._cache
+        cached: dict[str, T] = {}
+        missing: list[str] = []
+        for prefix in prefixes:
+            values: Optional[dict[str, Any]] = cache.get(prefix=prefix)
+            if values is None:
+                missing.append(prefix)
+            else:
+                cached[prefix] = cls(**values)._mark_clean()
+        if not missing:
+            return list(cached.values())
+        generation: int = cache.generation
+        for item in await cls._read_db_objects(prefixes=missing):
+            cache.put(prefix=item._table, values=item._get_cache_values(), generation=generation)
+            cached[item._table] = item
+        return [cached[prefix] for prefix in prefixes if prefix in cached]
+
+    @classmethod
+    async def _read_objects_map(cls: Type[T], prefixes: list[str], fields: Optional[tuple[str, ...]]) -> dict[str, T]:
+        """ Получение объектов с переданными префиксами в виде словаря {префикс: объект} """
+        return {item._table: item for item in await cls._read_objects(prefixes=prefixes, fields=fields)}
+
+    @classmethod
+    async def _read_db_objects(
+        cls: Type[T],
+        prefixes: list[str],
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> list[T]:
+        """ Получение объектов с переданными префиксами из БД с учётом способа хранения """
+        if not cls._db_instance:
+            return []
         try:
-            await db_instance.ping()  # type: ignore
-        except ConnectionError:
-            return False
+            items: list[T]
+            if cls._storage == STORAGE_PACKED:
+                keys: list[bytes] = [prefix.encode() for prefix in prefixes]
+                values: list[Optional[bytes]] = await cls._mget(db_instance=cls._db_instance, keys=keys)
+                items = cls._objects_from_packed_items(items=dict(zip(keys, values)), fields=fields)
+            else:
+                items = cls._objects_from_db_items(items=await cls._read_values(prefixes=prefixes, fields=fields))
+            if fields is not None:
+                items = [item._mark_projection(fields=fields) for item in items]
+            return items
+        except (ConnectionError, TimeoutError) as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+            raise
 
-        return True
+    def _get_cache_values(self) -> dict[str, Any]:
+        """ Значения полей и параметров ключа объекта для хранения в кэше """
+        values: dict[str, Any] = {str(key): value for key, value in self._params.items()}
+        values.update(self._schema.parse_key(prefix=self._table))
+        return values
+
+    def _invalidate_cache(self) -> None:
+        """ Удаление объекта из кэша модели после его изменения в БД """
+        if self._cache is not None:
+            self._cache.invalidate(prefixes=[self._table])
+
+    @classmethod
+    def cache_stats(cls: Type[T]) -> Optional[dict[str, int]]:
+        """ Счётчики попаданий и промахов кэша модели (None - Meta.cache не задан) """
+        return cls._cache.stats if cls._cache is not None else None
 
     @classmethod
-    async def get(cls: Type[T], _item: Union[T, None] = None, **kwargs) -> Union[T, None]:
+    async def _read_values(
+        cls: Type[T],
+        prefixes: list[str],
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> dict[bytes, Optional[bytes]]:
+        """
+            Получение значений полей объектов с переданными префиксами
+
+            Независимо от способа хранения результат приводится к виду
+                {b"<table>.<field>": value}, который ожидает _objects_from_db_items
+        """
+        keys: list[bytes] = []
+        for prefix in prefixes:
+            keys += cls._get_keys_list(prefix=prefix, fields=fields)
+        if not keys or not cls._db_instance:
+            return {}
+        values: list[Optional[bytes]]
+        if cls._storage == STORAGE_HASH:
+            hash_fields: tuple[str, ...] = fields or cls._schema.fields
+            values = await cls._hmget(db_instance=cls._db_instance, prefixes=prefixes, fields=hash_fields)
+        else:
+            values = await cls._mget(db_instance=cls._db_instance, keys=keys)
+        return dict(zip(keys, values))
+
+    @classmethod
+    def _get_read_batch_size(cls: Type[T]) -> int:
+        """ Количество ключей в одной команде чтения (Meta.read_batch_size или значение по умолчанию ORM) """
+        return max(cls._read_batch_size or cls._default_read_batch_size, 1)
+
+    @classmethod
+    async def _gather_bounded(cls: Type[T], reads: list[Callable[[], Awaitable[list]]]) -> list[list]:
+        """
+            Выполнение команд чтения порциями с ограничением количества одновременно
+                выполняемых команд (_read_max_in_flight), результаты возвращаются
+                в порядке переданных команд
+        """
+        if len(reads) == 1:
+            return [await reads[0]()]
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max(cls._read_max_in_flight, 1))
+
+        async def read_chunk(read: Callable[[], Awaitable[list]]) -> list:
+            async with semaphore:
+                return await read()
+
+        return list(await asyncio.gather(*(read_chunk(read) for read in reads)))
+
+    @classmethod
+    async def _mget(cls: Type[T], db_instance: redis.Redis, keys: list[bytes]) -> list[Optional[bytes]]:
+        """
+            MGET большого количества ключей порциями (не более _get_read_batch_size ключей),
+                которые выполняются параллельно через пул подключений
+        """
+        batch_size: int = cls._get_read_batch_size()
+        reads: list[Callable[[], Awaitable[list]]] = [
+            functools.partial(db_instance.mget, keys[start:start + batch_size])
+            for start in range(0, len(keys), batch_size)
+        ]
+        return [value for chunk in await cls._gather_bounded(reads=reads) for value in chunk]
+
+    @classmethod
+    async def _hmget(
+        cls: Type[T],
+        db_instance: redis.Redis,
+        prefixes: list[str],
+        fields: tuple[str, ...],
+    ) -> list[Optional[bytes]]:
+        """
+            HMGET объектов порциями: HMGET одной порции (не более _get_read_batch_size
+                полей) отправляются одним сетевым вызовом (pipeline)
+        """
+        batch_size: int = max(cls._get_read_batch_size() // max(len(fields), 1), 1)
+
+        async def read_chunk(chunk: list[str]) -> list:
+            pipe = db_instance.pipeline(transaction=False)
+            for prefix in chunk:
+                pipe.hmget(prefix, fields)
+            return [value for row in await pipe.execute() for value in row]
+
+        reads: list[Callable[[], Awaitable[list]]] = [
+            functools.partial(read_chunk, prefixes[start:start + batch_size])
+            for start in range(0, len(prefixes), batch_size)
+        ]
+        return [value for chunk in await cls._gather_bounded(reads=reads) for value in chunk]
+
+    @classmethod
+    def _check_connection(cls: Type[T], db_instance: Union[redis.Redis, None]) -> redis.Redis:
+        """
+            Проверка наличия подключения к серверу без обращения к нему
+
+            Состояние глобального подключения отслеживается AIORedisHealth, поэтому
+                при известном отсутствии подключения операция завершается сразу
+        """
+        if not db_instance:
+            raise Exception("Redis database not connected...")
+        if cls._health and cls._health.client is db_instance and not cls._health.available:
+            raise Exception("Redis database not connected (connection lost)...")
+        return db_instance
+
+    @classmethod
+    def _on_connection_error(cls: Type[T], db_instance: Union[redis.Redis, None], exception: Exception) -> None:
+        """ Перевод глобального подключения в состояние "недоступно" при ошибке подключения """
+        if isinstance(exception, (ConnectionError, TimeoutError)) and cls._health and cls._health.client is db_instance:
+            cls._health.mark_unavailable()
+
+    @classmethod
+    async def get(
+        cls: Type[T],
+        _item: Union[T, None] = None,
+        only: Union[str, Iterable[str], None] = None,
+        **kwargs,
+    ) -> Union[T, None]:
         """
             Получение одного объекта по выбранному фильтру
 
                 AIOStorageItem.get(subsystem_id=10, tag_id=55)
                 AIOStorageItem.get(_item=AIOStorageItem(subsystem_id=10))
+                AIOStorageItem.get(subsystem_id=10, tag_id=55, only=["any_value"])
+
+            only - список запрашиваемых полей, остальные поля объекта не заполняются
+
+            Для моделей с Meta.loader одновременные вызовы get объединяются в одно
+                чтение, одинаковые одновременные запросы получают один объект
         """
-        if not cls._db_instance or not await cls._is_connected(db_instance=cls._db_instance):
-            raise Exception("Redis database not connected...")
+        cls._check_connection(db_instance=cls._db_instance)
+        fields: Optional[tuple[str, ...]] = cls._get_projection(only=only)
         if len(kwargs) and _item:
             raise Exception(f"{cls.__name__}.get() has _item and kwargs. It's not possible.")
         filter: str
@@ -191,64 +687,613 @@ class AIORedisItem(AIOStorageItem):
                 raise NotEnoughParamsException(
                     f"{cls.__name__} not enough params to get method..."
                 )
-        keys: list[bytes] = cls._get_keys_list(prefix=filter)
-        values: list[bytes] = cast(list[bytes], await cls._db_instance.mget(keys))
-        if not [v for v in values if v]:
+        if cls._loader is not None:
+            loaded: Optional[T] = await cls._loader.load(prefix=filter, fields=fields)
+            # Объект порции общий для всех ожидающих одинаковых запросов,
+            #   поэтому каждый вызов получает свою копию
+            return loaded._copy() if loaded is not None else None
+        finded_objects: list[T] = await cls._read_objects(prefixes=[filter], fields=fields)
+        if not finded_objects:
             return None
-        finded_objects: list[T] = cls._objects_from_db_items(items=dict(zip(keys, values)))
         result: Union[T, None] = finded_objects[0]
         return result
 
     @classmethod
-    async def filter(cls: Type[T], _items: Union[list[T], None] = None, **kwargs) -> list[T]:
+    async def filter(
+        cls: Type[T],
+        _items: Union[list[T], None] = None,
+        only: Union[str, Iterable[str], None] = None,
+        **kwargs,
+    ) -> list[T]:
         """
             Получение объектов по фильтру переданных аргументов, например:
 
                 AIOStorageItem.filter(subsystem_id=10, tag_id=55)
                 AIOStorageItem.filter(_items=[AIOStorageItem(subsystem_id=10), ...])
+                AIOStorageItem.filter(subsystem_id=10, only=["date_time", "any_value"])
+
+            only - список запрашиваемых полей, остальные поля объектов не заполняются
+                (объекты без значений всех запрошенных полей не возвращаются)
+
+            Для полей из Meta.range_indexes доступны фильтры по диапазону значений
+                (суффиксы __gte, __gt, __lte, __lt), сортировка (order_by, "-" -
+                по убыванию) и ограничение количества объектов (limit), например:
+
+                AIOStorageItem.filter(subsystem_id=10, date_time__gte=100, order_by="-date_time", limit=10)
+                AIOStorageItem.filter(order_by="-date_time", limit=10)  # Без других фильтров
+
+            Сортировка по полю без индекса и limit без индекса выполняются на стороне клиента
         """
-        if not cls._db_instance or not await cls._is_connected(db_instance=cls._db_instance):
-            raise Exception("Redis database not connected...")
-        if not len(kwargs) and not _items:
+        cls._check_connection(db_instance=cls._db_instance)
+        fields: Optional[tuple[str, ...]] = cls._get_projection(only=only)
+        order_by: Optional[str] = kwargs.pop("order_by", None)
+        limit: Optional[int] = kwargs.pop("limit", None)
+        ranges: dict[str, list[str]] = cls._pop_range_lookups(kwargs=kwargs)
+        if not len(kwargs) and not ranges and not _items and not cls._is_top_query(order_by=order_by, limit=limit):
             raise Exception(f"{cls.__name__}.filter() has empty filter. OOM possible.")
-        if len(kwargs) and _items:
+        if (len(kwargs) or ranges) and _items:
             raise Exception(f"{cls.__name__}.filter() has _items and kwargs. It's not possible.")
-        filters_list: list[str]
-        keys: list[bytes] = []
+        prefixes: list[str] = []
+        index_prefixes: list[str] = []
+        async for prefixes_page, source in cls._iter_prefix_pages(
+            _items=_items,
+            fields=fields,
+            _ranges=ranges,
+            _order_by=order_by,
+            _limit=limit,
+            **kwargs,
+        ):
+            prefixes += prefixes_page
+            if source == PREFIXES_INDEX:
+                index_prefixes += prefixes_page
+        # Объект может быть найден по нескольким полям на разных страницах SCAN
+        prefixes = list(dict.fromkeys(prefixes))
+
+        result: list[T] = await cls._read_objects(prefixes=prefixes, fields=fields)
+        if index_prefixes and fields is None:
+            await cls._cleanup_indexes(prefixes=index_prefixes, items=result)
+        if order_by and cls._get_order_field(order_by=order_by)[0] not in cls._range_indexes:
+            result = cls._sort_items(items=result, order_by=order_by)
+        if limit is not None:
+            result = result[:limit]
+
+        return result
+
+    @classmethod
+    async def iter_filter(
+        cls: Type[T],
+        _items: Union[list[T], None] = None,
+        _batch_size: int = ITER_BATCH_SIZE,
+        only: Union[str, Iterable[str], None] = None,
+        **kwargs,
+    ) -> AsyncIterator[T]:
+        """
+            Потоковое получение объектов по фильтру переданных аргументов, например:
+
+                async for item in AIOStorageItem.iter_filter(subsystem_id=10):
+                    ...
+
+            - ключи по маске перебираются курсором SCAN (без блокирующего KEYS)
+            - значения запрашиваются порциями MGET не более _batch_size объектов,
+              следующая порция запрашивается только после обработки предыдущей,
+              поэтому расход памяти не зависит от количества найденных объектов
+            - как и SCAN, при изменении keyspace во время обхода может вернуть
+              объект повторно (объект, ключи полей которого попали на разные
+              страницы SCAN, возвращается один раз)
+            - only - список запрашиваемых полей (как и в filter)
+            - фильтры по диапазону значений, order_by и limit (как и в filter)
+              доступны только для полей из Meta.range_indexes
+        """
+        cls._check_connection(db_instance=cls._db_instance)
+        fields: Optional[tuple[str, ...]] = cls._get_projection(only=only)
+        order_by: Optional[str] = kwargs.pop("order_by", None)
+        limit: Optional[int] = kwargs.pop("limit", None)
+        ranges: dict[str, list[str]] = cls._pop_range_lookups(kwargs=kwargs)
+        if not len(kwargs) and not ranges and not _items and not cls._is_top_query(order_by=order_by, limit=limit):
+            raise Exception(f"{cls.__name__}.iter_filter() has empty filter. OOM possible.")
+        if (len(kwargs) or ranges) and _items:
+            raise Exception(f"{cls.__name__}.iter_filter() has _items and kwargs. It's not possible.")
+        order_by_index: bool = bool(order_by) and cls._get_order_field(order_by=order_by or "")[0] in cls._range_indexes
+        if (order_by or limit is not None) and not (ranges or order_by_index):
+            raise ValueError(f"{cls.__name__}.iter_filter() supports order_by and limit only by Meta.range_indexes")
+        async for prefixes, source in cls._iter_prefix_pages(
+            _items=_items,
+            fields=fields,
+            _ranges=ranges,
+            _order_by=order_by,
+            _limit=limit,
+            **kwargs,
+        ):
+            for start in range(0, len(prefixes), _batch_size):
+                batch: list[str] = prefixes[start:start + _batch_size]
+                items: list[T] = await cls._read_objects(prefixes=batch, fields=fields)
+                if source == PREFIXES_INDEX and fields is None:
+                    await cls._cleanup_indexes(prefixes=batch, items=items)
+                for item in items:
+                    yield item
+
+    @classmethod
+    async def count(cls: Type[T], **kwargs) -> int:
+        """
+            Количество объектов по фильтру без получения их значений, например:
+
+                await AIOStorageItem.count(subsystem_id=10)
+                await AIOStorageItem.count(subsystem_id=10, date_time__gte=100)
+
+            - ключи объектов, сформированные из фильтра или полученные из индексов,
+              проверяются командой EXISTS
+            - при поиске по маске найденные ключи считаются обходом SCAN
+            - объект считается существующим, если в БД есть хотя бы один его ключ
+        """
+        cls._check_connection(db_instance=cls._db_instance)
+        ranges: dict[str, list[str]] = cls._pop_range_lookups(kwargs=kwargs)
+        found_count: int = 0
+        async for prefixes, source in cls._iter_prefix_pages(_ranges=ranges, **kwargs):
+            if source == PREFIXES_SCAN:
+                # Каждый объект возвращается обходом один раз (см. _scan_prefixes)
+                found_count += len(prefixes)
+            else:
+                found_count += sum(await cls._exists_prefixes(prefixes=prefixes))
+        return found_count
+
+    @classmethod
+    async def exists(cls: Type[T], **kwargs) -> bool:
+        """
+            Проверка наличия хотя бы одного объекта по фильтру без получения значений, например:
+
+                await AIOStorageItem.exists(subsystem_id=10, tag_id=55)
+
+            Обход ключей по маске завершается на первом найденном объекте
+        """
+        cls._check_connection(db_instance=cls._db_instance)
+        ranges: dict[str, list[str]] = cls._pop_range_lookups(kwargs=kwargs)
+        async for prefixes, source in cls._iter_prefix_pages(_ranges=ranges, **kwargs):
+            if source == PREFIXES_SCAN and prefixes:
+                return True
+            if source != PREFIXES_SCAN and any(await cls._exists_prefixes(prefixes=prefixes)):
+                return True
+        return False
+
+    @classmethod
+    async def exists_many(cls: Type[T], items: list[T]) -> list[bool]:
+        """
+            Проверка наличия в БД каждого из переданных объектов (одним сетевым вызовом), например:
+
+                await AIOStorageItem.exists_many([AIOStorageItem(subsystem_id=10, tag_id=55), ...])
+        """
+        cls._check_connection(db_instance=cls._db_instance)
+        return await cls._exists_prefixes(prefixes=[item._table for item in items])
+
+    @classmethod
+    async def _exists_prefixes(cls: Type[T], prefixes: list[str]) -> list[bool]:
+        """ Наличие объектов с переданными префиксами (EXISTS ключей каждого объекта, pipeline) """
+        if not prefixes or not cls._db_instance:
+            return []
+        db_instance: redis.Redis = cls._db_instance
+        keys_count: int = len(cls._get_object_keys(prefix=prefixes[0]))
+        batch_size: int = max(cls._get_read_batch_size() // max(keys_count, 1), 1)
+
+        async def read_chunk(chunk: list[str]) -> list:
+            pipe = db_instance.pipeline(transaction=False)
+            for prefix in chunk:
+                pipe.exists(*cls._get_object_keys(prefix=prefix))
+            return [bool(exists_count) for exists_count in await pipe.execute()]
+
+        reads: list[Callable[[], Awaitable[list]]] = [
+            functools.partial(read_chunk, prefixes[start:start + batch_size])
+            for start in range(0, len(prefixes), batch_size)
+        ]
+        try:
+            return [exists for chunk in await cls._gather_bounded(reads=reads) for exists in chunk]
+        except (ConnectionError, TimeoutError) as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+            raise
+
+    @classmethod
+    async def _iter_prefixes(
+        cls: Type[T],
+        _items: Union[list[T], None] = None,
+        fields: Optional[tuple[str, ...]] = None,
+        **kwargs,
+    ) -> AsyncIterator[list[str]]:
+        """
+            Получение префиксов (table) искомых объектов порциями:
+                - для объектов и фильтров без масок - сразу списком
+                - для фильтров с маской - из индексов (Meta.indexes) или
+                  постранично, по мере обхода SCAN
+        """
+        async for prefixes, _ in cls._iter_prefix_pages(_items=_items, fields=fields, **kwargs):
+            yield prefixes
+
+    @classmethod
+    async def _iter_prefix_pages(
+        cls: Type[T],
+        _items: Union[list[T], None] = None,
+        fields: Optional[tuple[str, ...]] = None,
+        _ranges: Optional[dict[str, list[str]]] = None,
+        _order_by: Optional[str] = None,
+        _limit: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[tuple[list[str], str]]:
+        """ Получение префиксов искомых объектов порциями с источником префиксов (PREFIXES_*) """
         if _items:
-            filters_list = [item._table for item in _items]
-            for filter in filters_list:
-                keys += cls._get_keys_list(prefix=filter)
-        else:
-            # Формирование списка фильтров для возможности поиска входящих в список
-            filters_list = cls._get_filters_by_kwargs(**kwargs)
-            for filter in filters_list:
-                keys_list: list[bytes] = cls._get_keys_list(prefix=filter)
-                if [key for key in keys_list if "*" in str(key)]:
-                    # Если не передан один из параметров и нужен поиск по ключам
-                    keys += await cls._db_instance.keys(pattern=filter + ".*")
-                else:
-                    # Если все параметры присутствуют, то можно использовать только
-                    #   имена атрибутов
-                    keys += keys_list
+            yield [item._table for item in _items], PREFIXES_DIRECT
+            return
+        order_field: Optional[str] = cls._get_order_field(order_by=_order_by)[0] if _order_by else None
+        if _ranges or order_field in cls._range_indexes:
+            yield (
+                await cls._read_range_index(ranges=_ranges or {}, order_by=_order_by, limit=_limit, **kwargs),
+                PREFIXES_INDEX,
+            )
+            return
+        plan: AIORedisQueryPlan = cls._get_query_plan(**kwargs)
+        # Если все параметры присутствуют, то ключи объектов формируются без обращения к серверу
+        if plan.prefixes:
+            yield plan.prefixes, PREFIXES_DIRECT
+        if not plan.matches:
+            return
+        # Если не передан один из параметров, используется индекс или поиск по ключам
+        index_keys: Optional[list[list[str]]] = cls._get_index_lookup(**kwargs)
+        if index_keys is not None:
+            yield await cls._read_index(index_keys=index_keys, **kwargs), PREFIXES_INDEX
+            return
+        for match in plan.matches:
+            async for prefixes in cls._scan_prefixes(filter=match, fields=fields, constraints=plan.constraints):
+                yield prefixes, PREFIXES_SCAN
+
+    @classmethod
+    def _pop_range_lookups(cls: Type[T], kwargs: dict[str, Any]) -> dict[str, list[str]]:
+        """
+            Извлечение из фильтра условий по диапазону значений полей
+                ({"date_time__gte": 10} -> {"date_time": ["10", "+inf"]})
+        """
+        ranges: dict[str, list[str]] = {}
+        for key in list(kwargs):
+            for suffix, (position, modifier) in RANGE_SUFFIXES.items():
+                if not key.endswith(suffix):
+                    continue
+                field: str = key[:-len(suffix)]
+                if field not in cls._range_indexes:
+                    raise ValueError(f"{cls.__name__} has no range index for field {field}")
+                bounds: list[str] = ranges.setdefault(field, ["-inf", "+inf"])
+                bounds[position] = f"{modifier}{float(kwargs.pop(key))!r}"
+                break
+        return ranges
+
+    @classmethod
+    def _get_order_field(cls: Type[T], order_by: str) -> tuple[str, bool]:
+        """ Поле сортировки и признак сортировки по убыванию ("-date_time") """
+        field: str = order_by.lstrip("-")
+        if field not in cls._schema.fields_set:
+            raise ValueError(f"{cls.__name__} has no field {field}")
+        return field, order_by.startswith("-")
+
+    @classmethod
+    def _is_top_query(cls: Type[T], order_by: Optional[str], limit: Optional[int]) -> bool:
+        """ Запрос первых limit объектов по индексу значений поля (ограничен и без других фильтров) """
+        if limit is None or not order_by:
+            return False
+        return cls._get_order_field(order_by=order_by)[0] in cls._range_indexes
+
+    @classmethod
+    def _sort_items(cls: Type[T], items: list[T], order_by: str) -> list[T]:
+        """ Сортировка объектов на стороне клиента (объекты без значения поля - в конце) """
+        field, descending = cls._get_order_field(order_by=order_by)
+        with_values: list[T] = [item for item in items if item._params.get(field) is not None]
+        without_values: list[T] = [item for item in items if item._params.get(field) is None]
+        with_values.sort(key=lambda item: item._params[field], reverse=descending)
+        return with_values + without_values
+
+    @classmethod
+    def _get_prefix_matcher(cls: Type[T], **kwargs) -> Callable[[str], bool]:
+        """ Проверка соответствия префикса объекта фильтру по параметрам Meta.table на стороне клиента """
+        if not kwargs:
+            return lambda prefix: True
+        plan: AIORedisQueryPlan = cls._get_query_plan(**kwargs)
+        prefixes: set[str] = set(plan.prefixes)
+
+        def matcher(prefix: str) -> bool:
+            if prefix in prefixes:
+                return True
+            return (
+                any(fnmatchcase(prefix, match) for match in plan.matches)
+                and cls._schema.check_constraints(prefix, plan.constraints)
+            )
+
+        return matcher
+
+    @classmethod
+    def _get_range_index_key(cls: Type[T], field: str) -> str:
+        """ Ключ индекса по значениям поля (ZSET префиксов объектов) """
+        return f"{RANGE_INDEX_PREFIX}{cls.Meta.table}{KEYS_DELIMITER}{field}"
+
+    @classmethod
+    async def _read_range_index(
+        cls: Type[T],
+        ranges: dict[str, list[str]],
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        **kwargs,
+    ) -> list[str]:
+        """
+            Получение префиксов объектов из индексов по значениям полей (ZRANGEBYSCORE)
 
-        values: list[bytes] = cast(list[bytes], await cls._db_instance.mget(keys))
-        # Очистка пустых значений полученных данных
-        if not [v for v in values if v]:
+            - префиксы упорядочены по полю сортировки (или первому полю фильтра)
+            - условия по нескольким полям - пересечение результатов
+            - параметры Meta.table проверяются на стороне клиента, поэтому limit
+              передаётся серверу, только если других условий нет
+        """
+        if not cls._db_instance:
             return []
+        order_field: Optional[str] = None
+        descending: bool = False
+        if order_by:
+            order_field, descending = cls._get_order_field(order_by=order_by)
+        if order_field not in cls._range_indexes:
+            order_field, descending = None, False
+        primary_field: str = order_field or next(iter(ranges))
+        range_fields: list[str] = [primary_field] + [field for field in ranges if field != primary_field]
+        server_limit: bool = limit is not None and len(range_fields) == 1 and not kwargs
+        pipe = cls._db_instance.pipeline(transaction=False)
+        for field in range_fields:
+            minimum, maximum = ranges.get(field, ["-inf", "+inf"])
+            start, num = (0, limit) if server_limit and field == primary_field else (None, None)
+            if field == primary_field and descending:
+                pipe.zrevrangebyscore(cls._get_range_index_key(field=field), maximum, minimum, start=start, num=num)
+            else:
+                pipe.zrangebyscore(cls._get_range_index_key(field=field), minimum, maximum, start=start, num=num)
+        try:
+            members: list[list[bytes]] = await pipe.execute()
+        except (ConnectionError, TimeoutError) as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+            raise
+        other_members: list[set[bytes]] = [set(field_members) for field_members in members[1:]]
+        matcher: Callable[[str], bool] = cls._get_prefix_matcher(**kwargs)
+        prefixes: list[str] = [
+            prefix.decode()
+            for prefix in members[0]
+            if all(prefix in field_members for field_members in other_members) and matcher(prefix.decode())
+        ]
+        return prefixes[:limit] if limit is not None else prefixes
+
+    @classmethod
+    def _get_index_key(cls: Type[T], param: str, value: Any) -> str:
+        """ Ключ индекса (множества префиксов объектов) для значения параметра """
+        return f"{INDEX_PREFIX}{cls.Meta.table}{KEYS_DELIMITER}{param}{KEYS_DELIMITER}{format(value)}"
+
+    @classmethod
+    def _get_filter_values(cls: Type[T], **kwargs) -> Optional[dict[str, set[str]]]:
+        """
+            Допустимые значения параметров Meta.table из фильтра
+                (None - если в значениях есть символы маски)
+        """
+        values: dict[str, set[str]] = {}
+        for key, value in kwargs.items():
+            name: str = key[:-len(IN_SUFFIX)] if key.endswith(IN_SUFFIX) else key
+            param_values: list[Any] = list(value) if key.endswith(IN_SUFFIX) else [value]
+            if name not in cls._keys_positions:
+                continue
+            formatted_values: set[str] = {format(param_value) for param_value in param_values}
+            if any(char in param_value for param_value in formatted_values for char in GLOB_CHARS):
+                return None
+            values[name] = values[name] & formatted_values if name in values else formatted_values
+        return values
 
-        result: list[T] = cls._objects_from_db_items(items=dict(zip(keys, values)))
+    @classmethod
+    def _get_index_lookup(cls: Type[T], **kwargs) -> Optional[list[list[str]]]:
+        """
+            Ключи индексов для поиска по фильтру: список (по параметрам) списков
+                ключей (по значениям параметра) или None, если индекс не применим
+        """
+        if not cls._indexes:
+            return None
+        values: Optional[dict[str, set[str]]] = cls._get_filter_values(**kwargs)
+        if values is None:
+            return None
+        index_keys: list[list[str]] = [
+            [cls._get_index_key(param=param, value=value) for value in sorted(values[param])]
+            for param in cls._indexes
+            if param in values
+        ]
+        return index_keys or None
 
+    @classmethod
+    async def _read_index(cls: Type[T], index_keys: list[list[str]], **kwargs) -> list[str]:
+        """
+            Получение префиксов объектов из индексов: объединение (SUNION) множеств
+                значений каждого параметра и пересечение по параметрам, остальные
+                параметры фильтра проверяются на стороне клиента
+        """
+        if not cls._db_instance:
+            return []
+        pipe = cls._db_instance.pipeline(transaction=False)
+        for keys in index_keys:
+            pipe.sunion(keys)
+        try:
+            members: list[set[bytes]] = await pipe.execute()
+        except (ConnectionError, TimeoutError) as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+            raise
+        prefixes: set[bytes] = set.intersection(*members) if members else set()
+        values: dict[str, set[str]] = cls._get_filter_values(**kwargs) or {}
+        result: list[str] = []
+        for prefix in sorted(prefixes):
+            params: dict[str, str] = cls._schema.parse_key_bytes(prefix=prefix)
+            if all(params.get(name) in allowed for name, allowed in values.items()):
+                result.append(prefix.decode())
         return result
 
     @classmethod
-    def _all_fields_is_empty(cls: Type[T], items: dict[bytes, bytes], fields: list[bytes]) -> bool:
-        """ Проверка на отсутствие всех значений создаваемого объекта """
-        for field in fields:
-            with suppress(pickle.UnpicklingError):
-                if field in items and items[field] and pickle.loads(items[field]) is not None:
-                    return False
-        return True
+    async def _cleanup_indexes(cls: Type[T], prefixes: list[str], items: list[T]) -> None:
+        """
+            Удаление из индексов префиксов объектов, которых нет в БД
+                (например, с истёкшим временем жизни)
+        """
+        found: set[str] = {item._table for item in items}
+        missing: list[str] = [prefix for prefix in prefixes if prefix not in found]
+        if not missing or not cls._db_instance:
+            return
+        pipe = cls._db_instance.pipeline(transaction=False)
+        for prefix in missing:
+            cls._index_commands(client=pipe, prefix=prefix, remove=True)
+        with suppress(ConnectionError, TimeoutError):
+            await pipe.execute()
+
+    @classmethod
+    def _index_commands(
+        cls: Type[T],
+        client: Any,
+        prefix: str,
+        remove: bool = False,
+        values: Optional[Mapping[_Key, _Value]] = None,
+    ) -> None:
+        """
+            Добавление в client (pipeline) команд добавления объекта в индексы
+                (SADD, ZADD значения поля из values) или удаления из них (SREM, ZREM)
+        """
+        if cls._indexes:
+            params: dict[str, str] = cls._schema.parse_key(prefix=prefix)
+            for param in cls._indexes:
+                index_key: str = cls._get_index_key(param=param, value=params[param])
+                if remove:
+                    client.srem(index_key, prefix)
+                else:
+                    client.sadd(index_key, prefix)
+        for field in cls._range_indexes:
+            # Значение поля не изменено
+            if not remove and values is not None and field not in values:
+                continue
+            range_index_key: str = cls._get_range_index_key(field=field)
+            value: Any = None if remove or values is None else values.get(field)
+            if value is None:
+                client.zrem(range_index_key, prefix)
+            else:
+                client.zadd(range_index_key, {prefix: float(value)})
+
+    @classmethod
+    def _get_query_plan(cls: Type[T], **kwargs) -> AIORedisQueryPlan:
+        """
+            План поиска объектов по фильтру: комбинации списков значений (__in)
+                перебираются только для формирования ключей объектов, поиск
+                по маске выполняется одним обходом ключей
+        """
+        params: dict[str, Any] = {}
+        in_params: dict[str, Any] = {}
+        for key, value in kwargs.items():
+            if key.endswith(IN_SUFFIX):
+                in_params[key[:-len(IN_SUFFIX)]] = value
+            else:
+                params[key] = value
+        return cls._schema.plan(params=params, in_params=in_params)
+
+    @classmethod
+    async def _scan_prefixes(
+        cls: Type[T],
+        filter: str,
+        count: int = SCAN_COUNT,
+        fields: Optional[tuple[str, ...]] = None,
+        constraints: Optional[Mapping[str, frozenset[str]]] = None,
+    ) -> AsyncIterator[list[str]]:
+        """
+            Постраничный обход ключей по маске (SCAN MATCH/COUNT) с выделением
+                префиксов найденных объектов
+
+            - "hash", "packed": маска соответствует ключу объекта
+            - "fields": маска "<filter>.*" находит объект по любому из сохранённых
+              полей (из fields, если переданы; для одного поля - маска
+              "<filter>.<field>"); объект возвращается только со страницы,
+              на которой найден ключ его первого (в порядке полей модели)
+              сохранённого поля: для префиксов, найденных по другим полям,
+              одним pipeline проверяется отсутствие ключей предшествующих полей,
+              поэтому объект не возвращается повторно с разных страниц SCAN
+            - constraints - допустимые значения параметров, проверяемые на стороне
+              клиента (см. AIORedisSchema.plan)
+        """
+        if not cls._schema.fields or not cls._db_instance:
+            return
+        fields_set: frozenset[str] = cls._schema.fields_set if fields is None else frozenset(fields)
+        # Порядок полей, по которому определяется первое сохранённое поле объекта
+        scan_fields: tuple[str, ...] = tuple(field for field in cls._schema.fields if field in fields_set)
+        fields_positions: dict[str, int] = {field: position for position, field in enumerate(scan_fields)}
+        key_type: Optional[str] = None
+        match: str = filter
+        # Маска может совпасть с ключами других моделей, поэтому проверяется
+        #   тип и количество сегментов ключа (и имя поля для "fields")
+        segments_count: int = cls._schema.segments_count
+        if cls._storage == STORAGE_HASH:
+            key_type = "hash"
+        elif cls._storage == STORAGE_PACKED:
+            key_type = "string"
+        else:
+            key_type = "string"
+            match = filter + KEYS_DELIMITER + (fields[0] if fields and len(fields) == 1 else "*")
+            segments_count += 1
+        cursor: int = 0
+        while True:
+            try:
+                cursor, keys = await cls._db_instance.scan(
+                    cursor=cursor,
+                    match=match,
+                    count=count,
+                    _type=key_type,
+                )
+            except (ConnectionError, TimeoutError) as exception:
+                cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+                raise
+            # Префикс объекта и позиция первого найденного на странице поля
+            #   (SCAN не гарантирует уникальность ключей в выдаче)
+            positions: dict[str, int] = {}
+            for key in keys:
+                segments: list[str] = key.decode().split(KEYS_DELIMITER)
+                if len(segments) != segments_count:
+                    continue
+                if cls._storage != STORAGE_FIELDS:
+                    positions.setdefault(KEYS_DELIMITER.join(segments), 0)
+                elif segments[-1] in fields_positions:
+                    prefix: str = KEYS_DELIMITER.join(segments[:-1])
+                    position: int = fields_positions[segments[-1]]
+                    positions[prefix] = min(position, positions.get(prefix, position))
+            if constraints:
+                positions = {
+                    prefix: position
+                    for prefix, position in positions.items()
+                    if cls._schema.check_constraints(prefix, constraints)
+                }
+            prefixes: list[str] = await cls._filter_first_field_prefixes(
+                db_instance=cls._db_instance,
+                positions=positions,
+                scan_fields=scan_fields,
+            )
+            if prefixes:
+                yield prefixes
+            if not cursor:
+                break
+
+    @classmethod
+    async def _filter_first_field_prefixes(
+        cls: Type[T],
+        db_instance: redis.Redis,
+        positions: dict[str, int],
+        scan_fields: tuple[str, ...],
+    ) -> list[str]:
+        """
+            Отбор префиксов, найденных на странице SCAN по ключу первого
+                сохранённого поля объекта (объекты с ключами предшествующих
+                полей будут найдены по этим ключам на своих страницах)
+        """
+        candidates: list[tuple[str, int]] = [(prefix, position) for prefix, position in positions.items() if position]
+        if not candidates:
+            return list(positions)
+        try:
+            pipe = db_instance.pipeline(transaction=False)
+            for prefix, position in candidates:
+                pipe.exists(*[f"{prefix}{KEYS_DELIMITER}{field}" for field in scan_fields[:position]])
+            results: list[int] = await pipe.execute()
+        except (ConnectionError, TimeoutError) as exception:
+            cls._on_connection_error(db_instance=db_instance, exception=exception)
+            raise
+        skipped: set[str] = {prefix for (prefix, _), exists in zip(candidates, results) if exists}
+        return [prefix for prefix in positions if prefix not in skipped]
 
     @classmethod
     def _get_src_values_for_meta(cls: Type[T], table: str) -> dict:
@@ -263,36 +1308,70 @@ class AIORedisItem(AIOStorageItem):
         return src_values_for_meta
 
     @classmethod
-    def _objects_from_db_items(cls: Type[T], items: dict[bytes, bytes]) -> list[T]:
-        """ Формирование cls(RedisItem)-объектов из данных базы """
-        # Подготовка базовых данных для формирования объектов из ключей
-        #   (уникальные ключи, без имён полей)
-        tables: set[str] = {
-            str(key).rsplit(KEYS_DELIMITER, 1)[0]
-            for key in items.keys()
-        }
+    def _objects_from_db_items(cls: Type[T], items: Mapping[bytes, Optional[bytes]]) -> list[T]:
+        """
+            Формирование cls(RedisItem)-объектов из данных базы
+
+            Данные обрабатываются за один проход: ключи группируются по префиксу
+                объекта (без декодирования ключей в строки), каждое значение
+                десериализуется один раз
+        """
+        delimiter: bytes = KEYS_DELIMITER.encode()
+        fields_by_bytes: dict[bytes, str] = cls._schema.fields_by_bytes
+        # {префикс объекта: {имя поля: значение}}
+        objects_fields: dict[bytes, dict[str, Any]] = {}
+        for key, value in items.items():
+            prefix, _, field = key.rpartition(delimiter)
+            fields: Optional[dict[str, Any]] = objects_fields.get(prefix)
+            if fields is None:
+                fields = objects_fields[prefix] = {}
+            # Отсутствующие в БД поля (например, истёкшие) остаются пустыми
+            if value:
+                field_name: str = fields_by_bytes.get(field) or field.decode()
+                fields[field_name] = cls._codec.decode(field_name, value)
+
         result_items: list[T] = []
-        for table in tables:
-            # Отбор полей с префиксом текущей table
-            fields_src: list[bytes] = list(
-                filter(lambda item: str(item).startswith(table), items)
-            )
-            if cls._all_fields_is_empty(items=items, fields=fields_src):
+        for prefix, fields in objects_fields.items():
+            # Объекты без значений (не найденные в БД) не возвращаются
+            if all(value is None for value in fields.values()):
                 continue
-            fields: dict[str, Any] = {}
-            for field in fields_src:
-                # Формирование атрибутов объекта из присутствующих полей
-                key: str = field.decode().rsplit(KEYS_DELIMITER, 1)[1]
-                fields[key] = pickle.loads(items[field])
-
             # Формирование Meta из table класса и префикса полученных данных
-            table_args: dict = {}
-            src_values: list[str] = table.split('.')
-            for key, position in cls._keys_positions.items():
-                table_args[key] = src_values[position]
+            fields.update(cls._schema.parse_key_bytes(prefix=prefix))
+            result_items.append(cls(**fields)._mark_clean())
 
-            result_items.append(cls(**(fields | table_args)))
+        return result_items
 
+    @classmethod
+    def _objects_from_packed_items(
+        cls: Type[T],
+        items: dict[bytes, Optional[bytes]],
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> list[T]:
+        """
+            Формирование cls(RedisItem)-объектов из упакованных данных базы
+                ({b"<table>": сериализованный словарь {имя поля: значение}})
+
+            Значения сопоставляются полям по имени, поэтому добавление или удаление
+                полей модели не смещает ранее сохранённые значения
+            Запись хранится целиком, поэтому при переданных fields она читается
+                полностью, а в объекты попадают только запрошенные поля
+        """
+        fields_set: frozenset[str] = cls._schema.fields_set if fields is None else frozenset(fields)
+        result_items: list[T] = []
+        for key, value in items.items():
+            if not value:
+                continue
+            fields_values: dict[str, Any] = {
+                attr_name: attr_value
+                for attr_name, attr_value in cls._codec.decode_mapping(value).items()
+                if attr_name in fields_set
+            }
+            # Объекты без значений не возвращаются, как и для остальных способов хранения
+            if all(attr_value is None for attr_value in fields_values.values()):
+                continue
+            # Формирование Meta из table класса и ключа объекта
+            fields_values.update(cls._schema.parse_key_bytes(prefix=key))
+            result_items.append(cls(**fields_values)._mark_clean())
         return result_items
 
     @staticmethod
@@ -322,7 +1401,7 @@ class AIORedisItem(AIOStorageItem):
             if not key.endswith(IN_SUFFIX):
                 basic_kwargs[key] = value
             else:
-                extend_kwargs[key.strip(IN_SUFFIX)] = value
+                extend_kwargs[key[:-len(IN_SUFFIX)]] = value
         # Формирование итоговых словарей
         result_kwargs: list[dict] = []
         if extend_kwargs:
@@ -341,31 +1420,47 @@ class AIORedisItem(AIOStorageItem):
     @classmethod
     def _get_filters_by_kwargs(cls: Type[T], **kwargs: dict) -> list[str]:
         """ Подготовка списка паттернов поиска """
-        table: str = cls.Meta.table
-        # Шаблон для поиска аргументов, которе не были переданы
-        patterns: list[str] = re.findall(r'\{[^\}]*\}', table)
-        str_filters: list[str] = []
         # Получение сырого списка фильтров
         prepared_kwargs_list: list[dict] = cls._get_list_of_prepared_kwargs(**kwargs)
-        # Замена аргументов, которые не переданы, на звездочку
-        for prepared_kwargs in prepared_kwargs_list:
-            for pattern in patterns:
-                clean_key: str = pattern.strip("{").strip("}")
-                if clean_key not in prepared_kwargs:
-                    table = table.replace(pattern, "*")
-            # Заполнение паттерна поиска
-            str_filters.append(table.format(**prepared_kwargs))
-
-        return str_filters
+        # Заполнение паттерна поиска, аргументы, которые не переданы, заменяются на звездочку
+        return [cls._schema.format(params=prepared_kwargs) for prepared_kwargs in prepared_kwargs_list]
 
     @property
     def mapping(self) -> Mapping[_Key, _Value]:
-        """ Формирование ключей и значений для БД """
+        """
+            Формирование ключей и значений для БД
+                - "fields": {"<table>.<field>": value}
+                - "hash": {"<field>": value} (поля hash'а "<table>")
+                - "packed": {"<table>": {"<field>": value, ...}}
+        """
+        return self._get_mapping()
+
+    def _get_mapping(self, fields: Optional[AbstractSet[str]] = None) -> Mapping[_Key, _Value]:
+        """ Ключи и значения для БД (fields - только переданные поля, для "packed" - все поля) """
+        params: Mapping[_Key, _Value] = self._params
+        if self._storage == STORAGE_PACKED:
+            return {self._table: self._codec.encode_mapping(cast(Mapping[str, Any], params))}
+        if fields is not None:
+            params = {key: value for key, value in params.items() if key in fields}
+        if self._storage == STORAGE_HASH:
+            return {str(key): self._codec.encode(str(key), value) for key, value in params.items()}
         return {
-            KEYS_DELIMITER.join([self._table, str(key)]): pickle.dumps(value)
-            for key, value in self._params.items()
+            KEYS_DELIMITER.join([self._table, str(key)]): self._codec.encode(str(key), value)
+            for key, value in params.items()
         }
 
+    def _get_index_values(self, fields: Optional[AbstractSet[str]] = None) -> Mapping[_Key, _Value]:
+        """ Значения полей для обновления индексов по значениям (fields - только переданные поля) """
+        if fields is None:
+            return self._params
+        return {key: value for key, value in self._params.items() if key in fields}
+
+    def _get_refresh_keys(self, fields: Optional[AbstractSet[str]]) -> list[str]:
+        """ Ключи неизменённых полей ("fields"), время жизни которых продлевается при сохранении """
+        if fields is None or self._storage != STORAGE_FIELDS:
+            return []
+        return [KEYS_DELIMITER.join([self._table, field]) for field in self._schema.fields if field not in fields]
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}({self._table=}, "
@@ -378,7 +1473,14 @@ class AIORedisItem(AIOStorageItem):
 
         return False
 
-    def instance_using(self: T, db_instance: Union[redis.Redis, None] = None) -> T:
+    def _copy(self: T) -> T:
+        """ Копия объекта (значения полей не разделяются с исходным объектом) """
+        copied_instance: T = copy.copy(self)
+        if not self._compact:
+            copied_instance.__dict__["_params"] = dict(self._params)
+        return copied_instance
+
+    def _instance_using(self: T, db_instance: Union[redis.Redis, None] = None) -> T:
         """
             Выполнение операций с БД путём direct-указания используемого
             подключения, например:
@@ -390,10 +1492,11 @@ class AIORedisItem(AIOStorageItem):
         """
         copied_instance: T = copy.copy(self)
         copied_instance._db_instance = db_instance
-        return copied_instance
+        # Состояние полей относится к прежнему подключению
+        return copied_instance._mark_dirty()
 
     @classmethod
-    def using(cls: Type[T], db_instance: Union[redis.Redis, None] = None) -> T:
+    def _class_using(cls: Type[T], db_instance: Union[redis.Redis, None] = None) -> T:
         """
             Выполнение операций с БД путём direct-указания используемого
             подключения, например:
@@ -403,36 +1506,329 @@ class AIORedisItem(AIOStorageItem):
 
             Создаётся копия класса для работы через "неглобальное" подключение к Redis
         """
+        # Аннотации копируются до __init_subclass__, поэтому схема и проверки
+        #   настроек модели (например, Meta.range_indexes) используют поля модели
         class CopiedClass(cls):  # type: ignore
+            __annotations__ = dict(cls.__annotations__)
             _db_instance = db_instance
-        CopiedClass.__annotations__.update(cls.__annotations__)
         CopiedClass.__name__ = cls.__name__
+        # Кодек и схема модели используются копией класса без изменений
+        CopiedClass._codec = cls._codec
+        CopiedClass._schema = cls._schema
+        # Кэш и объединение запросов модели относятся к глобальному подключению
+        CopiedClass._cache = None
+        CopiedClass._loader = None
         return cast(T, CopiedClass)
 
+    # Вызов у класса - копия класса, у экземпляра - копия объекта
+    using = InstanceOrClassMethod(class_method=_class_using, instance_method=_instance_using)
+    instance_using = _instance_using
+
     async def save(self) -> OperationResult:
-        """ Одиночная вставка """
+        """
+            Одиночная вставка
+
+            Все команды сохранения объекта (и обновления индексов) выполняются
+                одной транзакцией (MULTI/EXEC) за один сетевой вызов, поэтому
+                объект не может быть прочитан частично записанным
+
+            Записываются только поля, изменённые после получения или предыдущего
+                сохранения объекта (для "packed" - запись целиком), время жизни
+                остальных ключей объекта продлевается (EXPIRE)
+
+            Объект, полученный с only, записывает только полученные и изменённые
+                поля; для "packed" такой объект не сохраняется
+
+            При включённой отложенной записи (orm.write_buffer) объект добавляется
+                в буфер и записывается в БД позже
+        """
+        try:
+            self._check_writable()
+        except ValueError as exception:
+            return OperationResult(status=OperationStatus.failed, message=str(exception))
+        if self._write_buffer is not None and self._db_instance is self._write_buffer.client:
+            self._write_buffer.add(item=self)
+            return OperationResult(status=OperationStatus.success)
         try:
-            if not self._db_instance or not await self._is_connected(db_instance=self._db_instance):
-                raise Exception("Redis database not connected...")
-            for key, value in self.mapping.items():
-                expiration: Union[int, None] = self._ttl if hasattr(self, "_ttl") else None
-                await self._db_instance.set(name=key, value=value, ex=expiration)
+            db_instance: redis.Redis = self._check_connection(db_instance=self._db_instance)
+            expiration: Union[int, None] = self._ttl if hasattr(self, "_ttl") else None
+            dirty: Optional[frozenset[str]] = self._get_write_fields()
+            # Объект не изменён и время жизни не задано - обращение к БД не требуется
+            if dirty is not None and not dirty and not expiration:
+                return OperationResult(status=OperationStatus.success)
+            pipe = db_instance.pipeline(transaction=True)
+            self._save_commands(client=pipe, expiration=expiration, fields=dirty)
+            await pipe.execute()
+            self._mark_clean()
             return OperationResult(status=OperationStatus.success)
         except Exception as exception:
+            self._on_connection_error(db_instance=self._db_instance, exception=exception)
             return OperationResult(
                 status=OperationStatus.failed,
                 message=str(exception),
             )
+        finally:
+            self._invalidate_cache()
+
+    def _save_commands(
+        self,
+        client: Any,
+        expiration: Union[int, None],
+        fields: Optional[AbstractSet[str]] = None,
+    ) -> None:
+        """
+            Добавление в client (pipeline) команд сохранения объекта
+                - "hash": HSET всех полей объекта одной командой и EXPIRE,
+                          если задано время жизни объекта
+                - "fields": MSET всех ключей объекта одной командой или SET ... EX
+                            каждого ключа, если задано время жизни объекта
+                - "packed": SET ключа объекта
+                - SADD/ZADD префикса объекта в индексы (Meta.indexes, Meta.range_indexes)
+
+            fields - записываемые поля (None - все поля), время жизни ключей
+                остальных полей продлевается
+        """
+        mapping: Mapping[_Key, _Value] = self._get_mapping(fields=fields)
+        if self._storage == STORAGE_HASH:
+            if mapping:
+                client.hset(name=self._table, mapping=mapping)
+            if expiration:
+                client.expire(name=self._table, time=expiration)
+        elif self._storage == STORAGE_PACKED and fields is not None and not fields:
+            if expiration:
+                client.expire(name=self._table, time=expiration)
+        elif self._storage == STORAGE_FIELDS and not expiration:
+            if mapping:
+                client.mset(mapping=mapping)
+        else:
+            for key, value in mapping.items():
+                client.set(name=key, value=value, ex=expiration)
+            for key in self._get_refresh_keys(fields=fields) if expiration else ():
+                client.expire(name=key, time=expiration)
+        self._index_commands(client=client, prefix=self._table, values=self._get_index_values(fields=fields))
 
     async def delete(self) -> OperationResult:
         """ Удаление одного элемента """
+        # Повторное сохранение удалённого объекта записывает все его поля
+        self._mark_dirty()
+        try:
+            db_instance: redis.Redis = self._check_connection(db_instance=self._db_instance)
+            if self._indexes or self._range_indexes:
+                pipe = db_instance.pipeline()
+                self._delete_commands(client=pipe)
+                await pipe.execute()
+                return OperationResult(status=OperationStatus.success)
+            await db_instance.delete(*self._get_object_keys(prefix=self._table))
+            return OperationResult(status=OperationStatus.success)
+        except Exception as exception:
+            self._on_connection_error(db_instance=self._db_instance, exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+        finally:
+            self._invalidate_cache()
+
+    async def touch(self, ttl: Optional[int] = None) -> OperationResult:
+        """
+            Продление времени жизни объекта без перезаписи значений (EXPIRE всех
+                ключей объекта одним сетевым вызовом), например:
+
+                await storage_item_instance.touch()  # Время жизни объекта (ttl, Meta.ttl)
+                await storage_item_instance.touch(ttl=60)
+        """
+        expiration: Optional[int] = ttl or self._ttl
+        if not expiration:
+            return OperationResult(status=OperationStatus.failed, message="ttl is not defined")
+        try:
+            db_instance: redis.Redis = self._check_connection(db_instance=self._db_instance)
+            if not await self._expire_prefixes(db_instance=db_instance, prefixes=[self._table], ttl=expiration):
+                return OperationResult(status=OperationStatus.failed, message="object not found")
+            return OperationResult(status=OperationStatus.success)
+        except Exception as exception:
+            self._on_connection_error(db_instance=self._db_instance, exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+
+    def _touch_commands(self, client: Any, ttl: int) -> None:
+        """ Добавление в client (pipeline) команд продления времени жизни ключей объекта """
+        for key in self._get_object_keys(prefix=self._table):
+            client.expire(key, ttl)
+
+    @classmethod
+    async def _expire_prefixes(cls: Type[T], db_instance: redis.Redis, prefixes: list[str], ttl: int) -> int:
+        """ Продление времени жизни объектов с переданными префиксами (pipeline), количество найденных """
+        if not prefixes:
+            return 0
+        keys_count: int = len(cls._get_object_keys(prefix=prefixes[0]))
+        pipe = db_instance.pipeline(transaction=False)
+        for prefix in prefixes:
+            for key in cls._get_object_keys(prefix=prefix):
+                pipe.expire(key, ttl)
+        results: list[Any] = await pipe.execute()
+        # Объект найден, если найден хотя бы один его ключ
+        return sum(
+            1
+            for start in range(0, len(results), keys_count)
+            if any(results[start:start + keys_count])
+        )
+
+    @classmethod
+    async def delete_where(cls: Type[T], **kwargs) -> OperationResult:
+        """
+            Удаление объектов по фильтру без получения и сериализации их значений, например:
+
+                await AIOStorageItem.delete_where(subsystem_id=10)
+                await AIOStorageItem.delete_where(subsystem_id=10, date_time__lt=100)
+
+            - ключи объектов формируются из схемы модели, ключи по маске
+              перебираются обходом SCAN (или через индексы)
+            - ключи удаляются порциями командой UNLINK (память освобождается
+              сервером в фоне), префиксы объектов удаляются из индексов
+            - в сообщении результата - количество удалённых объектов
+        """
+        ranges: dict[str, list[str]] = cls._pop_range_lookups(kwargs=kwargs)
+        if not len(kwargs) and not ranges:
+            raise Exception(f"{cls.__name__}.delete_where() has empty filter. It's not possible.")
         try:
-            if not self._db_instance or not await self._is_connected(db_instance=self._db_instance):
-                raise Exception("Redis database not connected...")
-            await self._db_instance.delete(*[key for key in self.mapping.keys()])
+            db_instance: redis.Redis = cls._check_connection(db_instance=cls._db_instance)
+            deleted_count: int = 0
+            async for prefixes, _ in cls._iter_prefix_pages(_ranges=ranges, **kwargs):
+                for start in range(0, len(prefixes), ITER_BATCH_SIZE):
+                    deleted_count += await cls._unlink_prefixes(
+                        db_instance=db_instance,
+                        prefixes=prefixes[start:start + ITER_BATCH_SIZE],
+                    )
+            return OperationResult(
+                status=OperationStatus.success,
+                message=f"deleted {deleted_count} objects",
+            )
+        except Exception as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+
+    @classmethod
+    async def _unlink_prefixes(cls: Type[T], db_instance: redis.Redis, prefixes: list[str]) -> int:
+        """ Удаление объектов с переданными префиксами одним сетевым вызовом (pipeline), количество удалённых """
+        if not prefixes:
+            return 0
+        pipe = db_instance.pipeline(transaction=False)
+        # Позиции результатов UNLINK среди результатов команд pipeline'а
+        positions: list[int] = []
+        for prefix in prefixes:
+            positions.append(len(pipe))
+            pipe.unlink(*cls._get_object_keys(prefix=prefix))
+            cls._index_commands(client=pipe, prefix=prefix, remove=True)
+        results: list[Any] = await pipe.execute()
+        if cls._cache is not None:
+            cls._cache.invalidate(prefixes=prefixes)
+        return sum(1 for position in positions if results[position])
+
+    def _delete_commands(self, client: Any) -> None:
+        """ Добавление в client (pipeline) команд удаления объекта и его префикса из индексов """
+        self._mark_dirty()
+        client.delete(*self._get_object_keys(prefix=self._table))
+        self._index_commands(client=client, prefix=self._table, remove=True)
+
+    @classmethod
+    async def update(cls: Type[T], **kwargs) -> OperationResult:
+        """
+            Изменение полей объекта на стороне сервера за один сетевой вызов
+                (без получения объекта), например:
+
+                await AIOStorageItem.update(subsystem_id=10, tag_id=55, counter__incr=1, date_time__max=ts)
+
+            - передаются значения всех параметров Meta.table и изменения полей:
+              <поле>=<значение> - запись значения, <поле>__incr - увеличение на
+              значение, <поле>__max/<поле>__min - запись значения, если оно
+              больше/меньше текущего (или поле не заполнено)
+            - изменения выполняются атомарно хранимым скриптом, одновременные
+              изменения не теряются
+            - операции __incr, __max, __min требуют числового представления
+              значений в БД (Meta.codec = "json") и способа хранения "fields"
+              или "hash"
+        """
+        return await cls.bulk_update(updates=[kwargs])
+
+    @classmethod
+    async def bulk_update(cls: Type[T], updates: list[dict[str, Any]]) -> OperationResult:
+        """
+            Изменение полей нескольких объектов на стороне сервера одним сетевым
+                вызовом (pipeline), каждый элемент updates - аргументы update, например:
+
+                await AIOStorageItem.bulk_update([
+                    {"subsystem_id": 10, "tag_id": 55, "counter__incr": 1},
+                    {"subsystem_id": 10, "tag_id": 56, "counter__incr": 2},
+                ])
+        """
+        arguments: list[tuple[str, list[str], list[Any]]] = [
+            cls._get_update_arguments(params=params) for params in updates
+        ]
+        try:
+            db_instance: redis.Redis = cls._check_connection(db_instance=cls._db_instance)
+            script = db_instance.register_script(UPDATE_SCRIPT)
+            if len(arguments) == 1:
+                _, keys, args = arguments[0]
+                await script(keys=keys, args=args)
+            else:
+                pipe = db_instance.pipeline(transaction=False)
+                for _, keys, args in arguments:
+                    await script(keys=keys, args=args, client=pipe)
+                await pipe.execute()
             return OperationResult(status=OperationStatus.success)
         except Exception as exception:
+            cls._on_connection_error(db_instance=cls._db_instance, exception=exception)
             return OperationResult(
                 status=OperationStatus.failed,
                 message=str(exception),
             )
+        finally:
+            if cls._cache is not None:
+                cls._cache.invalidate(prefixes=[prefix for prefix, _, _ in arguments])
+
+    @classmethod
+    def _get_update_arguments(cls: Type[T], params: Mapping[str, Any]) -> tuple[str, list[str], list[Any]]:
+        """ Префикс объекта, KEYS и ARGV хранимого скрипта изменения полей (UPDATE_SCRIPT) """
+        key_params: dict[str, Any] = {key: value for key, value in params.items() if key in cls._keys_positions}
+        prefix: str = cls._schema.format(params=key_params)
+        if len(key_params) < len(cls._keys_positions) or any(char in prefix for char in GLOB_CHARS):
+            raise NotEnoughParamsException(f"{cls.__name__} not enough params to update method...")
+        if cls._storage == STORAGE_PACKED:
+            raise ValueError(f"{cls.__name__}.update() is not supported for storage '{STORAGE_PACKED}'")
+        is_hash: bool = cls._storage == STORAGE_HASH
+        keys: list[str] = [
+            cls._get_index_key(param=param, value=key_params[param])
+            for param in cls._indexes
+        ]
+        args: list[Any] = [prefix, "1" if is_hash else "0", cls._ttl or 0, len(keys)]
+        for name, value in params.items():
+            if name in key_params:
+                continue
+            field, _, operation = name.partition("__")
+            operation = operation or UPDATE_SET
+            if field not in cls._schema.fields_set or operation not in UPDATE_OPERATIONS:
+                raise ValueError(f"{cls.__name__}.update() unknown field or operation: {name}")
+            score: str = ""
+            if operation != UPDATE_SET:
+                if not isinstance(cls._codec, JsonCodec):
+                    raise ValueError(f"{cls.__name__}.update() operation '{operation}' requires Meta.codec = 'json'")
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    raise TypeError(f"{cls.__name__}.update() operation '{operation}' requires a number: {name}")
+                encoded: Any = repr(value)
+            else:
+                encoded = cls._codec.encode(field, value)
+                if field in cls._range_indexes and value is not None:
+                    score = repr(float(value))
+            keys.append(prefix if is_hash else KEYS_DELIMITER.join([prefix, field]))
+            key_position: int = len(keys)
+            index_position: int = 0
+            if field in cls._range_indexes:
+                keys.append(cls._get_range_index_key(field=field))
+                index_position = len(keys)
+            args += [key_position, operation, field, encoded, index_position, score]
+        return prefix, keys, args
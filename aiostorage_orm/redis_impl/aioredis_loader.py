@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+# Ключ запроса: (запрашиваемые поля, префикс объекта)
+LoaderKey = tuple[Optional[tuple[str, ...]], str]
+
+
+class LoaderConfig:
+    """
+    Настройки объединения одновременных запросов get (Meta.loader), например:
+
+        class Meta:
+            table = "subsystem.{subsystem_id}.tag.{tag_id}"
+            loader = LoaderConfig(max_delay_ms=1, max_batch_size=1000)
+
+    max_delay_ms - время накопления запросов перед отправкой (0 - запросы,
+        выполненные в одной итерации цикла событий)
+    max_batch_size - количество объектов, при накоплении которого запросы
+        отправляются сразу
+
+    """
+    max_delay_ms: float
+    max_batch_size: int
+
+    def __init__(self, max_delay_ms: float = 0, max_batch_size: int = 1000) -> None:
+        if max_batch_size < 1:
+            raise ValueError("LoaderConfig.max_batch_size must be positive")
+        self.max_delay_ms = max_delay_ms
+        self.max_batch_size = max_batch_size
+
+
+class AIORedisLoader:
+    """
+    Объединение одновременных запросов объектов в одно чтение (DataLoader)
+
+    - запросы, выполненные в течение max_delay_ms, накапливаются и отправляются
+      одним чтением (MGET или pipeline) через read
+    - одинаковые одновременные запросы выполняются один раз (single-flight),
+      все ожидающие получают результат одного чтения (get копирует объект для каждого вызова)
+    - ошибка чтения передаётся всем запросам порции; отмена одного из
+      ожидающих не отменяет чтение для остальных
+
+    read - получение объектов по списку префиксов и запрашиваемым полям,
+        возвращает словарь {префикс: объект} (только найденные объекты)
+
+    """
+    _config: LoaderConfig
+    _read: Callable[[list[str], Optional[tuple[str, ...]]], Awaitable[dict[str, Any]]]
+    _pending: dict[LoaderKey, asyncio.Future]
+    _handle: Optional[asyncio.Handle]
+    _tasks: set[asyncio.Task]
+
+    def __init__(
+        self,
+        config: LoaderConfig,
+        read: Callable[[list[str], Optional[tuple[str, ...]]], Awaitable[dict[str, Any]]],
+    ) -> None:
+        self._config = config
+        self._read = read
+        self._pending = {}
+        self._handle = None
+        self._tasks = set()
+
+    async def load(self, prefix: str, fields: Optional[tuple[str, ...]] = None) -> Any:
+        """ Получение объекта (None - объект не найден) в составе общей порции запросов """
+        key: LoaderKey = (fields, prefix)
+        future: Optional[asyncio.Future] = self._pending.get(key)
+        if future is None:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._config.max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self._config.max_delay_ms > 0:
+                    self._handle = loop.call_later(self._config.max_delay_ms / 1000, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """ Отправка накопленных запросов отдельной задачей """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch: dict[LoaderKey, asyncio.Future] = self._pending
+        self._pending = {}
+        if not batch:
+            return
+        task: asyncio.Task = asyncio.ensure_future(self._run(batch=batch))
+        # Ссылка на задачу хранится до её завершения
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[LoaderKey, asyncio.Future]) -> None:
+        """ Чтение порции запросов (по одному чтению на набор запрашиваемых полей) """
+        prefixes_by_fields: dict[Optional[tuple[str, ...]], list[str]] = {}
+        for fields, prefix in batch:
+            prefixes_by_fields.setdefault(fields, []).append(prefix)
+        for fields, prefixes in prefixes_by_fields.items():
+            futures: list[asyncio.Future] = [batch[(fields, prefix)] for prefix in prefixes]
+            try:
+                found: dict[str, Any] = await self._read(prefixes, fields)
+            except asyncio.CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            except Exception as exception:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exception)
+                continue
+            for prefix, future in zip(prefixes, futures):
+                if not future.done():
+                    future.set_result(found.get(prefix))
@@ -1,27 +1,53 @@
+import asyncio
 import logging
-import time
+import functools
+from typing import cast
+from typing import Any
 from typing import Union
+from typing import Callable
+from typing import Awaitable
+from typing import Optional
 from typing import TypeVar
 
 import redis.asyncio as redis
 from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from .aioredis_frame import AIORedisFrame
+from .aioredis_health import AIORedisHealth
 from .aioredis_item import AIORedisItem
 from .aioredis_item import T as SubclassItemType
+from .aioredis_item import STORAGE_HASH
+from .aioredis_item import STORAGE_FIELDS
+from .aioredis_item import STORAGE_PACKED
+from .aioredis_item import STORAGES
+from .aioredis_item import ITER_BATCH_SIZE
+from .aioredis_write_buffer import AIORedisWriteBuffer
 from ..operation_result import OperationResult
 from ..operation_result import OperationStatus
+from ..operation_result import BulkOperationResult
+from ..operation_result import FailedChunk
 
 from ..aiostorage_orm import AIOStorageORM
 
 ChildItem = TypeVar('ChildItem', bound=AIORedisItem)
+# Количество команд, после накопления которого порция групповой операции отправляется серверу
+WRITE_BATCH_SIZE = 10_000
+# Максимальное количество одновременно выполняемых порций одной групповой операции
+WRITE_MAX_IN_FLIGHT = 4
 
 
 class AIORedisORM(AIOStorageORM):
     """ Работа с БД Redis через объектное представление """
-    _pipe: Pipeline
     _client: redis.Redis
     _frame: AIORedisFrame
+    _health: AIORedisHealth
+    _write_batch_size: int
+    _write_max_in_flight: int
+    _set_with_expire: AsyncScript  # Хранимый скрипт Redis
+    _write_buffer: Optional[AIORedisWriteBuffer] = None
 
     def __init__(
         self,
@@ -29,7 +55,22 @@ class AIORedisORM(AIOStorageORM):
         host: Union[str, None] = None,
         port: int = 6379,
         db: int = 0,
+        health_check_interval: float = AIORedisHealth.DEFAULT_INTERVAL,
+        read_batch_size: Optional[int] = None,
+        read_max_in_flight: Optional[int] = None,
+        write_batch_size: int = WRITE_BATCH_SIZE,
+        write_max_in_flight: int = WRITE_MAX_IN_FLIGHT,
     ) -> None:
+        """
+            read_batch_size - количество ключей в одной команде чтения по умолчанию
+                (для моделей без Meta.read_batch_size)
+            read_max_in_flight - количество одновременно выполняемых команд чтения
+                одной операции
+            write_batch_size - количество команд в одной порции (pipeline)
+                групповых операций
+            write_max_in_flight - количество одновременно выполняемых порций
+                одной групповой операции
+        """
         if client:
             self._client = client
         elif host:
@@ -37,17 +78,75 @@ class AIORedisORM(AIOStorageORM):
         else:
             raise Exception("AIOStorageORM-init must contains redis_client or host values...")
 
-        self._pipe = self._client.pipeline()
+        self._write_batch_size = max(write_batch_size, 1)
+        self._write_max_in_flight = max(write_max_in_flight, 1)
+        # Состояние подключения отслеживается в фоне, вместо PING перед каждой операцией
+        self._health = AIORedisHealth(client=self._client, interval=health_check_interval)
         if not AIORedisItem._db_instance:
-            AIORedisItem._set_global_instance(db_instance=self._client)
+            AIORedisItem._set_global_instance(db_instance=self._client, health=self._health)
+
+        if read_batch_size:
+            AIORedisItem._default_read_batch_size = read_batch_size
+        if read_max_in_flight:
+            AIORedisItem._read_max_in_flight = read_max_in_flight
 
         self._frame = AIORedisFrame(client=self._client)
+        # Хранимый скрипт сохранения ключей со временем жизни одним вызовом
+        #   KEYS - ключи, ARGV[1] - время жизни, ARGV[2:] - значения ключей
+        self._set_with_expire = self._client.register_script("""
+            local expiration = ARGV[1]
+            for index, key in ipairs(KEYS) do
+                redis.call('set', key, ARGV[index + 1], 'EX', expiration)
+            end
+        """)
 
     async def init(self) -> None:
         """
-        Проверка подключения к redis
+        Проверка подключения к redis и запуск фоновой проверки подключения
         """
         await self._raise_for_connection()
+        self._health.start()
+
+    async def close(self) -> None:
+        """
+        Запись буфера отложенной записи и остановка фоновых задач ORM
+        """
+        if self._write_buffer is not None:
+            await self._write_buffer.close()
+            if AIORedisItem._write_buffer is self._write_buffer:
+                AIORedisItem._write_buffer = None
+            self._write_buffer = None
+        await self._health.stop()
+
+    def write_buffer(self, max_delay_ms: float = 10, max_items: int = 1000) -> AIORedisWriteBuffer:
+        """
+            Включение отложенной записи (write-behind), например:
+
+                orm.write_buffer(max_delay_ms=10, max_items=1000)
+                await item.save()  # Объект добавлен в буфер
+                await orm.flush()  # Запись буфера (также выполняется в close)
+
+            save() объектов, использующих подключение ORM, добавляет их в буфер,
+                повторные сохранения объекта до записи буфера объединяются
+                (записывается последнее значение), буфер записывается одной
+                групповой операцией через max_delay_ms или после накопления
+                max_items объектов (см. AIORedisWriteBuffer)
+        """
+        if self._write_buffer is None:
+            self._write_buffer = AIORedisWriteBuffer(
+                client=self._client,
+                write=self.bulk_create,
+                max_delay_ms=max_delay_ms,
+                max_items=max_items,
+            )
+            AIORedisItem._write_buffer = self._write_buffer
+        return self._write_buffer
+
+    async def flush(self) -> BulkOperationResult:
+        """ Запись буфера отложенной записи """
+        if self._write_buffer is None:
+            return BulkOperationResult(status=OperationStatus.success)
+        return await self._write_buffer.flush()
 
     async def _raise_for_connection(self):
         """
@@ -58,9 +157,9 @@ class AIORedisORM(AIOStorageORM):
         """
         time_for_retry = [5, 2, 1, 0.5, 0.1]
         while time_for_retry:
-            if await AIORedisItem._is_connected(AIORedisItem._db_instance):  # type: ignore
+            if await self._health.check():
                 return
-            time.sleep(time_for_retry.pop())
+            await asyncio.sleep(time_for_retry.pop())
         raise ConnectionError("Redis connection error...")
 
     @property
@@ -72,50 +171,310 @@ class AIORedisORM(AIOStorageORM):
         """ Одиночная вставка """
         return await item.save()
 
-    async def bulk_create(self, items: list[SubclassItemType]) -> OperationResult:
-        """ Групповая вставка """
+    async def bulk_create(self, items: list[SubclassItemType], only_dirty: bool = False) -> BulkOperationResult:
+        """
+            Групповая вставка (порциями, см. _execute_chunked)
+
+            Объекты порции группируются по модели и времени жизни (у каждого
+                объекта - своё, ttl объекта или Meta.ttl модели), для каждой
+                группы используется минимальное количество команд:
+                - "fields", "packed" без времени жизни: один MSET всех ключей группы
+                - "fields", "packed" со временем жизни: один вызов хранимого
+                  скрипта (SET ... EX всех ключей группы на стороне сервера)
+                - "hash": HSET (и EXPIRE) каждого объекта
+
+            only_dirty - записывать только поля, изменённые после получения или
+                предыдущего сохранения объектов (время жизни остальных ключей
+                продлевается), как в save()
+
+            Объекты, полученные с only, записывают только полученные и изменённые
+                поля; для "packed" такие объекты не сохраняются (операция
+                завершается без записи)
+        """
         try:
-            if hasattr(items[0], "_ttl") and items[0]._ttl:
-                for redis_item in items:
-                    for key, value in redis_item.mapping.items():
-                        self._pipe.set(name=key, value=value, ex=redis_item._ttl)
-            else:
-                for redis_item in items:
-                    self._pipe.mset(mapping=redis_item.mapping)
-            await self._pipe.execute()
-            return OperationResult(status=OperationStatus.success)
-        except Exception as exception:
-            self._on_error_actions(exception=exception)
-            return OperationResult(
-                status=OperationStatus.failed,
-                message=str(exception),
+            for redis_item in items:
+                redis_item._check_writable()
+        except ValueError as exception:
+            return BulkOperationResult(status=OperationStatus.failed, message=str(exception))
+        try:
+            result: BulkOperationResult = await self._execute_chunked(
+                items=items,
+                add_commands=functools.partial(self._add_create_commands, only_dirty=only_dirty),
             )
+            failed_indexes: set[int] = {
+                index
+                for chunk in result.failed_chunks
+                for index in range(chunk.start, chunk.end)
+            }
+            for index, redis_item in enumerate(items):
+                # Объект совпадает с БД, только если записан через его подключение
+                if index not in failed_indexes and redis_item._db_instance is self._client:
+                    redis_item._mark_clean()
+            return result
+        finally:
+            for redis_item in items:
+                redis_item._invalidate_cache()
 
-    async def bulk_delete(self, items: list[ChildItem]) -> OperationResult:
+    async def bulk_delete(self, items: list[ChildItem]) -> BulkOperationResult:
         """
-            Удаление списка элементов
+            Удаление списка элементов (порциями, см. _execute_chunked)
         """
         try:
+            return await self._execute_chunked(items=items, add_commands=self._add_delete_commands)
+        finally:
             for redis_item in items:
-                self._pipe.delete(*[key for key in redis_item.mapping.keys()])
-            await self._pipe.execute()
-            return OperationResult(status=OperationStatus.success)
+                redis_item._invalidate_cache()
+
+    async def _add_create_commands(self, pipe: Pipeline, items: list[AIORedisItem], only_dirty: bool = False) -> None:
+        """ Добавление в pipe команд сохранения объектов, сгруппированных по модели и времени жизни """
+        groups: dict[tuple[type[AIORedisItem], Optional[int]], list[AIORedisItem]] = {}
+        for redis_item in items:
+            groups.setdefault((redis_item.__class__, redis_item._ttl or None), []).append(redis_item)
+        for (item_class, expiration), group in groups.items():
+            if item_class._storage == STORAGE_HASH:
+                for redis_item in group:
+                    fields: Optional[frozenset[str]] = redis_item._get_write_fields(only_dirty=only_dirty)
+                    redis_item._save_commands(client=pipe, expiration=expiration, fields=fields)
+                continue
+            mapping: dict = {}
+            # Ключи неизменённых объектов и полей, время жизни которых продлевается
+            refresh_keys: list[str] = []
+            for redis_item in group:
+                dirty: Optional[frozenset[str]] = redis_item._get_write_fields(only_dirty=only_dirty)
+                if dirty is not None and not dirty and item_class._storage == STORAGE_PACKED:
+                    refresh_keys.append(redis_item._table)
+                else:
+                    mapping.update(redis_item._get_mapping(fields=dirty))
+                    refresh_keys += redis_item._get_refresh_keys(fields=dirty)
+                redis_item._index_commands(
+                    client=pipe,
+                    prefix=redis_item._table,
+                    values=redis_item._get_index_values(fields=dirty),
+                )
+            if not expiration:
+                if mapping:
+                    pipe.mset(mapping=mapping)
+                continue
+            if mapping:
+                await self._set_with_expire(keys=list(mapping), args=[expiration, *mapping.values()], client=pipe)
+            for key in refresh_keys:
+                pipe.expire(key, expiration)
+
+    async def bulk_touch(
+        self,
+        items_or_class: Union[list[ChildItem], type[ChildItem]],
+        ttl: Optional[int] = None,
+        **filters,
+    ) -> BulkOperationResult:
+        """
+            Продление времени жизни объектов без перезаписи значений (EXPIRE всех
+                ключей объектов, pipeline), например:
+
+                await orm.bulk_touch(example_items, ttl=60)
+                await orm.bulk_touch(ExampleItem, subsystem_id=3)
+
+            - список объектов: время жизни каждого объекта - ttl или время жизни
+              объекта (ttl объекта, Meta.ttl), объекты без времени жизни пропускаются;
+              выполняется порциями (см. _execute_chunked)
+            - модель и фильтр: объекты выбираются как в filter (в т.ч. по маске)
+              без получения значений, время жизни - ttl или Meta.ttl модели,
+              в сообщении результата - количество найденных объектов
+        """
+        if isinstance(items_or_class, type):
+            return await self._touch_where(item_class=items_or_class, ttl=ttl, **filters)
+        return await self._execute_chunked(
+            items=items_or_class,
+            add_commands=functools.partial(self._add_touch_commands, ttl=ttl),
+        )
+
+    async def _touch_where(
+        self,
+        item_class: type[ChildItem],
+        ttl: Optional[int] = None,
+        **filters,
+    ) -> BulkOperationResult:
+        """ Продление времени жизни объектов модели, выбранных по фильтру """
+        expiration: Optional[int] = ttl or item_class._ttl
+        if not expiration:
+            return BulkOperationResult(status=OperationStatus.failed, message="ttl is not defined")
+        try:
+            source_class: type[ChildItem] = cast(type[ChildItem], item_class.using(db_instance=self._client))
+            ranges: dict[str, list[str]] = source_class._pop_range_lookups(kwargs=filters)
+            touched_count: int = 0
+            async for prefixes, _ in source_class._iter_prefix_pages(_ranges=ranges, **filters):
+                for start in range(0, len(prefixes), ITER_BATCH_SIZE):
+                    touched_count += await source_class._expire_prefixes(
+                        db_instance=self._client,
+                        prefixes=prefixes[start:start + ITER_BATCH_SIZE],
+                        ttl=expiration,
+                    )
+            return BulkOperationResult(
+                status=OperationStatus.success,
+                message=f"touched {touched_count} objects",
+            )
         except Exception as exception:
             self._on_error_actions(exception=exception)
-            return OperationResult(
+            return BulkOperationResult(
                 status=OperationStatus.failed,
                 message=str(exception),
             )
 
+    async def _add_touch_commands(self, pipe: Pipeline, items: list[AIORedisItem], ttl: Optional[int] = None) -> None:
+        """ Добавление в pipe команд продления времени жизни объектов """
+        for redis_item in items:
+            expiration: Optional[int] = ttl or redis_item._ttl
+            if expiration:
+                redis_item._touch_commands(client=pipe, ttl=expiration)
+
+    async def _add_delete_commands(self, pipe: Pipeline, items: list[AIORedisItem]) -> None:
+        """ Добавление в pipe команд удаления объектов """
+        for redis_item in items:
+            redis_item._delete_commands(client=pipe)
+
+    @staticmethod
+    def _get_keys_count(redis_item: AIORedisItem) -> int:
+        """ Количество ключей, которые занимает объект (размер объекта в порции) """
+        return len(redis_item._schema.fields) if redis_item._storage == STORAGE_FIELDS else 1
+
+    async def _execute_chunked(
+        self,
+        items: list[Any],
+        add_commands: Callable[[Pipeline, list[Any]], Awaitable[None]],
+    ) -> BulkOperationResult:
+        """
+            Выполнение групповой операции порциями
+
+            - каждый вызов использует собственные pipeline'ы (одновременные
+              групповые операции одного ORM не смешивают команды)
+            - порция - объекты, занимающие не менее write_batch_size ключей
+              (объект не разделяется между порциями), команды порции
+              формирует add_commands, порция выполняется транзакцией (MULTI/EXEC)
+            - одновременно формируется и выполняется не более write_max_in_flight
+              порций, поэтому расход памяти не зависит от количества объектов
+            - невыполненные порции не прерывают операцию и возвращаются
+              в failed_chunks результата
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self._write_max_in_flight)
+        failed_chunks: list[FailedChunk] = []
+        tasks: list[asyncio.Task] = []
+
+        def on_chunk_error(start: int, end: int, exception: Exception) -> None:
+            self._on_error_actions(exception=exception)
+            failed_chunks.append(FailedChunk(start=start, end=end, message=str(exception)))
+
+        async def execute_chunk(pipe: Pipeline, start: int, end: int) -> None:
+            try:
+                await pipe.execute()
+            except Exception as exception:
+                on_chunk_error(start=start, end=end, exception=exception)
+            finally:
+                semaphore.release()
+
+        async def start_chunk(start: int, end: int) -> None:
+            await semaphore.acquire()
+            pipe: Pipeline = self._client.pipeline(transaction=True)
+            try:
+                await add_commands(pipe, items[start:end])
+            except Exception as exception:
+                # Ошибка подготовки команд (например, сериализации) - порция не выполняется
+                on_chunk_error(start=start, end=end, exception=exception)
+                await pipe.reset()
+                semaphore.release()
+                return
+            tasks.append(asyncio.create_task(execute_chunk(pipe=pipe, start=start, end=end)))
+
+        start: int = 0
+        keys_count: int = 0
+        for index, redis_item in enumerate(items):
+            keys_count += self._get_keys_count(redis_item=redis_item)
+            if keys_count >= self._write_batch_size:
+                await start_chunk(start=start, end=index + 1)
+                start = index + 1
+                keys_count = 0
+        if start < len(items):
+            await start_chunk(start=start, end=len(items))
+        await asyncio.gather(*tasks)
+        if not failed_chunks:
+            return BulkOperationResult(status=OperationStatus.success)
+        failed_chunks.sort(key=lambda chunk: chunk.start)
+        return BulkOperationResult(
+            status=OperationStatus.failed,
+            message=f"{len(failed_chunks)} chunk(s) failed: {failed_chunks[0].message}",
+            failed_chunks=failed_chunks,
+        )
+
     async def delete(self, item: AIORedisItem) -> OperationResult:
         """
             Удаление одного элемента
         """
         return await item.delete()
 
+    async def migrate_storage(
+        self,
+        item_class: type[ChildItem],
+        source_storage: str = STORAGE_FIELDS,
+        batch_size: int = ITER_BATCH_SIZE,
+        **kwargs,
+    ) -> OperationResult:
+        """
+            Одноразовый перенос объектов модели, сохранённых другим способом хранения,
+                в способ, указанный в item_class.Meta.storage, например:
+
+                await orm.migrate_storage(ExampleItem, source_storage="fields", subsystem_id=3)
+
+            - объекты выбираются потоково (iter_filter) по переданному фильтру
+            - для каждой порции из batch_size объектов в одной транзакции
+              удаляются старые ключи и записываются новые (время жизни
+              устанавливается по настройкам item_class)
+        """
+        if source_storage not in STORAGES:
+            raise ValueError(f"{self.__class__.__name__}.migrate_storage() source_storage must be one of {STORAGES}")
+        try:
+            source_class: type[ChildItem] = cast(type[ChildItem], item_class.using(db_instance=self._client))
+            setattr(source_class, "_storage", source_storage)
+            attr_names: set[str] = set(item_class.__annotations__) | set(item_class._keys_positions)
+            batch: list[ChildItem] = []
+            migrated_count: int = 0
+            async for source_item in source_class.iter_filter(_batch_size=batch_size, **kwargs):
+                batch.append(item_class(**{
+                    key: getattr(source_item, key)
+                    for key in attr_names
+                    if hasattr(source_item, key)
+                }))
+                if len(batch) >= batch_size:
+                    await self._migrate_batch(source_class=source_class, items=batch)
+                    migrated_count += len(batch)
+                    batch = []
+            if batch:
+                await self._migrate_batch(source_class=source_class, items=batch)
+                migrated_count += len(batch)
+            return OperationResult(
+                status=OperationStatus.success,
+                message=f"migrated {migrated_count} objects",
+            )
+        except Exception as exception:
+            self._on_error_actions(exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+
+    async def _migrate_batch(self, source_class: type[ChildItem], items: list[ChildItem]) -> None:
+        """ Перезапись порции объектов в одной транзакции (MULTI/EXEC) """
+        pipe: Pipeline = self._client.pipeline(transaction=True)
+        for redis_item in items:
+            # Старые ключи удаляются первыми: для "hash" и "packed" имя ключа совпадает
+            pipe.delete(*source_class._get_object_keys(prefix=redis_item._table))
+            redis_item._save_commands(client=pipe, expiration=redis_item._ttl)
+        await pipe.execute()
+        for redis_item in items:
+            redis_item._invalidate_cache()
+
     def _on_error_actions(self, exception: Exception) -> None:
         """
             Действия, выполняющиеся в случае возникновения исключения
                 во время вставки, сохранения, получения данных из БД
         """
         logging.exception(exception)
+        if isinstance(exception, (RedisConnectionError, RedisTimeoutError)):
+            self._health.mark_unavailable()
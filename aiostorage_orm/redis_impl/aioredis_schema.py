@@ -0,0 +1,185 @@
+import itertools
+from string import Formatter
+from typing import Any, Iterable, Mapping, Optional
+
+KEYS_DELIMITER = "."
+WILDCARD = "*"
+# Символы, которые нельзя использовать в классе символов маски без экранирования
+GLOB_CLASS_SPECIAL_CHARS = frozenset("\\[]^-")
+
+
+class AIORedisQueryPlan:
+    """
+    План поиска объектов по фильтру
+
+    - prefixes - ключи объектов, которые формируются без обращения к серверу
+      (переданы значения всех параметров Meta.table)
+    - matches - маски обхода ключей (SCAN MATCH), если значения части
+      параметров не переданы (как правило, одна маска)
+    - constraints - допустимые значения параметров (__in), которые не удалось
+      точно выразить маской и которые проверяются на стороне клиента
+
+    """
+    prefixes: list[str]
+    matches: list[str]
+    constraints: dict[str, frozenset[str]]
+
+    def __init__(
+        self,
+        prefixes: Optional[list[str]] = None,
+        matches: Optional[list[str]] = None,
+        constraints: Optional[dict[str, frozenset[str]]] = None,
+    ) -> None:
+        self.prefixes = prefixes or []
+        self.matches = matches or []
+        self.constraints = constraints or {}
+
+
+class AIORedisSchema:
+    """
+    Схема модели, подготавливаемая один раз при объявлении класса (__init_subclass__)
+
+    Содержит всё, что не зависит от значений конкретного объекта и раньше
+        вычислялось при каждом вызове:
+        - шаблон ключа (Meta.table), разобранный на статические и динамические
+          (параметры) сегменты
+        - позиции параметров в ключе и их разбор из ключа БД
+        - имена полей (в т.ч. отсортированные для frame'ов) и суффиксы ключей
+          полей в байтовом виде
+
+    """
+    table: str
+    segments_count: int
+    keys_positions: dict[str, int]
+    fields: tuple[str, ...]
+    fields_set: frozenset[str]
+    row_fields: tuple[str, ...]
+    field_suffixes: tuple[bytes, ...]
+    fields_by_bytes: dict[bytes, str]
+
+    _template: tuple[tuple[str, Optional[str]], ...]
+    _key_params: tuple[tuple[str, int], ...]
+
+    def __init__(self, table: str, fields: Iterable[str]) -> None:
+        self.table = table
+        segments: list[str] = table.split(KEYS_DELIMITER)
+        self.segments_count = len(segments)
+        self.keys_positions = {
+            segment[1:-1]: position
+            for position, segment in enumerate(segments)
+            if segment.startswith("{") and segment.endswith("}")
+        }
+        self._key_params = tuple(self.keys_positions.items())
+        # Шаблон ключа: (статический текст, имя параметра или None)
+        self._template = tuple(
+            (literal, field_name)
+            for literal, field_name, _, _ in Formatter().parse(table)
+        )
+        self.fields = tuple(fields)
+        self.fields_set = frozenset(self.fields)
+        # Порядок значений записи frame'а
+        self.row_fields = tuple(sorted(field for field in self.fields if not field.startswith("_")))
+        delimiter: bytes = KEYS_DELIMITER.encode()
+        self.field_suffixes = tuple(delimiter + field.encode() for field in self.fields)
+        self.fields_by_bytes = {field.encode(): field for field in self.fields}
+
+    @property
+    def placeholders(self) -> tuple[str, ...]:
+        """ Имена параметров шаблона ключа в порядке их следования """
+        return tuple(field_name for _, field_name in self._template if field_name is not None)
+
+    def format(self, params: Mapping[str, Any]) -> str:
+        """
+            Подстановка параметров в шаблон ключа
+
+            Непереданные параметры заменяются на "*" (маска для SCAN MATCH)
+        """
+        parts: list[str] = []
+        for literal, field_name in self._template:
+            parts.append(literal)
+            if field_name is None:
+                continue
+            if field_name in params:
+                parts.append(format(params[field_name]))
+            else:
+                parts.append(WILDCARD)
+        return "".join(parts)
+
+    def plan(self, params: Mapping[str, Any], in_params: Mapping[str, Iterable[Any]]) -> AIORedisQueryPlan:
+        """
+            Формирование плана поиска по значениям параметров (params) и спискам
+                допустимых значений параметров (in_params, суффикс __in)
+
+            - все параметры шаблона переданы: ключи объектов формируются
+              перебором комбинаций списков значений, без обращения к серверу
+            - часть параметров не передана: комбинации не перебираются,
+              выполняется один обход ключей по маске, в которой список значений
+              параметра заменяется классом символов (если все значения состоят
+              из одного символа) или "*" с проверкой значения на стороне клиента
+              (параметры, не занимающие сегмент ключа целиком, перебираются
+              отдельными масками)
+        """
+        values: dict[str, list[str]] = {
+            name: list(dict.fromkeys(format(value) for value in param_values))
+            for name, param_values in in_params.items()
+        }
+        # Пустой список допустимых значений не соответствует ни одному объекту
+        if any(not param_values for param_values in values.values()):
+            return AIORedisQueryPlan()
+        placeholders: tuple[str, ...] = self.placeholders
+        # Значения, переданные без суффикса __in, имеют приоритет
+        values = {name: param_values for name, param_values in values.items() if name not in params}
+        if all(name in params or name in values for name in placeholders):
+            keys: list[str] = self._expand(params=params, values=values)
+            # Маска может быть передана и в значении параметра
+            return AIORedisQueryPlan(
+                prefixes=[key for key in keys if WILDCARD not in key],
+                matches=[key for key in keys if WILDCARD in key],
+            )
+        match_params: dict[str, Any] = dict(params)
+        expanded_values: dict[str, list[str]] = {}
+        constraints: dict[str, frozenset[str]] = {}
+        for name, param_values in values.items():
+            if len(param_values) == 1:
+                match_params[name] = param_values[0]
+            elif all(len(value) == 1 and value not in GLOB_CLASS_SPECIAL_CHARS for value in param_values):
+                match_params[name] = "[" + "".join(param_values) + "]"
+            elif name in self.keys_positions:
+                constraints[name] = frozenset(param_values)
+            else:
+                expanded_values[name] = param_values
+        return AIORedisQueryPlan(
+            matches=self._expand(params=match_params, values=expanded_values),
+            constraints=constraints,
+        )
+
+    def _expand(self, params: Mapping[str, Any], values: Mapping[str, list[str]]) -> list[str]:
+        """ Подстановка в шаблон ключа всех комбинаций значений параметров """
+        names: list[str] = list(values)
+        keys: list[str] = [
+            self.format(params={**params, **dict(zip(names, combination))})
+            for combination in itertools.product(*values.values())
+        ]
+        return list(dict.fromkeys(keys))
+
+    def check_constraints(self, prefix: str, constraints: Mapping[str, frozenset[str]]) -> bool:
+        """ Проверка значений параметров ключа объекта на стороне клиента """
+        if not constraints:
+            return True
+        segments: list[str] = prefix.split(KEYS_DELIMITER)
+        return all(segments[self.keys_positions[name]] in allowed for name, allowed in constraints.items())
+
+    def keys_of(self, prefix: str) -> list[bytes]:
+        """ Ключи полей объекта с переданным префиксом """
+        prefix_bytes: bytes = prefix.encode()
+        return [prefix_bytes + suffix for suffix in self.field_suffixes]
+
+    def parse_key(self, prefix: str) -> dict[str, str]:
+        """ Значения параметров, извлечённые из ключа объекта """
+        segments: list[str] = prefix.split(KEYS_DELIMITER)
+        return {name: segments[position] for name, position in self._key_params}
+
+    def parse_key_bytes(self, prefix: bytes) -> dict[str, str]:
+        """ Значения параметров, извлечённые из ключа объекта в байтовом виде """
+        segments: list[bytes] = prefix.split(KEYS_DELIMITER.encode())
+        return {name: segments[position].decode() for name, position in self._key_params}
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+from ..operation_result import BulkOperationResult
+from ..operation_result import OperationStatus
+
+
+class AIORedisWriteBuffer:
+    """
+    Отложенная запись объектов (write-behind)
+
+    - save() объектов, использующих подключение буфера, добавляет объект
+      в буфер вместо записи в БД
+    - повторное сохранение объекта с тем же ключом (модель и _table) до записи
+      буфера заменяет ранее добавленный объект (записывается последнее значение)
+    - буфер записывается одной групповой операцией (bulk_create) через
+      max_delay_ms после добавления первого объекта или сразу после
+      накопления max_items объектов
+    - записи буфера выполняются последовательно, поэтому более позднее
+      значение объекта не может быть перезаписано более ранним
+    - до записи буфера объект в БД не изменён (чтение возвращает прежнее значение)
+
+    """
+    _client: redis.Redis
+    _write: Callable[[list[Any]], Awaitable[BulkOperationResult]]
+    _max_delay_ms: float
+    _max_items: int
+    _items: dict[tuple[type, str], Any]
+    _handle: Optional[asyncio.TimerHandle]
+    _lock: asyncio.Lock
+    _tasks: set[asyncio.Task]
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        write: Callable[[list[Any]], Awaitable[BulkOperationResult]],
+        max_delay_ms: float = 10,
+        max_items: int = 1000,
+    ) -> None:
+        self._client = client
+        self._write = write
+        self._max_delay_ms = max_delay_ms
+        self._max_items = max(max_items, 1)
+        self._items = {}
+        self._handle = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    @property
+    def client(self) -> redis.Redis:
+        """ Подключение, запись через которое выполняется буфером """
+        return self._client
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: Any) -> None:
+        """ Добавление объекта в буфер (с заменой ранее добавленного объекта с тем же ключом) """
+        self._items[(item.__class__, item._table)] = item
+        if len(self._items) >= self._max_items:
+            self._start_flush()
+        elif self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(self._max_delay_ms / 1000, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """ Запись буфера в фоне """
+        task: asyncio.Task = asyncio.ensure_future(self.flush())
+        # Ссылка на задачу хранится до её завершения
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> BulkOperationResult:
+        """ Запись накопленных объектов """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        items: list[Any] = list(self._items.values())
+        self._items = {}
+        async with self._lock:
+            if not items:
+                return BulkOperationResult(status=OperationStatus.success)
+            return await self._write(items)
+
+    async def close(self) -> BulkOperationResult:
+        """ Запись накопленных объектов и ожидание фоновых записей """
+        result: BulkOperationResult = await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        return result
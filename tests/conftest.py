@@ -33,6 +33,60 @@ def test_item(test_input_dict: dict) -> AIORedisItem:
     return TestItem(**test_input_dict)
 
 
+@pytest.fixture
+def test_hash_item(test_input_dict: dict) -> AIORedisItem:
+    """ Тестовый экземплар класса, хранимого в виде hash'а """
+    class TestHashItem(AIORedisItem):
+        """ Тестовый пример класса """
+        attr1: str
+        attr2: int
+        attr3: float
+        attr4: bytes
+
+        class Meta:
+            # Префикс записи в БД
+            table = "param1.{param1}.param2.{param2}"
+            storage = "hash"
+
+    return TestHashItem(**test_input_dict)
+
+
+@pytest.fixture
+def test_packed_item(test_input_dict: dict) -> AIORedisItem:
+    """ Тестовый экземплар класса, хранимого одной упакованной записью """
+    class TestPackedItem(AIORedisItem):
+        """ Тестовый пример класса """
+        attr1: str
+        attr2: int
+        attr3: float
+        attr4: bytes
+
+        class Meta:
+            # Префикс записи в БД
+            table = "param1.{param1}.param2.{param2}"
+            storage = "packed"
+
+    return TestPackedItem(**test_input_dict)
+
+
+@pytest.fixture
+def test_compact_item(test_input_dict: dict) -> AIORedisItem:
+    """ Тестовый экземплар класса в компактном режиме """
+    class TestCompactItem(AIORedisItem):
+        """ Тестовый пример класса """
+        attr1: str
+        attr2: int
+        attr3: float
+        attr4: bytes
+
+        class Meta:
+            # Префикс записи в БД
+            table = "param1.{param1}.param2.{param2}"
+            compact = True
+
+    return TestCompactItem(**test_input_dict)
+
+
 @pytest.fixture
 def test_input_dict() -> dict[str, Union[str, bytes, float, int]]:
     """ Тестовый словарь """
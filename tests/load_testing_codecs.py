@@ -0,0 +1,81 @@
+import asyncio
+from time import monotonic
+
+import redis.asyncio as redis
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm.codecs import CODECS
+
+OBJECTS_COUNT: int = 100_000
+CODEC_NAMES: tuple[str, ...] = tuple(CODECS)
+
+
+class TestItem(AIORedisItem):
+    attr1: int
+    attr2: str
+    attr3: float
+    attr4: int
+    attr5: bool
+
+    class Meta:
+        table = "param1.{param1}"
+
+
+def make_values(count: int) -> list[tuple]:
+    return [(i, str(i), i / 3, -i, bool(i % 2)) for i in range(count)]
+
+
+def measure_codec(codec_name: str, rows: list[tuple]) -> list[bytes]:
+    """ Скорость кодирования/декодирования и размер записи """
+    try:
+        item_class = type(
+            f"TestItem_{codec_name}",
+            (TestItem,),
+            {
+                "__annotations__": dict(TestItem.__annotations__),
+                "Meta": type("Meta", (), {"table": "param1.{param1}", "codec": codec_name}),
+            },
+        )
+    except ImportError as exception:
+        print(f"{codec_name} -> skipped ({exception})")
+        return []
+    codec = item_class._codec  # type: ignore
+    start_time: float = monotonic()
+    encoded: list[bytes] = [codec.encode_row(row) for row in rows]
+    encode_time: float = monotonic() - start_time
+    start_time = monotonic()
+    for data in encoded:
+        codec.decode_row(data)
+    decode_time: float = monotonic() - start_time
+    size: float = sum(len(data) for data in encoded) / len(encoded)
+    print(
+        f"{codec_name} -> Objects count: {len(rows)}, encode: {encode_time:.3f}s, "
+        f"decode: {decode_time:.3f}s, record size: {size:.1f} bytes"
+    )
+    return encoded
+
+
+async def memory_usage(client: redis.Redis, codec_name: str, encoded: list[bytes]) -> None:
+    """ Занимаемая записями память на сервере (MEMORY USAGE, если поддерживается) """
+    key: str = f"load_testing_codecs.{codec_name}"
+    try:
+        await client.set(key, encoded[0])
+        usage: int = await client.memory_usage(key)
+        await client.delete(key)
+    except Exception as exception:
+        print(f"{codec_name} -> MEMORY USAGE not available ({exception})")
+        return
+    print(f"{codec_name} -> MEMORY USAGE per record: {usage} bytes")
+
+
+async def main() -> None:
+    rows: list[tuple] = make_values(count=OBJECTS_COUNT)
+    client: redis.Redis = redis.Redis(host="localhost", port=6379, db=1)
+    for codec_name in CODEC_NAMES:
+        encoded: list[bytes] = measure_codec(codec_name=codec_name, rows=rows)
+        if encoded:
+            await memory_usage(client=client, codec_name=codec_name, encoded=encoded)
+    await client.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,75 @@
+from time import monotonic
+from contextlib import suppress
+import pickle
+from typing import Any
+
+from aiostorage_orm import AIORedisItem
+
+FIELDS_COUNT: int = 5
+# Прежний (квадратичный) алгоритм проверяется только на небольших объёмах
+LEGACY_MAX_COUNT: int = 1_000
+
+
+class TestItem(AIORedisItem):
+    attr1: int
+    attr2: str
+    attr3: float
+    attr4: int
+    attr5: str
+
+    class Meta:
+        table = "param1.{param1}.param2.{param2}"
+
+
+def make_db_items(count: int) -> dict[bytes, bytes]:
+    """ Данные в виде, в котором они получаются из БД (MGET ключей полей) """
+    db_items: dict[bytes, bytes] = {}
+    for i in range(count):
+        item: TestItem = TestItem(param1=i, param2=i % 7, attr1=i, attr2=str(i), attr3=i / 3, attr4=-i, attr5="x")
+        for key, value in item.mapping.items():
+            db_items[str(key).encode()] = value  # type: ignore
+    return db_items
+
+
+def legacy_all_fields_is_empty(items: dict[bytes, bytes], fields: list[bytes]) -> bool:
+    """ Прежняя реализация: проверка на отсутствие всех значений создаваемого объекта """
+    for field in fields:
+        with suppress(pickle.UnpicklingError):
+            if field in items and items[field] and pickle.loads(items[field]) is not None:
+                return False
+    return True
+
+
+def legacy_objects_from_db_items(items: dict[bytes, bytes]) -> list[Any]:
+    """ Прежняя реализация: отбор полей каждого объекта полным перебором ключей """
+    tables: set[str] = {str(key).rsplit(".", 1)[0] for key in items.keys()}
+    result_items: list[Any] = []
+    for table in tables:
+        fields_src: list[bytes] = list(filter(lambda item: str(item).startswith(table), items))
+        if legacy_all_fields_is_empty(items=items, fields=fields_src):
+            continue
+        fields: dict[str, Any] = {
+            field.decode().rsplit(".", 1)[1]: pickle.loads(items[field])
+            for field in fields_src
+        }
+        src_values: list[str] = table.split(".")
+        table_args: dict = {key: src_values[position] for key, position in TestItem._keys_positions.items()}
+        result_items.append(TestItem(**(fields | table_args)))
+    return result_items
+
+
+def main() -> None:
+    for count in (1_000, 10_000, 100_000):
+        db_items: dict[bytes, bytes] = make_db_items(count=count)
+        start_time: float = monotonic()
+        TestItem._objects_from_db_items(items=db_items)
+        total_time: float = monotonic() - start_time
+        print(f"_objects_from_db_items -> Objects count: {count}, total time: {total_time}")
+        if count <= LEGACY_MAX_COUNT:
+            start_time = monotonic()
+            legacy_objects_from_db_items(items=db_items)
+            total_time = monotonic() - start_time
+            print(f"legacy decoder -> Objects count: {count}, total time: {total_time}")
+
+
+main()
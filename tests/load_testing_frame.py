@@ -0,0 +1,71 @@
+from time import monotonic
+import asyncio
+
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm import AIORedisItem
+
+COUNT: int = 10_000
+# Прежний способ добавления: вызов скрипта на каждый объект (RPUSH, LLEN, LPOP)
+ITEM_ADD_SCRIPT: str = """
+    redis.call('rpush', KEYS[1], ARGV[1])
+    if redis.call('llen', KEYS[1]) > tonumber(ARGV[2]) then
+        redis.call('lpop', KEYS[1])
+    end
+"""
+
+
+class TestItem(AIORedisItem):
+    date_time: int
+    value: float
+
+    class Meta:
+        table = "frame_test.{param1}"
+        frame_size = 1000
+
+
+async def add_by_item(orm: AIORedisORM, script: AsyncScript, items: list[TestItem]) -> None:
+    """ Добавление объектов вызовом скрипта на каждый объект """
+    pipe = orm._client.pipeline()
+    for item in items:
+        await script(
+            keys=[orm.frame._make_key(item=item).encode()],
+            args=[orm.frame._serialize_item(item=item), orm.frame._get_frame_size(item=item)],
+            client=pipe,
+        )
+    await pipe.execute()
+
+
+async def measure(client: redis.Redis, orm: AIORedisORM, script: AsyncScript, keys_count: int) -> None:
+    """ Время добавления COUNT объектов в keys_count frame'ов прежним и групповым способом """
+    items: list[TestItem] = [
+        TestItem(param1=i % keys_count, date_time=i, value=i / 10)
+        for i in range(COUNT)
+    ]
+    start_time: float = monotonic()
+    await add_by_item(orm=orm, script=script, items=items)
+    by_item_time: float = monotonic() - start_time
+    await client.flushdb()
+    start_time = monotonic()
+    assert (await orm.frame.add(item_or_items=items)).ok
+    batched_time: float = monotonic() - start_time
+    await client.flushdb()
+    print(
+        f"keys: {keys_count}, items per key: {COUNT // keys_count} -> "
+        f"by item: {by_item_time:.3f} s, batched: {batched_time:.3f} s"
+    )
+
+
+async def main():
+    client: redis.Redis = redis.Redis(host="localhost", port=6379, db=1)
+    orm: AIORedisORM = AIORedisORM(client=client)
+    await orm.init()
+    script: AsyncScript = client.register_script(ITEM_ADD_SCRIPT)
+    for keys_count in (1, COUNT):
+        await measure(client=client, orm=orm, script=script, keys_count=keys_count)
+    await orm.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,58 @@
+import tracemalloc
+
+from aiostorage_orm import AIORedisItem
+
+OBJECTS_COUNT: int = 100_000
+
+
+class TestItem(AIORedisItem):
+    attr1: int
+    attr2: str
+    attr3: float
+    attr4: int
+    attr5: str
+
+    class Meta:
+        table = "subsystem.{subsystem_id}.tag.{tag_id}"
+
+
+class TestCompactItem(AIORedisItem):
+    attr1: int
+    attr2: str
+    attr3: float
+    attr4: int
+    attr5: str
+
+    class Meta:
+        table = "subsystem.{subsystem_id}.tag.{tag_id}"
+        compact = True
+
+
+def measure(item_class: type[AIORedisItem]) -> None:
+    """ Память, занимаемая объектами (без учёта значений полей, общих для всех объектов) """
+    values: list[dict] = [
+        dict(subsystem_id=i, tag_id=i, attr1=1, attr2="value", attr3=1.5, attr4=2, attr5="value")
+        for i in range(OBJECTS_COUNT)
+    ]
+    tracemalloc.start()
+    items: list[AIORedisItem] = [item_class(**kwargs) for kwargs in values]
+    memory_usage, _ = tracemalloc.get_traced_memory()
+    # Отслеживание изменённых полей (объект получен из БД, затем изменено одно поле)
+    for item in items:
+        item._mark_clean()
+        item.attr1 = 2
+    dirty_memory_usage, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{item_class.__name__} -> Objects count: {len(items)}, "
+        f"bytes per instance: {memory_usage / OBJECTS_COUNT:.0f}, "
+        f"with changed field: {dirty_memory_usage / OBJECTS_COUNT:.0f}"
+    )
+
+
+def main() -> None:
+    measure(item_class=TestItem)
+    measure(item_class=TestCompactItem)
+
+
+main()
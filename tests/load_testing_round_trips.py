@@ -0,0 +1,56 @@
+from time import monotonic
+import asyncio
+from typing import Mapping
+
+import redis.asyncio as redis
+
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm import AIORedisItem
+
+COUNT: int = 1000
+
+
+class TestItem(AIORedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "param1.{param1}.param2.{param2}"
+
+
+async def commands_stats(client: redis.Redis) -> dict[str, int]:
+    """ Количество выполненных сервером команд по их именам (INFO commandstats) """
+    stats: Mapping = await client.info("commandstats")
+    return {name.replace("cmdstat_", ""): value["calls"] for name, value in stats.items()}
+
+
+async def measure(client: redis.Redis, title: str, coroutine_factory) -> None:
+    """ Выполнение COUNT операций с подсчётом команд, отправленных серверу """
+    before: dict[str, int] = await commands_stats(client)
+    start_time: float = monotonic()
+    for i in range(COUNT):
+        await coroutine_factory(i)
+    total_time: float = monotonic() - start_time
+    after: dict[str, int] = await commands_stats(client)
+    # Сам вызов INFO тоже учитывается сервером
+    calls: dict[str, int] = {
+        name: calls - before.get(name, 0)
+        for name, calls in after.items()
+        if name != "info" and calls - before.get(name, 0)
+    }
+    print(
+        f"{title} -> operations: {COUNT}, commands: {sum(calls.values())} {calls}, "
+        f"PING per operation: {calls.get('ping', 0) / COUNT}, total time: {total_time}"
+    )
+
+
+async def main():
+    client: redis.Redis = redis.Redis(host="localhost", port=6379, db=1)
+    orm: AIORedisORM = AIORedisORM(client=client)
+    await orm.init()
+    await measure(client, "save", lambda i: TestItem(attr1=i, attr2=str(i), param1=i, param2=1).save())
+    await measure(client, "get", lambda i: TestItem.get(param1=i, param2=1))
+    await orm.close()
+
+
+asyncio.run(main())
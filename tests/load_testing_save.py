@@ -0,0 +1,57 @@
+from time import monotonic
+import asyncio
+
+import redis.asyncio as redis
+
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm import AIORedisItem
+
+COUNT: int = 1000
+FIELDS_COUNTS: tuple[int, ...] = (1, 10, 50)
+
+
+def make_item_class(fields_count: int, ttl: int | None) -> type[AIORedisItem]:
+    """ Модель с fields_count полями """
+    return type(
+        f"TestItem{fields_count}",
+        (AIORedisItem,),
+        {
+            "__annotations__": {f"attr{i}": int for i in range(fields_count)},
+            "Meta": type("Meta", (), {"table": f"fields{fields_count}.{{param1}}", "ttl": ttl}),
+        },
+    )
+
+
+async def measure(client: redis.Redis, fields_count: int, ttl: int | None) -> None:
+    """ Задержка одиночного сохранения объекта с fields_count полями (save - один сетевой вызов) """
+    item_class: type[AIORedisItem] = make_item_class(fields_count=fields_count, ttl=ttl)
+    items: list[AIORedisItem] = [
+        item_class(param1=i, **{f"attr{field}": i for field in range(fields_count)})
+        for i in range(COUNT)
+    ]
+    latencies: list[float] = []
+    for item in items:
+        start_time: float = monotonic()
+        assert (await item.save()).ok
+        latencies.append(monotonic() - start_time)
+    latencies.sort()
+    print(
+        f"fields: {fields_count}, ttl: {ttl} -> "
+        f"mean: {sum(latencies) / COUNT * 1000:.3f} ms, "
+        f"p50: {latencies[COUNT // 2] * 1000:.3f} ms, "
+        f"p99: {latencies[int(COUNT * 0.99)] * 1000:.3f} ms"
+    )
+    await client.flushdb()
+
+
+async def main():
+    client: redis.Redis = redis.Redis(host="localhost", port=6379, db=1)
+    orm: AIORedisORM = AIORedisORM(client=client)
+    await orm.init()
+    for ttl in (None, 60):
+        for fields_count in FIELDS_COUNTS:
+            await measure(client=client, fields_count=fields_count, ttl=ttl)
+    await orm.close()
+
+
+asyncio.run(main())
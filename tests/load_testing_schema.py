@@ -0,0 +1,54 @@
+import re
+from time import monotonic
+
+from aiostorage_orm import AIORedisItem
+
+ITERATIONS: int = 100_000
+
+
+class TestItem(AIORedisItem):
+    attr1: int
+    attr2: str
+    attr3: float
+
+    class Meta:
+        table = "subsystem.{subsystem_id}.tag.{tag_id}"
+
+
+def legacy_get_keys_list(prefix: str) -> list[bytes]:
+    """ Прежняя реализация: форматирование ключа каждого поля при каждом вызове """
+    return [f"{prefix}.{key}".encode() for key in TestItem.__annotations__.keys()]
+
+
+def legacy_get_filters_by_kwargs(**kwargs) -> list[str]:
+    """ Прежняя реализация: разбор шаблона ключа регулярным выражением при каждом вызове """
+    table: str = TestItem.Meta.table
+    patterns: list[str] = re.findall(r'\{[^\}]*\}', table)
+    str_filters: list[str] = []
+    for prepared_kwargs in TestItem._get_list_of_prepared_kwargs(**kwargs):
+        for pattern in patterns:
+            if pattern.strip("{").strip("}") not in prepared_kwargs:
+                table = table.replace(pattern, "*")
+        str_filters.append(table.format(**prepared_kwargs))
+    return str_filters
+
+
+def measure(title: str, function, **kwargs) -> None:
+    start_time: float = monotonic()
+    for _ in range(ITERATIONS):
+        function(**kwargs)
+    total_time: float = monotonic() - start_time
+    print(f"{title} -> Calls count: {ITERATIONS}, per call: {total_time / ITERATIONS * 1e6:.2f}us")
+
+
+def main() -> None:
+    prefix: str = "subsystem.1.tag.2"
+    measure("legacy _get_keys_list", legacy_get_keys_list, prefix=prefix)
+    measure("_get_keys_list", TestItem._get_keys_list, prefix=prefix)
+    measure("legacy _get_filters_by_kwargs", legacy_get_filters_by_kwargs, subsystem_id=1)
+    measure("_get_filters_by_kwargs", TestItem._get_filters_by_kwargs, subsystem_id=1)
+    items: list[TestItem] = [TestItem(subsystem_id=i, tag_id=i, attr1=i, attr2="", attr3=0.) for i in range(10)]
+    measure("_make_kwargs_from_objects", TestItem._make_kwargs_from_objects, objects=items)
+
+
+main()
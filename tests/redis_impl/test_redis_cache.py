@@ -0,0 +1,75 @@
+import pytest
+import redis.asyncio as redis
+from pytest import MonkeyPatch
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm import CacheConfig
+from aiostorage_orm.redis_impl.aioredis_cache import AIORedisCache
+
+
+def test_cache_lru() -> None:
+    """ Вытеснение давно не запрашиваемых объектов и счётчики попаданий """
+    cache: AIORedisCache = AIORedisCache(config=CacheConfig(max_entries=2))
+    cache.put(prefix="a", values={"attr1": 1}, generation=cache.generation)
+    cache.put(prefix="b", values={"attr1": 2}, generation=cache.generation)
+    assert cache.get(prefix="a") == {"attr1": 1}
+    cache.put(prefix="c", values={"attr1": 3}, generation=cache.generation)
+    assert cache.get(prefix="b") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test_cache_ttl_and_generation(monkeypatch: MonkeyPatch) -> None:
+    """ Истечение времени хранения и отказ от сохранения результата чтения, начатого до записи """
+    now: list[float] = [100.]
+    monkeypatch.setattr("aiostorage_orm.redis_impl.aioredis_cache.monotonic", lambda: now[0])
+    cache: AIORedisCache = AIORedisCache(config=CacheConfig(max_entries=10, ttl=1.))
+    generation: int = cache.generation
+    cache.put(prefix="a", values={"attr1": 1}, generation=generation)
+    now[0] += 2
+    assert cache.get(prefix="a") is None
+    cache.invalidate(prefixes=["b"])
+    cache.put(prefix="a", values={"attr1": 1}, generation=generation)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_item_cache(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Повторное получение объекта из кэша без обращения к БД и удаление из кэша при записи """
+    class TestCachedItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            cache = CacheConfig(max_entries=100)
+
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(TestCachedItem, "_db_instance", test_redis)
+    test_orm: AIORedisORM = AIORedisORM(client=test_redis)
+    await TestCachedItem(param1=1, param2=1, attr1=10).save()
+    assert (await TestCachedItem.get(param1=1, param2=1)).attr1 == 10  # type: ignore
+    commands: list[str] = []
+    execute_command = test_redis.execute_command
+
+    async def counting_execute_command(*args, **options):
+        commands.append(str(args[0]).upper())
+        return await execute_command(*args, **options)
+
+    monkeypatch.setattr(test_redis, "execute_command", counting_execute_command)
+    item: AIORedisItem = await TestCachedItem.get(param1=1, param2=1)  # type: ignore
+    assert item.attr1 == 10 and item.param1 == "1"
+    assert commands == []
+    # Изменение полученного объекта не изменяет кэш
+    item.attr1 = 20
+    assert (await TestCachedItem.get(param1=1, param2=1)).attr1 == 10  # type: ignore
+    assert TestCachedItem.cache_stats() == {"hits": 2, "misses": 1, "size": 1}
+    assert (await item.save()).ok
+    assert (await TestCachedItem.get(param1=1, param2=1)).attr1 == 20  # type: ignore
+    assert (await test_orm.bulk_delete(items=[item])).ok
+    assert await TestCachedItem.get(param1=1, param2=1) is None
+    # Запрос части полей выполняется без кэша
+    await TestCachedItem(param1=1, param2=2, attr1=30).save()
+    result: list[TestCachedItem] = await TestCachedItem.filter(param1=1, param2__in=[1, 2])
+    assert [item.attr1 for item in result] == [30]
+    assert (await TestCachedItem.get(param1=1, param2=2, only="attr1")).attr1 == 30  # type: ignore
+    assert TestCachedItem.cache_stats()["size"] == 1  # type: ignore
@@ -233,3 +233,34 @@ async def test_item_set_frame_size(
     assert test_item._frame_size == NEW_FRAME_SIZE
     db_frame_len = await test_redis.llen(key)
     assert db_frame_len == NEW_FRAME_SIZE
+
+
+@pytest.mark.asyncio
+async def test_add_batches(
+    test_frame: AIORedisFrame,
+    test_redis: redis.Redis,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """ Добавление значений нескольких frame'ов порциями с сохранением порядка и подрезкой """
+    FRAME_SIZE: int = 7
+
+    class TestItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}"
+            frame_size = FRAME_SIZE
+
+    monkeypatch.setattr(AIORedisFrame, "ADD_BATCH_SIZE", 4)
+    items: list[AIORedisItem] = [TestItem(param1=i % 3, attr1=i) for i in range(30)]
+    batches = test_frame._get_add_batches(items=items)
+    # Значения нескольких frame'ов объединяются в вызов, значения одного frame'а - разделяются
+    assert len(batches) == 8
+    assert [keys for keys, _ in batches[:3]] == [
+        [b"frame.param1.0"], [b"frame.param1.0"], [b"frame.param1.0", b"frame.param1.1"],
+    ]
+    assert (await test_frame.add(item_or_items=items)).ok
+    for param1 in range(3):
+        result: list[AIORedisItem] = await test_frame.get(item=TestItem(param1=param1, attr1=0))
+        assert [item.attr1 for item in result] == [i for i in range(30) if i % 3 == param1][-FRAME_SIZE:]
+    assert await test_redis.llen("frame.param1.0") == FRAME_SIZE
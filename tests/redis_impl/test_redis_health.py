@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+from pytest import MonkeyPatch
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm.redis_impl.aioredis_health import AIORedisHealth
+
+
+@pytest.mark.asyncio
+async def test_check(test_redis: redis.Redis) -> None:
+    """ Проверка подключения обновляет состояние """
+    health: AIORedisHealth = AIORedisHealth(client=test_redis)
+    health.mark_unavailable()
+    assert await health.check()
+    assert health.available
+
+
+@pytest.mark.asyncio
+async def test_check_unavailable() -> None:
+    """ Недоступный сервер переводит состояние в "недоступно" """
+    health: AIORedisHealth = AIORedisHealth(client=redis.Redis(port=1), interval=60)
+    assert not await health.check()
+    assert not health.available
+
+
+def test_half_open() -> None:
+    """ По истечении интервала операция пропускается к серверу """
+    health: AIORedisHealth = AIORedisHealth(client=redis.Redis(), interval=0)
+    health.mark_unavailable()
+    assert health.available
+
+
+@pytest.mark.asyncio
+async def test_fail_fast(
+    test_redis: redis.Redis,
+    test_item: AIORedisItem,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ При известном отсутствии подключения операции завершаются без обращения к серверу """
+    health: AIORedisHealth = AIORedisHealth(client=test_redis, interval=60)
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(AIORedisItem, "_health", health)
+    assert (await test_item.save()).ok
+    health.mark_unavailable()
+    with pytest.raises(Exception) as exception:
+        await test_item.get(_item=test_item)
+    assert "not connected" in str(exception.value)
+    assert not (await test_item.save()).ok
+    # После восстановления подключения операции выполняются
+    await health.check()
+    assert await test_item.get(_item=test_item) == test_item
+
+
+@pytest.mark.asyncio
+async def test_orm_background_check(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Фоновая проверка подключения запускается в init и останавливается в close """
+    # Глобальное подключение, устанавливаемое ORM, восстанавливается после теста
+    monkeypatch.setattr(AIORedisItem, "_db_instance", None)
+    monkeypatch.setattr(AIORedisItem, "_health", None)
+    orm: AIORedisORM = AIORedisORM(client=test_redis, health_check_interval=0.01)
+    await orm.init()
+    orm._health.mark_unavailable()
+    await asyncio.sleep(0.05)
+    assert orm._health._available
+    await orm.close()
+    assert orm._health._task is None
+
+
+@pytest.mark.asyncio
+async def test_no_ping_per_operation(
+    test_redis: redis.Redis,
+    test_item: AIORedisItem,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Операции get/save отправляют серверу только команды с данными (без PING) """
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(AIORedisItem, "_health", AIORedisHealth(client=test_redis))
+    commands: list[str] = []
+    execute_command = test_redis.execute_command
+
+    async def counting_execute_command(*args, **options):
+        commands.append(str(args[0]).upper())
+        return await execute_command(*args, **options)
+
+    monkeypatch.setattr(test_redis, "execute_command", counting_execute_command)
+    await test_item.get(_item=test_item)
+    assert commands == ["MGET"]
+
+
+@pytest.mark.asyncio
+async def test_half_open_recovery(
+    test_redis: redis.Redis,
+    test_item: AIORedisItem,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Успешная операция half-open восстанавливает подключение без фоновой проверки """
+    health: AIORedisHealth = AIORedisHealth(client=test_redis, interval=0.05)
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(AIORedisItem, "_health", health)
+    health.mark_unavailable()
+    assert not (await test_item.save()).ok
+    await asyncio.sleep(0.1)
+    assert [(await test_item.save()).ok for _ in range(5)] == [True] * 5
+    # Ошибка подключения во время операции half-open возвращает состояние "недоступно"
+    health.mark_unavailable()
+    await asyncio.sleep(0.1)
+    assert health.available
+    health.mark_unavailable()
+    assert not health.available
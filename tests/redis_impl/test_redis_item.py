@@ -1,9 +1,12 @@
+import asyncio
 import pytest
 import pickle
 import redis.asyncio as redis
 from pytest import MonkeyPatch
 
 from aiostorage_orm import AIORedisItem
+from aiostorage_orm import AIORedisORM
+from aiostorage_orm import OperationResult
 from aiostorage_orm import MultipleGetParamsException
 from aiostorage_orm import NotEnoughParamsException
 
@@ -271,12 +274,819 @@ async def test_set_frame_size(test_item: AIORedisItem) -> None:
     assert test_item._frame_size == new_frame_size
 
 
-def test_all_fields_is_empty():
-    """ Проверка на то, что все поля создаваемого объекта являются пустыми (то есть не были получкены из БД) """
-    assert not AIORedisItem._all_fields_is_empty(items={b'one': pickle.dumps('value')}, fields=[b'one'])
-    assert AIORedisItem._all_fields_is_empty(items={b'one': b''}, fields=[b'one'])
-    assert AIORedisItem._all_fields_is_empty(items={b'one': None}, fields=[b'one'])  # type: ignore
-    assert not AIORedisItem._all_fields_is_empty(
-        items={b'one': None, b'two': pickle.dumps('value')},  # type: ignore
-        fields=[b'one', b'two'],
+@pytest.mark.asyncio
+async def test_filter_by_mask(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Поиск по маске (один из параметров не передан) находит все подходящие объекты """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param1 in range(5):
+        await item_class(param1=param1, param2=4, attr1="value", attr2=param1).save()
+    await item_class(param1=1, param2=5, attr1="value", attr2=1).save()
+
+    result: list[AIORedisItem] = await item_class.filter(param2=4)
+    assert sorted(item.attr2 for item in result) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_iter_filter(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Потоковое получение объектов порциями не теряет и не дублирует объекты """
+    items_count: int = 25
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param1 in range(items_count):
+        await item_class(param1=param1, param2=4, attr1="value", attr2=param1).save()
+    await item_class(param1=1, param2=5, attr1="value", attr2=-1).save()
+
+    result: list[AIORedisItem] = [
+        item async for item in item_class.iter_filter(param2=4, _batch_size=4)
+    ]
+    assert sorted(item.attr2 for item in result) == list(range(items_count))
+    # Без масок объекты запрашиваются напрямую
+    result = [item async for item in item_class.iter_filter(param1__in=[1, 2], param2=4)]
+    assert sorted(item.attr2 for item in result) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iter_filter_oom_exclude(
+    test_redis: redis.Redis,
+    test_item: AIORedisItem,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Потоковое получение без фильтра запрещено """
+    monkeypatch.setattr(test_item.__class__, "_db_instance", test_redis)
+    with pytest.raises(Exception) as exception:
+        async for _ in test_item.iter_filter():
+            pass
+
+    assert "empty filter" in str(exception.value)
+
+
+def test_unknown_storage() -> None:
+    """ Неизвестный способ хранения определяется в момент объявления модели """
+    with pytest.raises(ValueError):
+        class TestItem(AIORedisItem):
+            attr1: int
+
+            class Meta:
+                table = "param1.{param1}"
+                storage = "unknown"
+
+
+@pytest.mark.asyncio
+async def test_hash_save_get_delete(
+    test_hash_item: AIORedisItem,
+    test_input_dict: dict,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Объект со способом хранения "hash" занимает один ключ БД """
+    item_class: type[AIORedisItem] = test_hash_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    assert (await test_hash_item.save()).ok
+    assert await test_redis.keys() == [test_hash_item._table.encode()]
+    assert await test_redis.type(test_hash_item._table) == b"hash"
+
+    result = await item_class.get(param1=test_input_dict["param1"], param2=test_input_dict["param2"])
+    assert result == test_hash_item
+    assert await item_class.get(param1=-1, param2=-1) is None
+
+    assert (await test_hash_item.delete()).ok
+    assert await test_redis.keys() == []
+
+
+@pytest.mark.asyncio
+async def test_hash_filter_by_mask(
+    test_hash_item: AIORedisItem,
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Поиск по маске находит только hash'и объектов модели """
+    item_class: type[AIORedisItem] = test_hash_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param1 in range(5):
+        await item_class(param1=param1, param2=4, attr1="value", attr2=param1).save()
+    # Объект с тем же префиксом, но хранимый по полям, не должен попасть в выборку
+    await test_item.using(db_instance=test_redis).save()
+
+    result: list[AIORedisItem] = await item_class.filter(param2=4)
+    assert sorted(item.attr2 for item in result) == list(range(5))
+    result = [item async for item in item_class.iter_filter(param1__in=[1, 3], param2=4)]
+    assert sorted(item.attr2 for item in result) == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_packed_save_get_filter(
+    test_packed_item: AIORedisItem,
+    test_input_dict: dict,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Объект со способом хранения "packed" занимает один строковый ключ БД """
+    item_class: type[AIORedisItem] = test_packed_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    assert (await test_packed_item.save()).ok
+    assert await test_redis.keys() == [test_packed_item._table.encode()]
+    assert await test_redis.type(test_packed_item._table) == b"string"
+
+    result = await item_class.get(param1=test_input_dict["param1"], param2=test_input_dict["param2"])
+    assert result == test_packed_item
+    for param1 in range(3):
+        await item_class(param1=param1, param2=5, attr2=param1).save()
+    # Объект без значений не возвращается, как и для остальных способов хранения
+    await item_class(param1=9, param2=5).save()
+    assert sorted(item.attr2 for item in await item_class.filter(param2=5)) == [0, 1, 2]
+
+    assert (await test_packed_item.delete()).ok
+    assert await item_class.get(_item=test_packed_item) is None
+
+
+def test_packed_decode_by_field_names(test_packed_item: AIORedisItem) -> None:
+    """ Значения упакованной записи сопоставляются полям по имени, а не по позиции """
+    item_class: type[AIORedisItem] = test_packed_item.__class__
+    # Запись сохранена моделью, в которой ещё не было поля attr1 и было удалённое поле
+    stored_value: bytes = pickle.dumps({"attr2": 1, "attr3": 2.5, "removed": 3})
+    result: list[AIORedisItem] = item_class._objects_from_packed_items(
+        items={b"param1.1.param2.2": stored_value},
     )
+    assert result[0]._params == {"attr1": None, "attr2": 1, "attr3": 2.5, "attr4": None}
+
+
+@pytest.mark.asyncio
+async def test_filter_by_mask_partial_fields(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Объект находится по маске, даже если часть ключей его полей отсутствует """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    await item_class(param1=1, param2=4, attr1="value", attr2=1).save()
+    await test_redis.delete("param1.1.param2.4.attr1")
+
+    result: list[AIORedisItem] = await item_class.filter(param2=4)
+    assert [item.attr2 for item in result] == [1]
+    assert [item.attr2 async for item in item_class.iter_filter(param2=4, _batch_size=1)] == [1]
+
+
+def test_objects_from_db_items_multiple(test_item: AIORedisItem) -> None:
+    """ Поля нескольких объектов группируются по префиксу, объекты без значений пропускаются """
+    item_class: type[AIORedisItem] = test_item.__class__
+    test_data: dict[bytes, bytes] = {}
+    for param1 in range(3):
+        for key in item_class._get_keys_list(prefix=f"param1.{param1}.param2.1"):
+            test_data[key] = pickle.dumps(param1 if param1 else None)
+    result: list[AIORedisItem] = item_class._objects_from_db_items(items=test_data)
+    assert sorted(item.attr2 for item in result) == [1, 2]
+    assert sorted(item.param1 for item in result) == ["1", "2"]
+
+
+def test_using_not_bound_to_instance(test_item: AIORedisItem) -> None:
+    """ Метод using не привязывается к каждому экземпляру, но копирует объект при вызове у экземпляра """
+    assert "using" not in test_item.__dict__
+    assert test_item.using() == test_item
+    assert test_item.using() is not test_item
+    assert issubclass(test_item.__class__.using(), test_item.__class__)  # type: ignore
+
+
+def test_compact_item(test_compact_item: AIORedisItem, test_item: AIORedisItem) -> None:
+    """ Объект в компактном режиме не хранит словарь значений, но формирует те же данные """
+    assert "_params" not in test_compact_item.__dict__
+    assert test_compact_item._params == test_item._params
+    assert test_compact_item._table == test_item._table
+    assert test_compact_item.mapping == test_item.mapping
+    test_compact_item.attr2 = 20
+    assert test_compact_item._params["attr2"] == 20
+    # Непереданные поля равны None
+    assert test_compact_item.__class__(param1=1, param2=2).attr1 is None
+
+
+@pytest.mark.asyncio
+async def test_compact_save_filter(
+    test_compact_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Сохранение и получение объектов в компактном режиме """
+    item_class: type[AIORedisItem] = test_compact_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    assert (await test_compact_item.save()).ok
+    assert await item_class.get(_item=test_compact_item) == test_compact_item
+    assert await item_class.filter(param2=test_compact_item.param2) == [test_compact_item]
+
+
+@pytest.mark.asyncio
+async def test_get_filter_only(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Запрашиваются и заполняются только переданные поля """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    await test_item.save()
+    commands: list[tuple] = []
+    execute_command = test_redis.execute_command
+
+    async def logging_execute_command(*args, **options):
+        commands.append(args)
+        return await execute_command(*args, **options)
+
+    monkeypatch.setattr(test_redis, "execute_command", logging_execute_command)
+    result = await item_class.get(_item=test_item, only=["attr2"])
+    assert result and result._params == {"attr1": None, "attr2": test_item.attr2, "attr3": None, "attr4": None}
+    assert commands == [("MGET", b"param1.2.param2.4.attr2")]
+    # Поиск по маске ограничивается ключами запрошенного поля
+    commands.clear()
+    result_items: list[AIORedisItem] = await item_class.filter(param2=4, only="attr3")
+    assert [item._params["attr3"] for item in result_items] == [test_item.attr3]
+    assert "param1.*.param2.4.attr3" in commands[0]
+    result_items = [item async for item in item_class.iter_filter(param1=2, only=["attr1", "attr4"])]
+    assert [(item.attr1, item.attr4) for item in result_items] == [(test_item.attr1, test_item.attr4)]
+    # Объекты без значений запрошенных полей не возвращаются
+    await test_redis.delete("param1.2.param2.4.attr1")
+    assert await item_class.filter(param2=4, only=["attr1"]) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["hash", "packed"])
+async def test_filter_only_storages(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+    storage: str,
+) -> None:
+    """ Ограничение полей для остальных способов хранения """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    monkeypatch.setattr(item_class, "_storage", storage)
+    await test_item.save()
+    result_items: list[AIORedisItem] = await item_class.filter(param2=4, only=["attr2"])
+    assert [item._params for item in result_items] == [{"attr1": None, "attr2": 19, "attr3": None, "attr4": None}]
+
+
+@pytest.mark.asyncio
+async def test_filter_only_unknown_field(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Запрос несуществующего поля """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    with pytest.raises(ValueError):
+        await item_class.filter(param2=4, only=["unknown"])
+
+
+@pytest.mark.asyncio
+async def test_save_only_projection(
+    test_item: AIORedisItem,
+    test_packed_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Сохранение объекта, полученного с only, не перезаписывает неполученные поля """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    await test_item.save()
+    item = await item_class.get(_item=test_item, only=["attr2"])
+    assert item
+    item.attr2 = 100
+    assert (await item.save()).ok
+    # Запись целиком (save после delete, bulk_create)
+    item._params = {**item._params, "attr2": 101}
+    assert (await item.save()).ok
+    assert (await AIORedisORM(client=test_redis).bulk_create(items=[item])).ok
+    stored = await item_class.get(_item=test_item)
+    assert stored and stored.attr2 == 101 and stored.attr1 == test_item.attr1 and stored.attr4 == test_item.attr4
+    # "packed" хранится только целиком
+    packed_class: type[AIORedisItem] = test_packed_item.__class__
+    monkeypatch.setattr(packed_class, "_db_instance", test_redis)
+    await test_redis.flushdb()
+    await test_packed_item.save()
+    packed = await packed_class.get(_item=test_packed_item, only=["attr1"])
+    assert packed
+    packed.attr1 = "changed"
+    assert not (await packed.save()).ok
+    assert not (await AIORedisORM(client=test_redis).bulk_create(items=[packed])).ok
+    assert await packed_class.get(_item=test_packed_item) == test_packed_item
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["fields", "hash", "packed"])
+async def test_filter_read_batches(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+    storage: str,
+) -> None:
+    """ Чтение большого количества ключей порциями с сохранением порядка результатов """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    monkeypatch.setattr(item_class, "_storage", storage)
+    monkeypatch.setattr(item_class, "_read_batch_size", 5)
+    monkeypatch.setattr(item_class, "_read_max_in_flight", 2)
+    for param1 in range(10):
+        await item_class(param1=param1, param2=4, attr2=param1).save()
+    in_flight: list[int] = [0, 0]
+    execute_command = test_redis.execute_command
+
+    async def counting_execute_command(*args, **options):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        try:
+            return await execute_command(*args, **options)
+        finally:
+            in_flight[0] -= 1
+
+    monkeypatch.setattr(test_redis, "execute_command", counting_execute_command)
+    result: list[AIORedisItem] = await item_class.filter(param1__in=list(range(10)), param2=4)
+    assert [item.attr2 for item in result] == list(range(10))
+    # Команды pipeline ("hash") не проходят через execute_command клиента
+    if storage != "hash":
+        assert in_flight[1] == 2
+
+
+def test_read_batch_size_default(test_item: AIORedisItem, monkeypatch: MonkeyPatch) -> None:
+    """ Meta.read_batch_size переопределяет значение по умолчанию ORM """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(AIORedisItem, "_default_read_batch_size", 100)
+    assert item_class._get_read_batch_size() == 100
+
+    class TestItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}"
+            read_batch_size = 10
+
+    assert TestItem._get_read_batch_size() == 10
+
+
+@pytest.mark.asyncio
+async def test_filter_in_single_scan(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Поиск по спискам значений с маской выполняется одним обходом ключей """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param1 in range(10, 30):
+        await item_class(param1=param1, param2=param1, attr2=param1).save()
+    matches: list[str] = []
+    scan = test_redis.scan
+
+    async def logging_scan(*args, **kwargs):
+        matches.append(kwargs["match"])
+        return await scan(*args, **kwargs)
+
+    monkeypatch.setattr(test_redis, "scan", logging_scan)
+    result: list[AIORedisItem] = await item_class.filter(param1__in=list(range(5, 25)))
+    assert sorted(item.attr2 for item in result) == list(range(10, 25))
+    assert set(matches) == {"param1.*.param2.*.*"}
+    # Все параметры переданы - поиск по маске не выполняется
+    matches.clear()
+    result = await item_class.filter(param1__in=list(range(5, 25)), param2__in=list(range(5, 25)))
+    assert sorted(item.attr2 for item in result) == list(range(10, 25))
+    assert matches == []
+
+
+@pytest.fixture
+def test_indexed_item_class(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> type[AIORedisItem]:
+    class TestIndexedItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            indexes = ["param1", "param2"]
+
+    monkeypatch.setattr(TestIndexedItem, "_db_instance", test_redis)
+    return TestIndexedItem
+
+
+@pytest.mark.asyncio
+async def test_filter_by_index(
+    test_indexed_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Поиск по части параметров через индексы, без обхода ключей """
+    for param1 in range(3):
+        for param2 in range(3):
+            await test_indexed_item_class(param1=param1, param2=param2, attr1=param1 * 10 + param2).save()
+    assert await test_redis.smembers("index.param1.{param1}.param2.{param2}.param1.1") == {
+        b"param1.1.param2.0", b"param1.1.param2.1", b"param1.1.param2.2",
+    }
+
+    async def forbidden_scan(*args, **kwargs):
+        raise AssertionError("SCAN is not expected")
+
+    monkeypatch.setattr(test_redis, "scan", forbidden_scan)
+    result: list[AIORedisItem] = await test_indexed_item_class.filter(param1=1)
+    assert [item.attr1 for item in result] == [10, 11, 12]
+    result = await test_indexed_item_class.filter(param1__in=[0, 2], param2=1)
+    assert [item.attr1 for item in result] == [1, 21]
+    assert [item.attr1 async for item in test_indexed_item_class.iter_filter(param2=2)] == [2, 12, 22]
+
+
+@pytest.mark.asyncio
+async def test_index_cleanup(
+    test_indexed_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Индексы очищаются при удалении объектов и лениво - после истечения времени жизни """
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    test_orm: AIORedisORM = AIORedisORM(client=test_redis)
+    items: list[AIORedisItem] = [test_indexed_item_class(param1=1, param2=param2, attr1=param2) for param2 in range(4)]
+    assert (await test_orm.bulk_create(items=items)).ok
+    await items[0].delete()
+    assert (await test_orm.bulk_delete(items=items[1:2])).ok
+    assert await test_redis.smembers("index.param1.{param1}.param2.{param2}.param1.1") == {
+        b"param1.1.param2.2", b"param1.1.param2.3",
+    }
+    # Объект удалён в обход ORM (например, истекло время жизни)
+    await test_redis.delete("param1.1.param2.2.attr1")
+    assert [item.attr1 for item in await test_indexed_item_class.filter(param1=1)] == [3]
+    assert await test_redis.smembers("index.param1.{param1}.param2.{param2}.param1.1") == {b"param1.1.param2.3"}
+    assert not await test_redis.exists("index.param1.{param1}.param2.{param2}.param2.2")
+
+
+def test_unknown_index() -> None:
+    with pytest.raises(ValueError):
+        class TestItem(AIORedisItem):
+            attr1: int
+
+            class Meta:
+                table = "param1.{param1}"
+                indexes = ["attr1"]
+
+
+@pytest.fixture
+def test_range_item_class(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> type[AIORedisItem]:
+    class TestRangeItem(AIORedisItem):
+        date_time: int
+        value: float
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            range_indexes = ["date_time", "value"]
+
+    monkeypatch.setattr(TestRangeItem, "_db_instance", test_redis)
+    return TestRangeItem
+
+
+@pytest.mark.asyncio
+async def test_filter_by_range(
+    test_range_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Поиск по диапазону значений, сортировка и ограничение количества через индексы по значениям полей """
+    for param1 in range(2):
+        for date_time in range(5):
+            item = test_range_item_class(param1=param1, param2=date_time, date_time=date_time * 10, value=-date_time)
+            assert (await item.save()).ok
+
+    async def forbidden_scan(*args, **kwargs):
+        raise AssertionError("SCAN is not expected")
+
+    monkeypatch.setattr(test_redis, "scan", forbidden_scan)
+    result: list[AIORedisItem] = await test_range_item_class.filter(date_time__gte=10, date_time__lt=30, param1=1)
+    assert [item.date_time for item in result] == [10, 20]
+    result = await test_range_item_class.filter(date_time__gt=0, order_by="-date_time", limit=3)
+    assert [item.date_time for item in result] == [40, 40, 30]
+    result = await test_range_item_class.filter(param1=0, order_by="date_time", limit=2)
+    assert [item.date_time for item in result] == [0, 10]
+    # Первые limit объектов по индексу - без других фильтров
+    result = await test_range_item_class.filter(order_by="-date_time", limit=3)
+    assert [item.date_time for item in result] == [40, 40, 30]
+    result = [item async for item in test_range_item_class.iter_filter(order_by="value", limit=1)]
+    assert [item.value for item in result] == [-4]
+    with pytest.raises(Exception):
+        await test_range_item_class.filter(order_by="-date_time")
+    result = await test_range_item_class.filter(date_time__lte=20, value__gte=-1, param1=0)
+    assert [item.date_time for item in result] == [0, 10]
+    result = [item async for item in test_range_item_class.iter_filter(value__lt=-3, _batch_size=1)]
+    assert [item.param1 for item in result] == ["0", "1"]
+    # Удалённый объект удаляется из индекса
+    await result[0].delete()
+    assert await test_redis.zscore("range_index.param1.{param1}.param2.{param2}.value", "param1.0.param2.4") is None
+
+
+@pytest.mark.asyncio
+async def test_range_index_using(
+    test_range_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+) -> None:
+    """ Копия модели с индексами по значениям для другого подключения """
+    using_class: type[AIORedisItem] = test_range_item_class.using(db_instance=test_redis)
+    assert using_class._range_indexes == ("date_time", "value")
+    for date_time in range(3):
+        assert (await using_class(param1=1, param2=date_time, date_time=date_time, value=0.).save()).ok
+    result: list[AIORedisItem] = await using_class.filter(date_time__gte=1)
+    assert sorted(item.date_time for item in result) == [1, 2]
+    assert (await AIORedisORM(client=test_redis).migrate_storage(test_range_item_class, param1=1)).ok
+
+
+@pytest.mark.asyncio
+async def test_filter_order_without_index(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Сортировка по полю без индекса выполняется на стороне клиента """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param2 in range(3):
+        await item_class(param1=1, param2=param2, attr2=param2).save()
+    result: list[AIORedisItem] = await item_class.filter(param1=1, order_by="-attr2", limit=2)
+    assert [item.attr2 for item in result] == [2, 1]
+    with pytest.raises(ValueError):
+        await item_class.filter(param1=1, attr2__gte=1)
+    with pytest.raises(ValueError):
+        [item async for item in item_class.iter_filter(param1=1, order_by="attr2")]
+
+
+@pytest.mark.asyncio
+async def test_count_exists(
+    test_item: AIORedisItem,
+    test_indexed_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Количество и наличие объектов определяются без получения их значений """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param2 in range(3):
+        await item_class(param1=1, param2=param2, attr1=param2, attr2=param2).save()
+        await test_indexed_item_class(param1=1, param2=param2, attr1=param2).save()
+
+    async def forbidden_read(*args, **kwargs):
+        raise AssertionError("Values reading is not expected")
+
+    monkeypatch.setattr(test_redis, "mget", forbidden_read)
+    assert await item_class.count(param1=1) == 3
+    assert await item_class.count(param1=1, param2__in=[0, 2, 5]) == 2
+    assert await item_class.count(param1=2) == 0
+    assert await item_class.exists(param1=1, param2=2)
+    assert not await item_class.exists(param1=1, param2=5)
+    assert await item_class.exists_many(
+        [item_class(param1=1, param2=1), item_class(param1=1, param2=7)]
+    ) == [True, False]
+    # Объект удалён в обход ORM - индекс не учитывается без проверки EXISTS
+    await test_redis.delete("param1.1.param2.1.attr1")
+    assert await test_indexed_item_class.count(param1=1) == 2
+    assert not await test_indexed_item_class.exists(param2=1)
+
+
+@pytest.mark.asyncio
+async def test_save_single_round_trip(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Объект сохраняется одной транзакцией (без отдельной команды на каждое поле) """
+    monkeypatch.setattr(test_item.__class__, "_db_instance", test_redis)
+    commands: list[str] = []
+    execute_command = test_redis.execute_command
+
+    async def counting_execute_command(*args, **options):
+        commands.append(str(args[0]).upper())
+        return await execute_command(*args, **options)
+
+    monkeypatch.setattr(test_redis, "execute_command", counting_execute_command)
+    assert (await test_item.save()).ok
+    test_item.set_ttl(100)
+    assert (await test_item.save()).ok
+    assert commands == []
+    assert await test_item.get(_item=test_item) == test_item
+    assert 0 < await test_redis.ttl(f"{test_item._table}.attr1") <= 100
+
+
+@pytest.mark.asyncio
+async def test_save_dirty_fields(
+    test_item: AIORedisItem,
+    test_compact_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Сохраняются только поля, изменённые после получения или сохранения объекта """
+    for item in (test_item, test_compact_item):
+        item_class: type[AIORedisItem] = item.__class__
+        monkeypatch.setattr(item_class, "_db_instance", test_redis)
+        assert item._get_dirty_fields() is None
+        assert (await item.save()).ok
+        assert item._get_dirty_fields() == frozenset()
+        loaded: AIORedisItem = await item_class.get(_item=item)  # type: ignore
+        assert loaded._get_dirty_fields() == frozenset()
+        # Поле изменено в БД в обход объекта - при сохранении объекта оно не перезаписывается
+        await test_redis.set(f"{item._table}.attr1", pickle.dumps("changed"))
+        loaded.attr2 = 100
+        assert loaded._get_dirty_fields() == {"attr2"}
+        assert (await loaded.save()).ok
+        result: AIORedisItem = await item_class.get(_item=item)  # type: ignore
+        assert (result.attr1, result.attr2) == ("changed", 100)
+        # Продление времени жизни неизменённых полей
+        loaded.set_ttl(100)
+        loaded.attr3 = 1.5
+        assert (await loaded.save()).ok
+        assert 0 < await test_redis.ttl(f"{item._table}.attr4") <= 100
+        await test_redis.flushdb()
+
+
+@pytest.mark.asyncio
+async def test_save_after_db_divergence(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Неизменённый объект записывается целиком, если он мог разойтись с БД """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    connection_kwargs: dict = test_redis.connection_pool.connection_kwargs
+    other_redis: redis.Redis = redis.Redis(host=connection_kwargs["host"], port=connection_kwargs["port"], db=1)
+    await other_redis.flushdb()
+    try:
+        await test_item.save()
+        # Сохранение после удаления
+        loaded: AIORedisItem = await item_class.get(_item=test_item)  # type: ignore
+        assert (await loaded.delete()).ok
+        assert (await loaded.save()).ok
+        assert await item_class.get(_item=test_item) == test_item
+        # Сохранение через другое подключение
+        loaded = await item_class.get(_item=test_item)  # type: ignore
+        assert (await loaded.using(db_instance=other_redis).save()).ok
+        copied: AIORedisItem = await item_class.using(db_instance=other_redis).get(_item=test_item)  # type: ignore
+        assert copied._params == test_item._params
+        # Сохранение после групповой вставки через другое подключение и группового удаления
+        items: list[AIORedisItem] = [item_class(param1=7, param2=i, attr1="value", attr2=i) for i in range(2)]
+        assert (await AIORedisORM(client=other_redis).bulk_create(items=items)).ok
+        assert [(await item.save()).ok for item in items] == [True, True]
+        assert await item_class.count(param1=7) == 2
+        test_orm: AIORedisORM = AIORedisORM(client=test_redis)
+        assert (await test_orm.bulk_create(items=items)).ok
+        assert (await test_orm.bulk_delete(items=items)).ok
+        assert [(await item.save()).ok for item in items] == [True, True]
+        assert await item_class.count(param1=7) == 2
+    finally:
+        await other_redis.flushdb()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_only_dirty(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Групповая вставка только изменённых полей """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    test_orm: AIORedisORM = AIORedisORM(client=test_redis)
+    items: list[AIORedisItem] = [item_class(param1=1, param2=i, attr1="value", attr2=i) for i in range(3)]
+    assert (await test_orm.bulk_create(items=items)).ok
+    assert all(item._get_dirty_fields() == frozenset() for item in items)
+    await test_redis.set("param1.1.param2.0.attr1", pickle.dumps("changed"))
+    items[0].attr2 = 10
+    assert (await test_orm.bulk_create(items=items, only_dirty=True)).ok
+    result: list[AIORedisItem] = await item_class.filter(param1=1)
+    assert [(item.attr1, item.attr2) for item in result] == [("changed", 10), ("value", 1), ("value", 2)]
+
+
+@pytest.mark.asyncio
+async def test_update(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Изменение полей на стороне сервера без получения объекта """
+    class TestCounterItem(AIORedisItem):
+        counter: int
+        date_time: int
+        name: str
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            codec = "json"
+            range_indexes = ["date_time"]
+
+    monkeypatch.setattr(TestCounterItem, "_db_instance", test_redis)
+    await asyncio.gather(*(TestCounterItem.update(param1=1, param2=1, counter__incr=1) for _ in range(50)))
+    assert (await TestCounterItem.update(param1=1, param2=1, date_time__max=100, name="first")).ok
+    assert (await TestCounterItem.update(param1=1, param2=1, date_time__max=50, counter__incr=0.5)).ok
+    item: TestCounterItem = await TestCounterItem.get(param1=1, param2=1)  # type: ignore
+    assert (item.counter, item.date_time, item.name) == (50.5, 100, "first")
+    assert await test_redis.zscore("range_index.param1.{param1}.param2.{param2}.date_time", "param1.1.param2.1") == 100
+    result: OperationResult = await TestCounterItem.bulk_update([
+        {"param1": 1, "param2": 2, "date_time__min": 10},
+        {"param1": 1, "param2": 3, "date_time": 30, "counter__incr": 3},
+    ])
+    assert result.ok
+    found: list[TestCounterItem] = await TestCounterItem.filter(param1=1, date_time__lte=30)
+    assert [(item.param2, item.date_time) for item in found] == [("2", 10), ("3", 30)]
+    # Ошибка в одном из полей не изменяет объект
+    assert not (await TestCounterItem.update(param1=1, param2=1, counter__incr=1, name__incr=1)).ok
+    assert (await TestCounterItem.get(param1=1, param2=1)).counter == 50.5  # type: ignore
+    with pytest.raises(NotEnoughParamsException):
+        await TestCounterItem.update(param1=1, counter__incr=1)
+    with pytest.raises(ValueError):
+        await TestCounterItem.update(param1=1, param2=1, counter__pow=1)
+
+
+@pytest.mark.asyncio
+async def test_delete_where(
+    test_item: AIORedisItem,
+    test_indexed_item_class: type[AIORedisItem],
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Удаление объектов по фильтру без получения их значений """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param1 in range(2):
+        for param2 in range(3):
+            await item_class(param1=param1, param2=param2, attr2=param2).save()
+
+    async def forbidden_read(*args, **kwargs):
+        raise AssertionError("Values reading is not expected")
+
+    monkeypatch.setattr(test_redis, "mget", forbidden_read)
+    result: OperationResult = await item_class.delete_where(param1=1)
+    assert result.ok and result.message == "deleted 3 objects"
+    assert (await item_class.delete_where(param1=0, param2__in=[0, 5])).message == "deleted 1 objects"
+    assert await item_class.count(param1__in=[0, 1]) == 2
+    # Префиксы удалённых объектов удаляются из индексов
+    await test_redis.flushdb()
+    for param1 in range(2):
+        for param2 in range(3):
+            await test_indexed_item_class(param1=param1, param2=param2, attr1=param2).save()
+    assert (await test_indexed_item_class.delete_where(param2=1)).message == "deleted 2 objects"
+    assert await test_redis.smembers("index.param1.{param1}.param2.{param2}.param1.0") == {
+        b"param1.0.param2.0", b"param1.0.param2.2",
+    }
+    with pytest.raises(Exception):
+        await item_class.delete_where()
+
+
+@pytest.mark.asyncio
+async def test_touch(test_item: AIORedisItem, test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Продление времени жизни объекта без перезаписи значений """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    item: AIORedisItem = item_class(param1=7, param2=7, attr2=7, ttl=10)
+    await item.save()
+
+    async def forbidden_write(*args, **kwargs):
+        raise AssertionError("Values writing is not expected")
+
+    monkeypatch.setattr(test_redis, "set", forbidden_write)
+    assert (await item.touch(ttl=1000)).ok
+    assert 100 < await test_redis.ttl(f"{item._table}.attr1") <= 1000
+    assert 100 < await test_redis.ttl(f"{item._table}.attr4") <= 1000
+    # По умолчанию - время жизни объекта
+    assert (await item.touch()).ok
+    assert 0 < await test_redis.ttl(f"{item._table}.attr1") <= 10
+    assert not (await item_class(param1=7, param2=8, attr2=7, ttl=10).touch()).ok
+    assert not (await item_class(param1=7, param2=7, attr2=7).touch()).ok
+
+
+@pytest.mark.asyncio
+async def test_scan_fields_on_different_pages(
+    test_item: AIORedisItem,
+    test_redis: redis.Redis,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """ Объект, ключи полей которого попали на разные страницы SCAN, возвращается один раз """
+    item_class: type[AIORedisItem] = test_item.__class__
+    monkeypatch.setattr(item_class, "_db_instance", test_redis)
+    for param2 in range(3):
+        await item_class(param1=5, param2=param2, attr1="value", attr2=param2).save()
+    # Объект без первого поля находится по остальным полям
+    await test_redis.delete("param1.5.param2.2.attr1")
+    scan = test_redis.scan
+
+    async def scan_by_key(cursor: int = 0, match: str = "*", **kwargs):
+        """ Один ключ на странице, в обратном порядке """
+        keys: list[bytes] = []
+        scan_cursor: int = 0
+        while True:
+            scan_cursor, page = await scan(cursor=scan_cursor, match=match, **kwargs)
+            keys += page
+            if not scan_cursor:
+                break
+        keys.sort(reverse=True)
+        next_cursor: int = cursor + 1 if cursor + 1 < len(keys) else 0
+        return next_cursor, keys[cursor:cursor + 1]
+
+    monkeypatch.setattr(test_redis, "scan", scan_by_key)
+    result: list[int] = [item.attr2 async for item in item_class.iter_filter(param1=5, _batch_size=1)]
+    assert sorted(result) == [0, 1, 2]
+    assert await item_class.count(param1=5) == 3
+    assert (await AIORedisORM(client=test_redis).bulk_touch(item_class, ttl=100, param1=5)).message == \
+        "touched 3 objects"
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+from pytest import MonkeyPatch
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm import LoaderConfig
+
+
+@pytest.mark.asyncio
+async def test_item_loader(test_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Одновременные вызовы get объединяются в одно чтение, одинаковые запросы выполняются один раз """
+    class TestLoadedItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            loader = LoaderConfig()
+
+    monkeypatch.setattr(TestLoadedItem, "_db_instance", test_redis)
+    for param2 in range(3):
+        await TestLoadedItem(param1=1, param2=param2, attr1=param2).save()
+    mget_keys: list[tuple] = []
+    mget = test_redis.mget
+
+    async def counting_mget(*args, **kwargs):
+        mget_keys.append(args)
+        return await mget(*args, **kwargs)
+
+    monkeypatch.setattr(test_redis, "mget", counting_mget)
+    same: list = await asyncio.gather(*(TestLoadedItem.get(param1=1, param2=0) for _ in range(100)))
+    assert len(mget_keys) == 1 and len(mget_keys[0][0]) == 1
+    assert all(item == same[0] for item in same)
+    # Каждый вызов получает свою копию объекта
+    assert len({id(item) for item in same}) == len(same)
+    same[0].attr1 = 100
+    assert same[0]._get_dirty_fields() == {"attr1"}
+    assert same[1].attr1 == 0 and same[1]._params["attr1"] == 0 and not same[1]._get_dirty_fields()
+    mget_keys.clear()
+    result: list = await asyncio.gather(*(TestLoadedItem.get(param1=1, param2=param2) for param2 in (2, 5, 0, 1)))
+    assert [item.attr1 if item else None for item in result] == [2, None, 0, 1]
+    assert len(mget_keys) == 1
+    # Ошибка чтения передаётся всем запросам порции
+    monkeypatch.setattr(TestLoadedItem, "_read_db_objects", None)
+    errors: list = await asyncio.gather(
+        *(TestLoadedItem.get(param1=2, param2=param2) for param2 in range(2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(error, TypeError) for error in errors)
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 from typing import Union
 
@@ -6,6 +7,7 @@ import redis.asyncio as redis
 
 from aiostorage_orm import AIORedisORM
 from aiostorage_orm import AIORedisItem
+from aiostorage_orm import BulkOperationResult
 
 
 def test_empty_constructor() -> None:
@@ -109,6 +111,57 @@ async def test_bulk_delete(test_redis: redis.Redis, test_item: AIORedisItem) ->
     assert count_of_db_items == total_keys_expected
 
 
+@pytest.mark.asyncio
+async def test_bulk_create_delete_hash(test_redis: redis.Redis, test_hash_item: AIORedisItem) -> None:
+    """ Групповая вставка и удаление объектов, хранимых в виде hash'ей (один ключ на объект) """
+    items_count: int = 11
+    items: list[AIORedisItem] = []
+    for i in range(items_count):
+        another_item: AIORedisItem = copy.copy(test_hash_item)
+        another_item._table += str(i)
+        items.append(another_item)
+    orm: AIORedisORM = AIORedisORM(client=test_redis)
+    await orm.bulk_create(items=items)
+    assert len(await test_redis.keys()) == items_count
+    await orm.bulk_delete(items=items[:-1])
+    assert await test_redis.keys() == [items[-1]._table.encode()]
+
+
+@pytest.mark.asyncio
+async def test_migrate_storage(
+    test_redis: redis.Redis,
+    test_item: AIORedisItem,
+    test_packed_item: AIORedisItem,
+) -> None:
+    """ Перенос объектов, сохранённых по полям, в упакованный способ хранения """
+    items_count: int = 7
+    orm: AIORedisORM = AIORedisORM(client=test_redis)
+    items: list[AIORedisItem] = [
+        test_item.__class__(param1=i, param2=4, attr1="value", attr2=i)
+        for i in range(items_count)
+    ]
+    await orm.bulk_create(items=items)
+
+    packed_class: type[AIORedisItem] = test_packed_item.__class__
+    result = await orm.migrate_storage(packed_class, source_storage="fields", batch_size=3, param2=4)
+    assert result.ok
+    # Ключи полей заменены одним ключом на объект
+    assert len(await test_redis.keys()) == items_count
+    migrated_items = await packed_class.using(db_instance=test_redis).filter(param2=4)
+    assert sorted(item.attr2 for item in migrated_items) == list(range(items_count))
+
+
+@pytest.mark.asyncio
+async def test_migrate_storage_unknown_source(test_redis: redis.Redis, test_packed_item: AIORedisItem) -> None:
+    """ Неизвестный исходный способ хранения отклоняется до начала переноса """
+    with pytest.raises(ValueError):
+        await AIORedisORM(client=test_redis).migrate_storage(
+            test_packed_item.__class__,
+            source_storage="hsh",
+            param2=4,
+        )
+
+
 def test_init_global_db_connection(test_redis: redis.Redis) -> None:
     """
     При первом подключении должна устанавливаться глобальная
@@ -133,3 +186,73 @@ def test_noreinit_global_db_connection(test_redis: redis.Redis) -> None:
     # Создать новое и проверить, что сохранилось первое подключение
     AIORedisORM(client=test_redis)
     assert id(AIORedisItem._db_instance) != id(test_redis)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_chunks(test_redis: redis.Redis, test_item: AIORedisItem) -> None:
+    """
+    Групповые операции выполняются порциями в собственных pipeline'ах,
+        невыполненные порции возвращаются в результате
+    """
+    item_class: type[AIORedisItem] = test_item.__class__
+    orm: AIORedisORM = AIORedisORM(client=test_redis, write_batch_size=12, write_max_in_flight=2)
+    first_items: list[AIORedisItem] = [item_class(param1=1, param2=i, attr2=i) for i in range(10)]
+    second_items: list[AIORedisItem] = [item_class(param1=2, param2=i, attr2=i) for i in range(10)]
+    # Одновременные операции одного ORM не смешивают команды
+    results = await asyncio.gather(orm.bulk_create(items=first_items), orm.bulk_create(items=second_items))
+    assert all(result.ok for result in results)
+    assert len(await test_redis.keys()) == 20 * len(test_item._params)
+    # Объект, который не удалось сериализовать, не прерывает запись остальных порций
+    broken_items: list[AIORedisItem] = [item_class(param1=3, param2=i, attr2=i) for i in range(5)]
+    broken_items[2].attr1 = lambda: None  # type: ignore
+    result: BulkOperationResult = await orm.bulk_create(items=broken_items)
+    assert not result.ok
+    assert [(chunk.start, chunk.end) for chunk in result.failed_chunks] == [(0, 3)]
+    assert sorted(item.attr2 for item in await item_class.using(db_instance=test_redis).filter(param1=3)) == [3, 4]
+    result = await orm.bulk_delete(items=first_items + second_items)
+    assert result.ok and not result.failed_chunks
+    assert len(await test_redis.keys()) == 2 * len(test_item._params)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_mixed_ttl(test_redis: redis.Redis, test_item: AIORedisItem) -> None:
+    """ Время жизни каждого объекта учитывается независимо от первого объекта списка """
+    item_class: type[AIORedisItem] = test_item.__class__
+    items: list[AIORedisItem] = [
+        item_class(param1=1, param2=1, attr2=1),
+        item_class(param1=1, param2=2, attr2=2, ttl=100),
+        item_class(param1=1, param2=3, attr2=3, ttl=200),
+        item_class(param1=1, param2=4, attr2=4, ttl=100),
+    ]
+    assert (await AIORedisORM(client=test_redis).bulk_create(items=items)).ok
+    assert await test_redis.ttl("param1.1.param2.1.attr2") == -1
+    assert 0 < await test_redis.ttl("param1.1.param2.2.attr1") <= 100
+    assert 100 < await test_redis.ttl("param1.1.param2.3.attr4") <= 200
+    assert 0 < await test_redis.ttl("param1.1.param2.4.attr3") <= 100
+    result = await item_class.using(db_instance=test_redis).filter(param1=1)
+    assert sorted(item.attr2 for item in result) == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_bulk_touch(test_redis: redis.Redis, test_item: AIORedisItem) -> None:
+    """ Продление времени жизни списка объектов и объектов, выбранных по фильтру """
+    item_class: type[AIORedisItem] = test_item.__class__
+    items: list[AIORedisItem] = [
+        item_class(param1=2, param2=param2, attr2=param2, ttl=10)
+        for param2 in range(4)
+    ]
+    orm: AIORedisORM = AIORedisORM(client=test_redis)
+    assert (await orm.bulk_create(items=items)).ok
+    result: BulkOperationResult = await orm.bulk_touch(items[:2], ttl=1000)
+    assert result.ok
+    assert 100 < await test_redis.ttl("param1.2.param2.1.attr3") <= 1000
+    assert 0 < await test_redis.ttl("param1.2.param2.2.attr3") <= 10
+    # Выбор объектов по маске, без получения значений
+    result = await orm.bulk_touch(item_class, ttl=2000, param1=2, param2__in=[2, 3, 5])
+    assert result.ok and result.message == "touched 2 objects"
+    assert 1000 < await test_redis.ttl("param1.2.param2.3.attr1") <= 2000
+    assert 100 < await test_redis.ttl("param1.2.param2.0.attr1") <= 1000
+    assert (await orm.bulk_touch(item_class, ttl=3000, param1=2)).message == "touched 4 objects"
+    assert 2000 < await test_redis.ttl("param1.2.param2.0.attr1") <= 3000
+    # Без ttl у модели и в вызове продлевать нечего
+    assert not (await orm.bulk_touch(item_class, param1=2)).ok
@@ -0,0 +1,85 @@
+import pytest
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm.redis_impl.aioredis_schema import AIORedisSchema
+
+
+@pytest.fixture
+def test_schema() -> AIORedisSchema:
+    return AIORedisSchema(table="param1.{param1}.param2.{param2}", fields=("attr2", "attr1"))
+
+
+def test_schema_compiled(test_schema: AIORedisSchema) -> None:
+    """ Разбор шаблона ключа и полей модели """
+    assert test_schema.segments_count == 4
+    assert test_schema.keys_positions == {"param1": 1, "param2": 3}
+    assert test_schema.placeholders == ("param1", "param2")
+    assert test_schema.row_fields == ("attr1", "attr2")
+    assert test_schema.fields_by_bytes == {b"attr2": "attr2", b"attr1": "attr1"}
+
+
+@pytest.mark.parametrize(
+    "params, expected_filter",
+    [
+        ({"param1": 1, "param2": 2}, "param1.1.param2.2"),
+        ({"param2": 2}, "param1.*.param2.2"),
+        ({}, "param1.*.param2.*"),
+        ({"param1": "[12]", "unknown": 3}, "param1.[12].param2.*"),
+    ],
+)
+def test_schema_format(test_schema: AIORedisSchema, params: dict, expected_filter: str) -> None:
+    """ Подстановка параметров в шаблон ключа с заменой непереданных на маску """
+    assert test_schema.format(params=params) == expected_filter
+
+
+def test_schema_keys(test_schema: AIORedisSchema) -> None:
+    """ Ключи полей объекта и разбор параметров из ключа """
+    assert test_schema.keys_of(prefix="param1.1.param2.2") == [b"param1.1.param2.2.attr2", b"param1.1.param2.2.attr1"]
+    assert test_schema.parse_key(prefix="param1.1.param2.2") == {"param1": "1", "param2": "2"}
+    assert test_schema.parse_key_bytes(prefix=b"param1.1.param2.2") == {"param1": "1", "param2": "2"}
+
+
+def test_schema_of_model(test_item: AIORedisItem) -> None:
+    """ Схема модели создаётся при объявлении класса и сохраняется при using() """
+    assert test_item._schema.fields == ("attr1", "attr2", "attr3", "attr4")
+    assert test_item._schema.keys_positions == test_item._keys_positions
+    assert test_item.using()._schema is test_item._schema
+
+
+@pytest.mark.parametrize(
+    "params, in_params, expected_prefixes, expected_matches, expected_constraints",
+    [
+        # Все параметры переданы - ключи объектов без обхода ключей
+        ({"param2": 3}, {"param1": [1, 2]}, ["param1.1.param2.3", "param1.2.param2.3"], [], {}),
+        # Односимвольные значения - класс символов маски
+        ({}, {"param1": [1, 2]}, [], ["param1.[12].param2.*"], {}),
+        # Многосимвольные значения - проверка на стороне клиента
+        ({}, {"param1": [10, 20]}, [], ["param1.*.param2.*"], {"param1": frozenset({"10", "20"})}),
+        # Пустой список значений
+        ({}, {"param1": []}, [], [], {}),
+        # Маска в значении параметра
+        ({"param1": "*", "param2": 1}, {}, [], ["param1.*.param2.1"], {}),
+    ],
+)
+def test_schema_plan(
+    test_schema: AIORedisSchema,
+    params: dict,
+    in_params: dict,
+    expected_prefixes: list[str],
+    expected_matches: list[str],
+    expected_constraints: dict,
+) -> None:
+    """ План поиска: комбинации значений __in не перебираются при поиске по маске """
+    plan = test_schema.plan(params=params, in_params=in_params)
+    assert plan.prefixes == expected_prefixes
+    assert plan.matches == expected_matches
+    assert plan.constraints == expected_constraints
+    assert test_schema.check_constraints("param1.10.param2.3", plan.constraints)
+    assert not plan.constraints or not test_schema.check_constraints("param1.30.param2.3", plan.constraints)
+
+
+def test_schema_plan_partial_segment() -> None:
+    """ Параметр, не занимающий сегмент ключа целиком, перебирается отдельными масками """
+    schema: AIORedisSchema = AIORedisSchema(table="param1.{param1}.tag_{tag}.{param2}", fields=())
+    plan = schema.plan(params={}, in_params={"tag": [10, 20]})
+    assert plan.matches == ["param1.*.tag_10.*", "param1.*.tag_20.*"]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+from pytest import MonkeyPatch
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm import AIORedisORM
+
+
+@pytest.mark.asyncio
+async def test_write_buffer(test_redis: redis.Redis, test_item: AIORedisItem, monkeypatch: MonkeyPatch) -> None:
+    """ Сохранения объектов объединяются и записываются одной групповой операцией """
+    monkeypatch.setattr(AIORedisItem, "_db_instance", test_redis)
+    monkeypatch.setattr(AIORedisItem, "_write_buffer", None)
+    item_class: type[AIORedisItem] = test_item.__class__
+    orm: AIORedisORM = AIORedisORM(client=test_redis)
+    writes: list[int] = []
+    bulk_create = orm.bulk_create
+
+    async def counting_bulk_create(items):
+        writes.append(len(items))
+        return await bulk_create(items=items)
+
+    monkeypatch.setattr(orm, "bulk_create", counting_bulk_create)
+    orm.write_buffer(max_delay_ms=10_000, max_items=100)
+    await asyncio.gather(*(
+        item_class(param1=1, param2=i % 3, attr2=i).save()
+        for i in range(30)
+    ))
+    assert await test_redis.keys() == []
+    assert (await orm.flush()).ok
+    assert writes == [3]
+    result = await item_class.filter(param1=1)
+    assert sorted(item.attr2 for item in result) == [27, 28, 29]
+    # Запись после накопления max_items объектов
+    buffer = orm.write_buffer()
+    buffer._max_items = 2
+    await item_class(param1=2, param2=1, attr2=1).save()
+    await item_class(param1=2, param2=2, attr2=2).save()
+    await asyncio.sleep(0.01)
+    assert writes == [3, 2]
+    # Запись буфера при закрытии ORM
+    await item_class(param1=3, param2=1, attr2=1).save()
+    await orm.close()
+    assert writes == [3, 2, 1]
+    assert AIORedisItem._write_buffer is None
+    assert (await item_class.get(param1=3, param2=1)).attr2 == 1  # type: ignore
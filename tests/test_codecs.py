@@ -0,0 +1,134 @@
+from enum import IntEnum
+from typing import Any
+
+import pytest
+import redis.asyncio as redis
+from pytest import MonkeyPatch
+
+from aiostorage_orm import AIORedisItem
+from aiostorage_orm import AIORedisFrame
+from aiostorage_orm import Codec
+from aiostorage_orm import register_codec
+from aiostorage_orm.codecs import CODECS
+from aiostorage_orm.codecs import PickleCodec
+from aiostorage_orm.codecs import get_codec
+
+
+class Status(IntEnum):
+    ok = 1
+    failed = 2
+
+
+FIELDS: dict[str, Any] = {"attr1": str, "attr2": int, "attr3": float, "attr4": bytes, "attr5": Status}
+VALUES: dict[str, Any] = {"attr1": "value", "attr2": -19, "attr3": 99.5, "attr4": b"\x00bytes", "attr5": Status.failed}
+
+
+@pytest.mark.parametrize("codec_name", ["pickle", "msgpack", "struct"])
+def test_round_trip(codec_name: str) -> None:
+    """ Значения полей, словари и кортежи восстанавливаются без изменений """
+    if codec_name == "msgpack":
+        pytest.importorskip("msgpack")
+    codec: Codec = get_codec(codec_name, fields=FIELDS)
+    for field, value in VALUES.items():
+        assert codec.decode(field, codec.encode(field, value)) == value
+    assert codec.decode_mapping(codec.encode_mapping(VALUES)) == VALUES
+    row: tuple = tuple(VALUES[name] for name in sorted(VALUES))
+    assert codec.decode_row(codec.encode_row(row)) == row
+
+
+def test_json_round_trip() -> None:
+    """ JSON не поддерживает bytes, остальные значения восстанавливаются """
+    codec: Codec = get_codec("json", fields=FIELDS)
+    values: dict[str, Any] = {key: value for key, value in VALUES.items() if key != "attr4"}
+    assert codec.decode_mapping(codec.encode_mapping(values)) == values
+    # Числа хранятся в текстовом виде
+    assert codec.encode("attr2", 10) == b"10"
+
+
+def test_struct_empty_values() -> None:
+    """ Пустая строка отличается от отсутствующего значения """
+    codec: Codec = get_codec("struct", fields=FIELDS)
+    assert codec.decode("attr1", codec.encode("attr1", "")) == ""
+    assert codec.decode("attr1", codec.encode("attr1", None)) is None
+    row: tuple = ("", 1, None, b"", None)
+    assert codec.decode_row(codec.encode_row(row)) == row
+
+
+def test_struct_schema_changed() -> None:
+    """ Запись другой схемы не декодируется со смещением значений """
+    old_codec: Codec = get_codec("struct", fields={"attr1": int, "attr3": int})
+    new_codec: Codec = get_codec("struct", fields={"attr1": int, "attr2": int, "attr3": int})
+    with pytest.raises(ValueError):
+        new_codec.decode_row(old_codec.encode_row((1, 3)))
+
+
+def test_struct_unsupported_type() -> None:
+    """ Неподдерживаемый тип поля определяется в момент объявления модели """
+    with pytest.raises(TypeError):
+        class TestItem(AIORedisItem):
+            attr1: list
+
+            class Meta:
+                table = "param1.{param1}"
+                codec = "struct"
+
+
+def test_unknown_codec() -> None:
+    with pytest.raises(ValueError):
+        get_codec("unknown", fields=FIELDS)
+
+
+def test_register_codec(monkeypatch: MonkeyPatch) -> None:
+    """ Пользовательский кодек используется моделью по имени """
+    class UpperPickleCodec(PickleCodec):
+        pass
+
+    monkeypatch.setitem(CODECS, "custom", UpperPickleCodec)
+    register_codec("custom", UpperPickleCodec)
+
+    class TestItem(AIORedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}"
+            codec = "custom"
+
+    assert isinstance(TestItem._codec, UpperPickleCodec)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["fields", "hash", "packed"])
+async def test_item_with_codec(test_redis: redis.Redis, monkeypatch: MonkeyPatch, storage: str) -> None:
+    """ Сохранение и получение объектов со struct-кодеком для всех способов хранения """
+    class TestItem(AIORedisItem):
+        attr1: str
+        attr2: int
+        attr5: Status
+
+        class Meta:
+            table = "param1.{param1}"
+            codec = "struct"
+
+    monkeypatch.setattr(TestItem, "_storage", storage)
+    monkeypatch.setattr(TestItem, "_db_instance", test_redis)
+    item: TestItem = TestItem(param1=1, attr1="value", attr2=5, attr5=Status.ok)
+    assert (await item.save()).ok
+    result = await TestItem.get(param1=1)
+    assert result == item
+    assert result and result.attr5 is Status.ok
+
+
+@pytest.mark.asyncio
+async def test_frame_with_codec(test_frame: AIORedisFrame) -> None:
+    """ Frame сериализует объекты кодеком модели """
+    class TestItem(AIORedisItem):
+        attr1: str
+        attr2: int
+
+        class Meta:
+            table = "param1.{param1}"
+            codec = "struct"
+
+    items: list[TestItem] = [TestItem(param1=1, attr1=str(i), attr2=i) for i in range(3)]
+    await test_frame.add(item_or_items=items)
+    assert await test_frame.get(item=TestItem(param1=1)) == items